@@ -0,0 +1,70 @@
+"""
+Compare save, load and cookie size of the cookie session engines.
+
+    python benchmarks/session.py [iterations]
+
+Prints the best of 5 rounds per engine, for a small session and for a
+session with a 100 item cart.
+"""
+
+import asyncio
+import sys
+import time
+import typing as t
+import uuid
+
+from unfazed.contrib.session.backends.base import SessionBase
+from unfazed.contrib.session.backends.compact import CompactSession
+from unfazed.contrib.session.backends.default import SigningSession
+from unfazed.contrib.session.settings import SessionSettings
+
+SESSIONS: t.Dict[str, t.Dict[str, t.Any]] = {
+    "small": {"user": {"id": 42, "username": "alice", "is_superuser": False}},
+    "large": {
+        "user": {"id": 42, "username": "alice"},
+        "cart": [{"sku": f"SKU-{i:04d}", "qty": 1} for i in range(100)],
+    },
+}
+
+
+async def measure(
+    engine: t.Type[SessionBase],
+    session_setting: SessionSettings,
+    data: t.Dict[str, t.Any],
+    iterations: int,
+) -> t.Tuple[float, float, int]:
+    saves, loads = [], []
+    token = ""
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            session = engine(session_setting=session_setting)
+            for key, value in data.items():
+                session[key] = value
+            await session.save()
+        saves.append((time.perf_counter() - start) / iterations)
+        token = session.session_key or ""
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            session = engine(session_setting=session_setting, session_key=token)
+            await session.load()
+        loads.append((time.perf_counter() - start) / iterations)
+
+    return min(saves), min(loads), len(token)
+
+
+async def main(iterations: int) -> None:
+    session_setting = SessionSettings(SECRET=uuid.uuid4().hex)
+    for name, data in SESSIONS.items():
+        print(f"{name} session, {iterations} iterations")
+        for engine in (SigningSession, CompactSession):
+            save, load, size = await measure(engine, session_setting, data, iterations)
+            print(
+                f"  {engine.__name__:<15} save {save * 1e6:6.1f}us  "
+                f"load {load * 1e6:6.1f}us  cookie {size} bytes"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
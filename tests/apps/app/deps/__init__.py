@@ -0,0 +1,3 @@
+import typing as t
+
+EVENTS: t.List[str] = []
@@ -0,0 +1,6 @@
+from unfazed.app import BaseAppConfig
+
+
+class AppConfig(BaseAppConfig):
+    async def ready(self) -> None:
+        raise RuntimeError("broken app")
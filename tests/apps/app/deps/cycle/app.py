@@ -0,0 +1,8 @@
+from unfazed.app import BaseAppConfig
+
+
+class AppConfig(BaseAppConfig):
+    depends_on = ("tests.apps.app.deps.cycle",)
+
+    async def ready(self) -> None:
+        pass
@@ -0,0 +1,11 @@
+import asyncio
+
+from tests.apps.app.deps import EVENTS
+from unfazed.app import BaseAppConfig
+
+
+class AppConfig(BaseAppConfig):
+    async def ready(self) -> None:
+        EVENTS.append("first:start")
+        await asyncio.sleep(0.05)
+        EVENTS.append("first:end")
@@ -0,0 +1,9 @@
+from tests.apps.app.deps import EVENTS
+from unfazed.app import BaseAppConfig
+
+
+class AppConfig(BaseAppConfig):
+    depends_on = ("tests.apps.app.deps.first",)
+
+    async def ready(self) -> None:
+        EVENTS.append("second:start")
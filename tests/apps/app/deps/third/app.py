@@ -0,0 +1,7 @@
+from tests.apps.app.deps import EVENTS
+from unfazed.app import BaseAppConfig
+
+
+class AppConfig(BaseAppConfig):
+    async def ready(self) -> None:
+        EVENTS.append("third:start")
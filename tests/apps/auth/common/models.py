@@ -7,6 +7,13 @@ class User(AbstractUser):
     class Meta:
         table = "unfazed_auth_user"
 
+    def display(self) -> str:
+        return f"{self.account} <{self.email}>"
+
+    @property
+    def has_password(self) -> bool:
+        return bool(self.password)
+
 
 class Phone(Model):
     class Meta:
@@ -0,0 +1,10 @@
+import typing as t
+
+from unfazed.tasks import task
+
+received: t.List[str] = []
+
+
+@task
+def record(value: str) -> None:
+    received.append(value)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from tests.apps.app.deps import EVENTS
+from unfazed.app import AppCenter
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+
+FIRST = "tests.apps.app.deps.first"
+SECOND = "tests.apps.app.deps.second"
+THIRD = "tests.apps.app.deps.third"
+
+
+@pytest.fixture(autouse=True)
+def clear_events() -> None:
+    EVENTS.clear()
+
+
+async def test_parallel_app_center() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"PROJECT_NAME": "test_parallel"})
+    )
+
+    app_center = AppCenter(unfazed, [SECOND, FIRST, THIRD], parallel=True)
+    await app_center.setup()
+
+    # store keeps the installed order
+    assert [name for name, _ in app_center] == [SECOND, FIRST, THIRD]
+    # third does not wait for first, second does
+    assert EVENTS.index("third:start") < EVENTS.index("first:end")
+    assert EVENTS.index("first:end") < EVENTS.index("second:start")
+
+    for name in (FIRST, SECOND, THIRD):
+        assert set(app_center.report[name]) == {"import", "ready", "settings"}
+    assert app_center.report[FIRST]["ready"] >= 0.05
+
+    # sequential setup records the same breakdown
+    app_center = AppCenter(unfazed, [FIRST, THIRD])
+    await app_center.setup()
+    assert set(app_center.report[THIRD]) == {"import", "ready", "settings"}
+
+
+async def test_parallel_app_center_failed() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"PROJECT_NAME": "test_parallel"})
+    )
+
+    with pytest.raises(ValueError):
+        await AppCenter(unfazed, [SECOND], parallel=True).setup()
+
+    with pytest.raises(RuntimeError, match="Circular"):
+        await AppCenter(unfazed, ["tests.apps.app.deps.cycle"], parallel=True).setup()
+
+    with pytest.raises(RuntimeError, match="already loaded"):
+        await AppCenter(unfazed, [FIRST, FIRST], parallel=True).setup()
+
+    # a failing hook cancels the ones still running
+    with pytest.raises(RuntimeError, match="broken app"):
+        await AppCenter(
+            unfazed, [FIRST, "tests.apps.app.deps.broken"], parallel=True
+        ).setup()
+    await asyncio.sleep(0.1)
+    assert "first:end" not in EVENTS
+
+
+async def test_parallel_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "PROJECT_NAME": "test_parallel",
+                "INSTALLED_APPS": [FIRST, SECOND],
+                "PARALLEL_STARTUP": True,
+            }
+        ),
+    )
+    setup_model_center = unfazed.model_center.setup
+
+    async def record_model_center() -> None:
+        await asyncio.sleep(0.01)
+        await setup_model_center()
+        EVENTS.append("orm")
+
+    monkeypatch.setattr(unfazed.model_center, "setup", record_model_center)
+    await unfazed.setup()
+
+    report = unfazed.startup_report
+    assert {"load_apps", "ready_apps", "setup_model_center", "setup_unfazed"} <= set(
+        report["phases"]
+    )
+    assert "setup_app_center" not in report["phases"]
+    assert list(report["apps"]) == [FIRST, SECOND]
+    # the ready hooks may use the database
+    assert EVENTS == ["orm", "first:start", "first:end", "second:start"]
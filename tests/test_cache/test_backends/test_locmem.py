@@ -92,3 +92,41 @@ async def test_without_option() -> None:
 
     await cache.set("foo", "bar")
     assert await cache.get("foo") == "bar"
+
+
+async def test_locmem_expire_and_hash() -> None:
+    cache = LocMemCache("unfazed_cache_hash")
+
+    # expire / ttl
+    assert await cache.expire("foo", 10) is False
+    assert await cache.ttl("foo") == -2
+    await cache.set("foo", "bar")
+    assert await cache.ttl("foo") is None
+    assert await cache.expire("foo", 0.3) is True
+    assert 0 < t.cast(float, await cache.ttl("foo")) <= 0.3
+    await asyncio.sleep(0.4)
+    assert await cache.get("foo") is None
+
+    # hash
+    assert await cache.hgetall("h") == {}
+    assert await cache.hset("h", mapping={"a": 1, "b": {"x": 1}}) == 2
+    assert await cache.hset("h", mapping={"a": 2, "c": 3}) == 1
+    assert await cache.hget("h", "a") == 2
+    assert await cache.hget("h", "missing") is None
+    assert await cache.hgetall("h") == {"a": 2, "b": {"x": 1}, "c": 3}
+    assert await cache.hdel("h", "a", "missing") == 1
+    assert await cache.hdel("h", "missing") == 0
+    assert await cache.hgetall("h") == {"b": {"x": 1}, "c": 3}
+
+    # ttl survives field updates, removing the last field drops the key
+    await cache.expire("h", 10)
+    await cache.hset("h", mapping={"d": 4})
+    assert await cache.ttl("h") is not None
+    assert await cache.hdel("h", "b", "c", "d") == 3
+    assert await cache.has_key("h") is False
+
+    await cache.set("str", "value")
+    with pytest.raises(TypeError):
+        await cache.hset("str", mapping={"a": 1})
+
+    await cache.close()
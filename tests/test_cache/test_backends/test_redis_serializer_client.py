@@ -135,3 +135,15 @@ async def test_int_float_cmd(client: SerializerBackend) -> None:
 
     await client.incrbyfloat("foo", 1.1)
     assert await client.get("foo") == 2.1
+
+
+async def test_hash_cmd(client: SerializerBackend) -> None:
+    await client.flushdb()
+
+    assert await client.hset("h", mapping={"a": 1, "b": {"x": 1}}) == 2
+    assert await client.hget("h", "a") == 1
+    assert await client.hget("h", "b") == {"x": 1}
+    assert await client.hgetall("h") == {"a": 1, "b": {"x": 1}}
+    assert await client.hdel("h", "a") == 1
+    assert await client.hgetall("h") == {"b": {"x": 1}}
+    assert await client.hgetall("missing") == {}
@@ -0,0 +1,196 @@
+import os
+import typing as t
+
+import pytest
+
+from unfazed.cache import RateLimit, RateLimitMiddleware, caches, rate_limit
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.cache.backends.redis import DefaultBackend
+from unfazed.cache.ratelimit import LocalRateStore, RedisRateStore, parse_rate
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.route import Route
+from unfazed.test import Requestfactory
+from unfazed.type import Scope
+
+HOST = os.getenv("REDIS_HOST", "redis")
+
+
+@rate_limit("3/minute", using="test_ratelimit")
+async def search(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("search")
+
+
+@rate_limit("2/hour", using="test_ratelimit", algorithm="token_bucket")
+async def export(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("export")
+
+
+async def report(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("report")
+
+
+class TenantLimit(RateLimitMiddleware):
+    rate = "1/minute"
+    using = "test_ratelimit"
+
+    def get_key(self, scope: Scope) -> str | None:
+        for name, value in scope["headers"]:
+            if name == b"x-tenant":
+                return value.decode()
+        return None
+
+
+@pytest.fixture(autouse=True)
+async def setup_ratelimit_cache() -> t.AsyncGenerator[None, None]:
+    caches["test_ratelimit"] = LocMemCache(location="test_ratelimit")
+
+    yield
+
+    await caches["test_ratelimit"].close()
+
+
+async def make_app() -> Unfazed:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"DEBUG": True}),
+        routes=[
+            Route("/search", endpoint=search),
+            Route("/export", endpoint=export),
+            Route(
+                "/report",
+                endpoint=report,
+                middlewares=["tests.test_cache.test_ratelimit.TenantLimit"],
+            ),
+        ],
+    )
+    await unfazed.setup()
+    return unfazed
+
+
+async def test_rate_limit() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        for remaining in (2, 1, 0):
+            resp = await request.get("/search")
+            assert resp.status_code == 200
+            assert resp.headers["ratelimit-limit"] == "3"
+            assert resp.headers["ratelimit-remaining"] == str(remaining)
+            assert 0 < int(resp.headers["ratelimit-reset"]) <= 60
+
+        resp = await request.get("/search")
+        assert resp.status_code == 429
+        assert resp.headers["ratelimit-remaining"] == "0"
+        assert int(resp.headers["retry-after"]) >= 1
+
+        # token bucket
+        assert (await request.get("/export")).status_code == 200
+        resp = await request.get("/export")
+        assert resp.status_code == 200
+        assert resp.headers["ratelimit-remaining"] == "0"
+        resp = await request.get("/export")
+        assert resp.status_code == 429
+        # one token per 30 minutes
+        assert 1790 <= int(resp.headers["retry-after"]) <= 1800
+
+        # custom key, requests without one are not limited
+        for _ in range(2):
+            resp = await request.get("/report")
+            assert resp.status_code == 200
+            assert "ratelimit-limit" not in resp.headers
+
+        headers = {"X-Tenant": "a"}
+        assert (await request.get("/report", headers=headers)).status_code == 200
+        assert (await request.get("/report", headers=headers)).status_code == 429
+        resp = await request.get("/report", headers={"X-Tenant": "b"})
+        assert resp.status_code == 200
+
+
+async def test_sliding_window() -> None:
+    limiter = RateLimit("10/hour", using="test_ratelimit")
+    store = limiter.store
+    assert isinstance(store, LocalRateStore)
+    scope: Scope = {"type": "http", "client": ("127.0.0.1", 80), "headers": []}
+
+    for _ in range(5):
+        result = await limiter.hit(scope)
+        assert result is not None and result.allowed
+
+    # the hits move to the previous window and are weighted by its overlap
+    state = store.state["unfazed_ratelimit:default:ip:127.0.0.1"]
+    state[0] -= 1
+    result = await limiter.hit(scope)
+    assert result is not None and result.allowed
+    assert state[1:] == [5, 1]
+    assert 4 <= result.remaining <= 9
+
+    # older windows are forgotten
+    state[0] -= 2
+    result = await limiter.hit(scope)
+    assert result is not None and result.remaining == 9
+    assert state[1:] == [0, 1]
+
+
+def test_parse_rate() -> None:
+    assert parse_rate("100/minute") == (100, 60)
+    assert parse_rate("10/s") == (10, 1)
+    assert parse_rate("1000/6h") == (1000, 21600)
+    assert parse_rate("5/days") == (5, 86400)
+    assert parse_rate("5 / 2 minutes") == (5, 120)
+
+    assert parse_rate("3/seconds") == (3, 1)
+
+    for rate in ("100", "100/week", "0/s", "ten/s", "10/ms", "10/hs", "10/secs"):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+    with pytest.raises(ValueError):
+        RateLimit("1/s", algorithm="fixed_window")
+
+    with pytest.raises(ValueError):
+        RateLimit("1/s", key="session")
+
+    with pytest.raises(ValueError):
+        _ = RateLimit("1/s", using="missing").store
+
+
+async def test_redis_rate_limit() -> None:
+    backend = DefaultBackend(
+        f"redis://{HOST}:6379", options={"PREFIX": "test_ratelimit"}
+    )
+    await backend.flushdb()
+    caches["test_ratelimit_redis"] = backend
+
+    scope: Scope = {"type": "http", "client": ("127.0.0.1", 80), "headers": []}
+
+    for algorithm in ("sliding_window", "token_bucket"):
+        limiter = RateLimit(
+            "3/minute",
+            using="test_ratelimit_redis",
+            algorithm=algorithm,
+            name=algorithm,
+            precheck_share=0,
+        )
+        results = [await limiter.hit(scope) for _ in range(4)]
+        assert [r.allowed for r in results if r] == [True, True, True, False]
+        assert [r.remaining for r in results if r] == [2, 1, 0, 0]
+
+    # a lease answers clearly under limit clients locally
+    limiter = RateLimit(
+        "100/minute", using="test_ratelimit_redis", name="lease", precheck_share=0.1
+    )
+    result = await limiter.hit(scope)
+    assert result is not None and result.remaining == 99
+    for _ in range(9):
+        await limiter.hit(scope)
+    store = limiter.store
+    assert isinstance(store, RedisRateStore)
+    assert store.leases["unfazed_ratelimit:lease:ip:127.0.0.1"].pending == 9
+
+    # the pending hits are recorded with the next round trip
+    result = await limiter.hit(scope)
+    assert result is not None and result.remaining == 89
+
+    del caches["test_ratelimit_redis"]
+    await backend.close()
@@ -0,0 +1,251 @@
+import asyncio
+import typing as t
+
+import pytest
+from starlette.datastructures import Headers
+
+from unfazed.cache import ResponseCacheMiddleware, cache_response, caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.cache.response import ResponseCache
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse, StreamingResponse
+from unfazed.middleware.hooks import HookMiddleware
+from unfazed.route import Route
+from unfazed.test import Requestfactory
+from unfazed.type import Message, Receive, Scope, Send
+
+calls: t.Dict[str, int] = {}
+
+
+def count(name: str) -> int:
+    calls[name] = calls.get(name, 0) + 1
+    return calls[name]
+
+
+@cache_response(using="test_response_cache", timeout=60, vary=["Accept-Language"])
+async def catalogue(request: HttpRequest) -> HttpResponse:
+    n = count("catalogue")
+    lang = request.headers.get("accept-language", "en")
+    return HttpResponse(
+        f"catalogue {n} {lang} {request.query_params}",
+        headers={"Vary": "Accept-Language"},
+    )
+
+
+@cache_response(using="test_response_cache", timeout=0, stale_timeout=60)
+async def stale(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(f"stale {count('stale')}")
+
+
+async def private(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(
+        f"private {count('private')}", headers={"Cache-Control": "private"}
+    )
+
+
+async def stream(request: HttpRequest) -> StreamingResponse:
+    n = count("stream")
+
+    async def chunks() -> t.AsyncIterator[bytes]:
+        for i in range(3):
+            yield f"{n}-{i};".encode()
+
+    return StreamingResponse(chunks())
+
+
+async def profile(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(f"profile {count('profile')}")
+
+
+class CatalogueCache(ResponseCacheMiddleware):
+    using = "test_response_cache"
+
+
+class CookieCache(ResponseCacheMiddleware):
+    using = "test_response_cache"
+    vary = ("Cookie",)
+
+
+class FakeUser(HookMiddleware):
+    async def on_request(self, scope: Scope, receive: Receive) -> None:
+        for name, value in scope["headers"]:
+            if name == b"x-user":
+                scope["user"] = value.decode()
+
+
+@pytest.fixture(autouse=True)
+async def setup_response_cache() -> t.AsyncGenerator[None, None]:
+    caches["test_response_cache"] = LocMemCache(location="test_response_cache")
+    calls.clear()
+
+    yield
+
+    await caches["test_response_cache"].clear()
+
+
+async def make_app() -> Unfazed:
+    middleware = "tests.test_cache.test_response_cache.CatalogueCache"
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"DEBUG": True}),
+        routes=[
+            Route("/catalogue", endpoint=catalogue),
+            Route("/stale", endpoint=stale),
+            Route("/private", endpoint=private, middlewares=[middleware]),
+            Route("/stream", endpoint=stream, middlewares=[middleware]),
+            Route(
+                "/profile",
+                endpoint=profile,
+                middlewares=[
+                    "tests.test_cache.test_response_cache.FakeUser",
+                    middleware,
+                ],
+            ),
+            Route(
+                "/by-cookie",
+                endpoint=profile,
+                middlewares=["tests.test_cache.test_response_cache.CookieCache"],
+            ),
+        ],
+    )
+    await unfazed.setup()
+    return unfazed
+
+
+async def test_cache_hit() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/catalogue?b=2&a=1")
+        assert resp.text == "catalogue 1 en b=2&a=1"
+        etag = resp.headers["etag"]
+
+        # query order does not matter
+        resp = await request.get("/catalogue?a=1&b=2")
+        assert resp.text == "catalogue 1 en b=2&a=1"
+        assert resp.headers["etag"] == etag
+        assert resp.headers["age"] == "0"
+        assert resp.headers["content-length"] == str(len(resp.content))
+
+        resp = await request.head("/catalogue?a=1&b=2")
+        assert resp.status_code == 200
+        assert resp.content == b""
+
+        # vary header is part of the key
+        resp = await request.get(
+            "/catalogue?a=1&b=2", headers={"Accept-Language": "fr"}
+        )
+        assert resp.text == "catalogue 2 fr a=1&b=2"
+
+        # so are the host and the scheme
+        resp = await request.get(
+            "/catalogue?a=1&b=2", headers={"Host": "other.example.com"}
+        )
+        assert resp.text == "catalogue 3 en a=1&b=2"
+        cache = ResponseCache()
+        scope: Scope = {"type": "http", "path": "/", "query_string": b""}
+        headers = Headers({"host": "example.com"})
+        assert cache.make_key({**scope, "scheme": "http"}, headers) != cache.make_key(
+            {**scope, "scheme": "https"}, headers
+        )
+
+        # conditional get
+        resp = await request.get("/catalogue?a=1&b=2", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+        # never shared with authorized requests
+        resp = await request.get("/catalogue?a=1&b=2", headers={"Authorization": "x"})
+        assert resp.text == "catalogue 4 en a=1&b=2"
+
+        # not modified on a miss
+        resp = await request.get("/catalogue", headers={"If-None-Match": "*"})
+        assert resp.status_code == 304
+        assert calls["catalogue"] == 5
+
+
+async def test_personalized_requests() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/profile")).text == "profile 1"
+        assert (await request.get("/profile")).text == "profile 1"
+
+        # cookie or session authenticated requests bypass the cache
+        for _ in range(2):
+            resp = await request.get("/profile", headers={"Cookie": "session=a"})
+            assert resp.text != "profile 1"
+            resp = await request.get("/profile", headers={"X-User": "alice"})
+            assert resp.text != "profile 1"
+        assert calls["profile"] == 5
+
+        # unless the cookie is part of the key
+        calls.clear()
+        for cookie in ("session=a", "session=a", "session=b"):
+            await request.get("/by-cookie", headers={"Cookie": cookie})
+        assert calls["profile"] == 2
+
+
+async def test_uncacheable() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/private")).text == "private 1"
+        assert (await request.get("/private")).text == "private 2"
+
+
+async def test_streaming() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/stream")
+        assert resp.text == "1-0;1-1;1-2;"
+        assert "etag" not in resp.headers
+
+        resp = await request.get("/stream")
+        assert resp.text == "1-0;1-1;1-2;"
+        assert "etag" in resp.headers
+
+
+async def test_stale_while_revalidate() -> None:
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/stale")).text == "stale 1"
+        # stale, served while refreshing in the background
+        assert (await request.get("/stale")).text == "stale 1"
+
+        route = unfazed.router.routes[1]
+        cache: ResponseCache = route.app.cache  # type: ignore
+        await asyncio.gather(*cache.tasks)
+        assert not cache.refreshing
+
+        assert (await request.get("/stale")).text == "stale 2"
+
+
+async def test_max_size() -> None:
+    cache = ResponseCache(using="test_response_cache", max_size=4)
+    messages: t.List[Message] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await HttpResponse("too large")(scope, receive, send)
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    await cache.wrap(app)(scope, receive, send)
+    await cache.wrap(app)(scope, receive, send)
+
+    assert messages[1]["body"] == messages[3]["body"] == b"too large"
+    assert len(caches["test_response_cache"]._cache) == 0
+
+
+async def test_missing_alias() -> None:
+    cache = ResponseCache(using="missing")
+    with pytest.raises(ValueError):
+        _ = cache.backend
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import threading
+import time
+import typing as t
+
+import pytest
+from anyio.to_thread import current_default_thread_limiter
+from pydantic import ValidationError
+
+from unfazed.cache import cached, caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.concurrency import (
+    ExecutorPool,
+    deadline,
+    executors,
+    get_deadline,
+    run_in_executor,
+)
+from unfazed.concurrency.lifespan import ExecutorShutdown
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.route import path
+from unfazed.schema import Executor
+from unfazed.test import Requestfactory
+
+
+def sleep_and_name(seconds: float) -> str:
+    time.sleep(seconds)
+    return threading.current_thread().name
+
+
+def get_pid() -> int:
+    return os.getpid()
+
+
+def report(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(threading.current_thread().name)
+
+
+@cached(using="test_executor", executor="reports")
+def build_summary(**kwargs: t.Any) -> str:
+    return threading.current_thread().name
+
+
+async def test_executor_pool() -> None:
+    pool = ExecutorPool("bounded", Executor(MAX_WORKERS=2, THREAD_NAME_PREFIX="bnd"))
+
+    tasks = [asyncio.create_task(pool.run(sleep_and_name, 0.1)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    stats = pool.stats()
+    assert stats["running"] == 2
+    assert stats["queued"] == 3
+
+    names = await asyncio.gather(*tasks)
+    assert all(name.startswith("bnd") for name in names)
+
+    stats = pool.stats()
+    assert stats["completed"] == 5
+    assert stats["queued"] == stats["running"] == 0
+    assert stats["wait_max"] >= 0.1
+    assert stats["wait_avg"] > 0
+
+    # a cancelled caller returns, the call keeps its worker
+    task = asyncio.create_task(pool.run(sleep_and_name, 0.1))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert pool.stats()["running"] == 1
+    await asyncio.sleep(0.15)
+    assert pool.stats()["running"] == 0
+
+    # the caller's context reaches the thread
+    with deadline(10) as current:
+        assert await pool.run(get_deadline) == current
+
+    pool.shutdown()
+
+
+async def test_process_executor() -> None:
+    pool = ExecutorPool("processes", Executor(KIND="process", START_METHOD="spawn"))
+    assert await pool.run(get_pid) != os.getpid()
+    pool.shutdown()
+
+
+async def test_named_executors() -> None:
+    caches["test_executor"] = LocMemCache(location="test_executor")
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": True,
+                "EXECUTORS": {"reports": {"MAX_WORKERS": 1}},
+            }
+        ),
+        routes=[
+            path("/report", endpoint=report, executor="reports"),
+            path("/default", endpoint=report),
+        ],
+    )
+    await unfazed.setup()
+    assert executors.stats()["reports"]["max_workers"] == 1
+
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/report")).text.startswith("unfazed-reports")
+        assert not (await request.get("/default")).text.startswith("unfazed-")
+
+    assert (await build_summary()).startswith("unfazed-reports")
+    assert executors["reports"].stats()["completed"] == 2
+
+    assert await run_in_executor("default", get_pid) == os.getpid()
+    with pytest.raises(KeyError):
+        await run_in_executor("missing", get_pid)
+
+    await ExecutorShutdown(unfazed).on_shutdown()
+    assert executors["reports"].pool is None
+
+    del executors["reports"]
+    await caches["test_executor"].close()
+
+
+async def test_route_executor_checks() -> None:
+    def make_app(executor: str, **settings: t.Any) -> Unfazed:
+        return Unfazed(
+            settings=UnfazedSettings.model_validate({"DEBUG": True, **settings}),
+            routes=[path("/report", endpoint=report, executor=executor)],
+        )
+
+    # endpoints can not be sent to another process
+    with pytest.raises(ValueError, match="thread executor"):
+        await make_app("crunch", EXECUTORS={"crunch": {"KIND": "process"}}).setup()
+
+    # checked when the route is built once the executor is known
+    with pytest.raises(ValueError, match="thread executor"):
+        path("/report", endpoint=report, executor="crunch")
+
+    with pytest.raises(ValueError, match="not declared"):
+        await make_app("missing").setup()
+
+    del executors["crunch"]
+
+
+async def test_threadpool_size() -> None:
+    limiter = current_default_thread_limiter()
+    total = limiter.total_tokens
+    try:
+        await Unfazed(
+            settings=UnfazedSettings.model_validate(
+                {"DEBUG": True, "THREADPOOL_SIZE": 7}
+            )
+        ).setup()
+        assert limiter.total_tokens == 7
+    finally:
+        limiter.total_tokens = total
+
+
+def test_executor_settings() -> None:
+    with pytest.raises(ValidationError):
+        Executor(KIND="process", START_METHOD="fork", MAX_TASKS_PER_CHILD=10)
+
+    with pytest.raises(ValidationError):
+        Executor(MAX_WORKERS=0)
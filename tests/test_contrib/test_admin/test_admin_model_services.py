@@ -1,4 +1,5 @@
 import datetime
+import threading
 import typing as t
 import uuid
 
@@ -19,6 +20,8 @@ from tests.apps.admin.registry.models import (
     T2User,
     T2UserRole,
 )
+from unfazed.concurrency import ExecutorPool, executors
+from unfazed.conf import settings
 from unfazed.contrib.admin.registry import (
     ActionKwargs,
     ModelAdmin,
@@ -28,8 +31,10 @@ from unfazed.contrib.admin.registry import (
 )
 from unfazed.contrib.admin.schema import Action
 from unfazed.contrib.admin.services import AdminModelService
+from unfazed.contrib.admin.settings import UnfazedContribAdminSettings
 from unfazed.exception import PermissionDenied
 from unfazed.http import HttpRequest
+from unfazed.schema import Executor
 from unfazed.serializer import Serializer
 
 
@@ -327,6 +332,8 @@ async def test_admin_batch_services_hooks(
         class Meta:
             model = Car
 
+    saved_ids: t.List[int] = []
+
     @register(BatchHookCarSerializer)
     class BatchHookCarAdmin(ModelAdmin):
         async def batch_before_save(
@@ -343,6 +350,8 @@ async def test_admin_batch_services_hooks(
             event_log.append(
                 ("batch_after_save", [instance.alias for instance in instances])
             )
+            # created rows reach the hook with their generated ids
+            saved_ids.extend(instance.pk for instance in instances)
             return instances
 
     await AdminModelService.batch_model_save(
@@ -400,6 +409,7 @@ async def test_admin_batch_services_hooks(
 
     saved_cars = await Car.filter(created_at__in=[11001, 11002]).order_by("created_at")
     assert [car.alias for car in saved_cars] == ["batch-one", "batch-two"]
+    assert saved_ids == [car.id for car in saved_cars]
     assert event_log == [
         ("batch_before_save", ["batch-one", "batch-two"]),
         ("batch_after_save", ["batch-one", "batch-two"]),
@@ -778,3 +788,34 @@ async def test_permission_denied() -> None:
             ),
             request,
         )
+
+
+async def test_action_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    admin_collector.clear()
+
+    class CarSerializer(Serializer):
+        class Meta:
+            model = Car
+
+    @register(CarSerializer)
+    class TSCarAdmin(ModelAdmin):
+        @action(name="thread_name")
+        def thread_name(self, ctx: ActionKwargs) -> str:
+            return threading.current_thread().name
+
+    admin_settings: UnfazedContribAdminSettings = settings[
+        "UNFAZED_CONTRIB_ADMIN_SETTINGS"
+    ]
+    monkeypatch.setattr(admin_settings, "actionExecutor", "admin_actions")
+    executors["admin_actions"] = ExecutorPool("admin_actions", Executor(MAX_WORKERS=1))
+
+    try:
+        ret = await AdminModelService.model_action(
+            Action(name="TSCarAdmin", action="thread_name", search_condition=[]),
+            build_request(),
+        )
+        assert ret.startswith("unfazed-admin_actions")
+    finally:
+        executors["admin_actions"].shutdown()
+        del executors["admin_actions"]
+        admin_collector.clear()
@@ -4,6 +4,7 @@ import pytest
 
 from tests.apps.admin.registry.models import T1User, T2User
 from unfazed.contrib.admin.registry import (
+    BaseAdmin,
     CustomAdmin,
     ModelAdmin,
     admin_collector,
@@ -11,6 +12,8 @@ from unfazed.contrib.admin.registry import (
     register,
 )
 from unfazed.contrib.admin.services import AdminModelService
+from unfazed.contrib.auth.mixin import AuthMixin
+from unfazed.contrib.auth.resolver import permission_resolver
 from unfazed.http import HttpRequest
 from unfazed.serializer import Serializer
 
@@ -23,6 +26,14 @@ class _NonSuperUser:
     is_superuser = False
 
 
+class _StaffUser:
+    is_superuser = 0
+    permissions: t.FrozenSet[str] = frozenset()
+
+    async def has_permission(self, access: str) -> bool:
+        return access in self.permissions
+
+
 def build_request() -> HttpRequest:
     request = HttpRequest(scope={"type": "http", "method": "GET", "user": _SuperUser()})
     return request
@@ -117,3 +128,104 @@ async def test_route_service(setup_route_service_env: t.AsyncGenerator) -> None:
     routes_non_super = await AdminModelService.list_route(build_non_super_request())
     assert isinstance(routes_non_super, list)
     assert len(routes_non_super) == 0  # No routes for non-superuser
+
+
+async def test_batch_view_perm() -> None:
+    admin_collector.clear()
+    awaited = []
+
+    @register()
+    class DefaultPermAdmin(CustomAdmin):
+        pass
+
+    @register()
+    class AwaitedPermAdmin(CustomAdmin):
+        async def has_view_perm(self, request: HttpRequest) -> bool:
+            awaited.append(self.name)
+            return True
+
+    @register()
+    class SetPermAdmin(CustomAdmin):
+        def check_view_perm(self, request: HttpRequest, permissions: t.Any) -> bool:
+            return True
+
+        async def has_view_perm(self, request: HttpRequest) -> bool:
+            raise AssertionError("decided by check_view_perm")
+
+    admins = [admin_ins for _, admin_ins in admin_collector]
+
+    ret = await BaseAdmin.batch_view_perm(build_non_super_request(), admins)
+    assert ret == {
+        "DefaultPermAdmin": False,
+        "AwaitedPermAdmin": True,
+        "SetPermAdmin": True,
+    }
+    assert awaited == ["AwaitedPermAdmin"]
+
+    ret = await BaseAdmin.batch_view_perm(build_request(), admins)
+    assert ret["DefaultPermAdmin"] is True
+
+    admin_collector.clear()
+
+
+async def test_default_view_perm(
+    setup_route_service_env: t.AsyncGenerator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def resolve(user: _StaffUser) -> t.FrozenSet[str]:
+        return user.permissions
+
+    monkeypatch.setattr(permission_resolver, "resolve", resolve)
+
+    @register()
+    class DefaultPermAdmin(CustomAdmin):
+        pass
+
+    @register()
+    class RbacPermAdmin(AuthMixin, CustomAdmin):
+        pass
+
+    @register()
+    class OtherPermAdmin(AuthMixin, CustomAdmin):
+        pass
+
+    admins = [
+        admin_collector["DefaultPermAdmin"],
+        admin_collector["RbacPermAdmin"],
+        admin_collector["OtherPermAdmin"],
+    ]
+    monkeypatch.setattr(
+        _StaffUser,
+        "permissions",
+        frozenset(admin_ins.view_permission for admin_ins in admins[:2]),
+    )
+
+    # only AuthMixin admins admit a non-superuser holding the view codename
+    request = HttpRequest(scope={"type": "http", "method": "GET", "user": _StaffUser()})
+    ret = await BaseAdmin.batch_view_perm(request, admins)
+    assert ret == {
+        "DefaultPermAdmin": False,
+        "RbacPermAdmin": True,
+        "OtherPermAdmin": False,
+    }
+
+    # the set based checks agree with has_view_perm
+    for admin_ins in admins:
+        assert await admin_ins.has_view_perm(request) is ret[admin_ins.name]
+
+
+async def test_route_cache(setup_route_service_env: t.AsyncGenerator) -> None:
+    routes = await AdminModelService.list_route(build_request())
+    assert await AdminModelService.list_route(build_request()) is routes
+
+    # users with other permissions get their own tree
+    assert await AdminModelService.list_route(build_non_super_request()) == []
+    assert await AdminModelService.list_route(build_request()) is routes
+
+    # registering an admin drops cached trees
+    @register()
+    class T2CustomAdmin(CustomAdmin):
+        pass
+
+    new_routes = await AdminModelService.list_route(build_request())
+    assert new_routes is not routes
+    assert sum(len(r.routes) for r in new_routes) == 4
@@ -0,0 +1,81 @@
+import asyncio
+import typing as t
+
+import pytest
+
+from unfazed.contrib.admin.audit import AuditFlusher, AuditSink, audit_sink
+from unfazed.contrib.admin.models import LogEntry
+from unfazed.core import Unfazed
+
+
+def entry(path: str) -> t.Dict[str, t.Any]:
+    return {
+        "created_at": 1,
+        "account": "admin",
+        "path": path,
+        "ip": "127.0.0.1",
+        "request": b'{"name": "unfazed"}',
+        "response": b'{"code": 0}',
+    }
+
+
+@pytest.fixture(autouse=True)
+async def setup_audit_env() -> t.AsyncGenerator:
+    await LogEntry.all().delete()
+    yield
+    await LogEntry.all().delete()
+
+
+async def test_audit_sink_inline() -> None:
+    sink = AuditSink()
+    await sink.put(**entry("/inline"))
+
+    log = await LogEntry.get(path="/inline")
+    assert log.request == '{"name": "unfazed"}'
+    assert log.response == '{"code": 0}'
+
+
+async def test_audit_sink_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches: t.List[int] = []
+    bulk_create = LogEntry.bulk_create
+
+    async def counting_bulk_create(objects: t.List[LogEntry]) -> t.Any:
+        batches.append(len(objects))
+        return await bulk_create(objects)
+
+    monkeypatch.setattr(LogEntry, "bulk_create", counting_bulk_create)
+
+    sink = AuditSink(max_size=4, batch_size=3, interval=0.05)
+    sink.start()
+    with pytest.raises(RuntimeError):
+        sink.configure(10, 10, 1)
+
+    # a full queue makes put wait for the writer
+    await asyncio.wait_for(
+        asyncio.gather(*(sink.put(**entry(f"/batch/{i}")) for i in range(7))), 5
+    )
+    # the last one is flushed by the interval
+    await asyncio.sleep(0.2)
+    assert await LogEntry.filter(path__startswith="/batch/").count() == 7
+    assert batches[:2] == [3, 3]
+
+    # stop writes what is still queued
+    await sink.put(**entry("/stop/1"))
+    await sink.put(**entry("/stop/2"))
+    await sink.stop()
+    assert not sink.running
+    assert await LogEntry.filter(path__startswith="/stop/").count() == 2
+
+    await sink.stop()
+
+
+async def test_audit_flusher(setup_admin_unfazed: Unfazed) -> None:
+    flusher = AuditFlusher(setup_admin_unfazed)
+    await flusher.on_startup()
+    assert audit_sink.running
+
+    await audit_sink.put(**entry("/flusher"))
+    await flusher.on_shutdown()
+
+    assert not audit_sink.running
+    assert await LogEntry.exists(path="/flusher")
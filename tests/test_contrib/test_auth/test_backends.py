@@ -3,9 +3,14 @@ import typing as t
 import pytest
 
 from tests.apps.auth.common.models import User
+from unfazed.concurrency import ExecutorPool, executors
+from unfazed.conf import settings
 from unfazed.contrib.auth.backends import DefaultAuthBackend
+from unfazed.contrib.auth.hashers import PBKDF2PasswordHasher
 from unfazed.contrib.auth.schema import LoginCtx, RegisterCtx
+from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
 from unfazed.exception import AccountExisted, AccountNotFound, WrongPassword
+from unfazed.schema import Executor
 
 
 @pytest.fixture(autouse=True)
@@ -80,3 +85,84 @@ async def test_default_backend() -> None:
     oauth_logout_ret = await bkd.oauth_logout_redirect()
 
     assert oauth_logout_ret == ""
+
+
+class FastHasher(PBKDF2PasswordHasher):
+    iterations = 10
+
+
+def test_pbkdf2_hasher() -> None:
+    hasher = FastHasher()
+
+    encoded = hasher.encode("secret", salt="salt")
+    assert encoded.startswith("pbkdf2_sha256$10$salt$")
+    assert encoded == hasher.encode("secret", salt="salt")
+    assert hasher.encode("secret") != hasher.encode("secret")
+
+    assert hasher.verify("secret", encoded)
+    assert not hasher.verify("wrong", encoded)
+    assert not hasher.verify("secret", "pbkdf2_sha256$x$salt$hash")
+    assert not hasher.verify("secret", "md5$10$salt$hash")
+
+    # hashes keep their own cost when iterations change
+    assert PBKDF2PasswordHasher().verify("secret", encoded)
+
+    assert hasher.identify(encoded)
+    assert hasher.needs_upgrade("secret")
+
+
+async def test_backend_with_hasher(monkeypatch: pytest.MonkeyPatch) -> None:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(
+        setting,
+        "PASSWORD_HASHER",
+        "tests.test_contrib.test_auth.test_backends.FastHasher",
+    )
+
+    bkd = DefaultAuthBackend()
+    # the test module may be imported twice, compare by value
+    assert isinstance(bkd.hasher, PBKDF2PasswordHasher)
+    assert bkd.hasher.iterations == 10
+
+    await bkd.register(RegisterCtx(account="hashed", password="secret"))
+    user = await User.get(account="hashed")
+    assert user.password.startswith("pbkdf2_sha256$")
+
+    await bkd.login(LoginCtx(account="hashed", password="secret"))
+    with pytest.raises(WrongPassword):
+        await bkd.login(LoginCtx(account="hashed", password="wrong"))
+
+    # plaintext rows from before the hasher are upgraded on login
+    await User.create(account="legacy", password="legacy")
+    with pytest.raises(WrongPassword):
+        await bkd.login(LoginCtx(account="legacy", password="wrong"))
+    assert (await User.get(account="legacy")).password == "legacy"
+
+    await bkd.login(LoginCtx(account="legacy", password="legacy"))
+    legacy = await User.get(account="legacy")
+    assert bkd.hasher.verify("legacy", legacy.password)
+
+    await bkd.login(LoginCtx(account="legacy", password="legacy"))
+
+
+async def test_hasher_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(
+        setting,
+        "PASSWORD_HASHER",
+        "tests.test_contrib.test_auth.test_backends.FastHasher",
+    )
+    monkeypatch.setattr(setting, "PASSWORD_HASHER_EXECUTOR", "hashers")
+    executors["hashers"] = ExecutorPool("hashers", Executor(MAX_WORKERS=1))
+
+    try:
+        bkd = DefaultAuthBackend()
+        assert bkd.hasher is not None and bkd.hasher.executor == "hashers"
+
+        await bkd.register(RegisterCtx(account="hashed", password="secret"))
+        await bkd.login(LoginCtx(account="hashed", password="secret"))
+        # one encode on register, one verify on login
+        assert executors["hashers"].stats()["completed"] == 2
+    finally:
+        executors["hashers"].shutdown()
+        del executors["hashers"]
@@ -1,9 +1,22 @@
 import typing as t
 
 import pytest
+from tortoise.transactions import in_transaction
 
 from tests.apps.auth.common.models import User
-from unfazed.contrib.auth.models import Group, Permission, Role
+from unfazed.cache import caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.conf import settings
+from unfazed.contrib.auth.models import (
+    AbstractUser,
+    Group,
+    Permission,
+    Role,
+    RolePermission,
+)
+from unfazed.contrib.auth.resolver import PermissionResolver, permission_resolver
+from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
+from unfazed.contrib.auth.signals import invalidate_permissions
 
 
 @pytest.fixture(autouse=True)
@@ -85,3 +98,100 @@ async def test_permission() -> None:
     await r3.groups.add(g3)
 
     assert await r3.query_users() == [u2, u3]
+
+
+async def test_permission_resolver(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    u1 -> r1 -> p1
+    u1 -> g1 -> r2 -> p2
+    """
+
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(setting, "PERMISSION_CACHE", "permission")
+    caches["permission"] = LocMemCache("permission")
+
+    u1 = await User.create(account="u1")
+    g1 = await Group.create(name="g1")
+    r1 = await Role.create(name="r1")
+    r2 = await Role.create(name="r2")
+    p1 = await Permission.create(access="p1")
+    p2 = await Permission.create(access="p2")
+    p3 = await Permission.create(access="p3")
+
+    await u1.roles.add(r1)
+    await u1.groups.add(g1)
+    await g1.roles.add(r2)
+    await r1.permissions.add(p1)
+    await r2.permissions.add(p2)
+
+    queries: t.List[int] = []
+    query = PermissionResolver.query
+
+    async def counting_query(
+        self: PermissionResolver, user: AbstractUser
+    ) -> t.FrozenSet[str]:
+        queries.append(user.pk)
+        return await query(self, user)
+
+    monkeypatch.setattr(PermissionResolver, "query", counting_query)
+
+    try:
+        await permission_resolver.invalidate()
+
+        assert await permission_resolver.resolve(u1) == {"p1", "p2"}
+        assert await u1.has_permission("p1") is True
+        assert await u1.has_permission("p2") is True
+        assert await u1.has_permission("p3") is False
+        # resolved once, then served from the instance
+        assert len(queries) == 1
+
+        # m2m changes bypass signals, another instance still hits the cache
+        await r1.permissions.remove(p1)
+        u1_copy = await User.get(id=u1.id)
+        assert await u1_copy.has_permission("p1") is True
+        assert len(queries) == 1
+
+        await permission_resolver.invalidate()
+        assert await u1.has_permission("p1") is False
+        assert len(queries) == 2
+
+        # saving a through row invalidates everything
+        await RolePermission.create(role=r1, permission=p3)
+        assert await u1.has_permission("p3") is True
+        assert await u1_copy.has_permission("p3") is True
+        assert len(queries) == 3
+
+        # deleting a role as well
+        await r2.delete()
+        assert await u1.has_permission("p2") is False
+
+        # bulk writes fire no signals, the bulk paths invalidate explicitly
+        p4 = await Permission.create(access="p4")
+        await permission_resolver.resolve(u1)
+        await RolePermission.bulk_create([RolePermission(role=r1, permission=p4)])
+        await invalidate_permissions(Role)
+        assert await u1.has_permission("p4") is False
+        await invalidate_permissions(RolePermission)
+        assert await u1.has_permission("p4") is True
+
+        # writes in a transaction wait for the commit
+        p5 = await Permission.create(access="p5")
+        await permission_resolver.resolve(u1)
+        async with in_transaction(RolePermission._meta.default_connection) as conn:
+            await RolePermission.create(role=r1, permission=p5, using_db=conn)
+        assert await u1.has_permission("p5") is False
+        await invalidate_permissions(RolePermission)
+        assert await u1.has_permission("p5") is True
+
+        # superusers skip the resolver
+        u1.is_superuser = 1
+        assert await u1.has_permission("anything") is True
+
+        # unknown alias
+        monkeypatch.setattr(setting, "PERMISSION_CACHE", "notexist")
+        with pytest.raises(ValueError):
+            await permission_resolver.invalidate()
+
+    finally:
+        await caches["permission"].clear()
+        del caches["permission"]
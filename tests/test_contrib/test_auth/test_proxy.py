@@ -0,0 +1,211 @@
+import typing as t
+import uuid
+
+import pytest
+from tortoise.signals import Signals
+
+from tests.apps.auth.common.models import User
+from unfazed.cache import caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.conf import settings
+from unfazed.contrib.auth.decorators import login_required
+from unfazed.contrib.auth.endpoints import logout
+from unfazed.contrib.auth.middleware import AuthenticationMiddleware, aget_user
+from unfazed.contrib.auth.models import Permission, Role
+from unfazed.contrib.auth.proxy import (
+    SessionUser,
+    _clear_cached_user,
+    connect_user_cache,
+)
+from unfazed.contrib.auth.resolver import permission_resolver
+from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
+from unfazed.contrib.session.backends.cache import CacheSession
+from unfazed.contrib.session.backends.default import SigningSession
+from unfazed.contrib.session.settings import SessionSettings
+from unfazed.exception import LoginRequired
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.type import Receive, Scope, Send
+
+
+@pytest.fixture
+async def setup_proxy_env(
+    monkeypatch: pytest.MonkeyPatch,
+) -> t.AsyncGenerator[t.Tuple[User, t.List[int]], None]:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(setting, "USER_CACHE", "user")
+    caches["user"] = LocMemCache("user")
+
+    await User.all().delete()
+    user = await User.create(account="u1", email="u1@unfazed.com", password="pwd")
+
+    loads: t.List[int] = []
+    get = User.get.__func__  # type: ignore
+
+    def counting_get(cls: t.Type[User], *args: t.Any, **kwargs: t.Any) -> t.Any:
+        loads.append(kwargs["id"])
+        return get(cls, *args, **kwargs)
+
+    monkeypatch.setattr(User, "get", classmethod(counting_get))
+
+    yield user, loads
+
+    await User.all().delete()
+    await caches["user"].clear()
+    del caches["user"]
+
+
+def session_info(user: User) -> t.Dict[str, t.Any]:
+    return {
+        "id": user.id,
+        "account": user.account,
+        "email": user.email,
+        "is_superuser": user.is_superuser,
+        "platform": "web",
+    }
+
+
+async def test_session_user(setup_proxy_env: t.Tuple[User, t.List[int]]) -> None:
+    user, loads = setup_proxy_env
+
+    proxy = SessionUser(User, session_info(user))
+
+    # snapshot fields never touch the database
+    assert isinstance(proxy, User)
+    assert proxy.pk == user.id
+    assert proxy.id == user.id
+    assert proxy.account == "u1"
+    assert proxy.email == "u1@unfazed.com"
+    assert proxy == user
+    assert hash(proxy) == hash(user.id)
+    assert proxy.loaded is False
+    assert "SessionUser" in repr(proxy)
+
+    with pytest.raises(AttributeError):
+        _ = proxy.password
+
+    with pytest.raises(AttributeError):
+        proxy.account = "u2"
+
+    # sync methods and properties need the model instance
+    with pytest.raises(AttributeError, match="load"):
+        proxy.display()
+    with pytest.raises(AttributeError, match="load"):
+        _ = proxy.has_password
+    assert proxy.UserCls() is User
+
+    # permission checks only need the id
+    role = await Role.create(name="r1")
+    await role.permissions.add(await Permission.create(access="p1"))
+    await user.roles.add(role)
+    await permission_resolver.invalidate()
+    assert await proxy.has_permission("p1") is True
+    assert await proxy.has_permission("p2") is False
+    assert loads == []
+
+    # async model methods load the row once
+    assert await proxy.query_roles() == [role]
+    assert proxy.loaded is True
+    assert proxy.password == "pwd"
+    assert loads == [user.id]
+    assert proxy.display() == "u1 <u1@unfazed.com>"
+    assert proxy.has_password is True
+
+    # another request is served by the user cache
+    proxy2 = SessionUser(User, session_info(user))
+    loaded = await proxy2.load()
+    assert loaded.password == "pwd"
+    assert loads == [user.id]
+
+    proxy2.email = "new@unfazed.com"
+    await loaded.save()
+    # saving drops the cached row
+    proxy3 = SessionUser(User, session_info(user))
+    assert (await proxy3.load()).email == "new@unfazed.com"
+    assert loads == [user.id, user.id]
+
+    # superuser flag comes from the snapshot
+    superuser = SessionUser(User, {**session_info(user), "is_superuser": 1})
+    assert await superuser.has_permission("anything") is True
+
+    await role.delete()
+    await Permission.all().delete()
+
+
+async def test_connect_user_cache() -> None:
+    listeners = User._listeners[Signals.post_save][User]
+    connected = listeners.count(_clear_cached_user)
+    assert connected == 1
+
+    # ready() may run again, e.g. when the app is set up twice
+    connect_user_cache(User)
+    assert listeners.count(_clear_cached_user) == connected
+
+
+async def test_lazy_auth_middleware(
+    setup_proxy_env: t.Tuple[User, t.List[int]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user, loads = setup_proxy_env
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(setting, "LAZY_USER", True)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        pass
+
+    async def receive() -> t.Any:
+        pass
+
+    async def send(message: t.Any) -> None:
+        pass
+
+    session = SigningSession(SessionSettings(SECRET=uuid.uuid4().hex), None)
+    session[setting.SESSION_KEY] = session_info(user)
+
+    m = AuthenticationMiddleware(app)
+    scope: t.Dict[str, t.Any] = {"type": "http", "session": session}
+    await m(scope, receive, send)
+
+    assert isinstance(scope["user"], SessionUser)
+    assert scope["user"].account == "u1"
+    assert loads == []
+
+    # a deferred session is only loaded once the user is read
+    cache_setting = SessionSettings(SECRET=uuid.uuid4().hex, CACHE_ALIAS="user")
+    session = CacheSession(cache_setting, None)
+    session[setting.SESSION_KEY] = session_info(user)
+    await session.save()
+
+    def deferred_scope(session_key: str | None) -> t.Dict[str, t.Any]:
+        deferred = CacheSession(cache_setting, session_key)
+        deferred.deferred = True
+        return {"type": "http", "session": deferred}
+
+    scope = deferred_scope(session.session_key)
+    await m(scope, receive, send)
+    assert "user" not in scope
+    assert scope["session"].deferred is True
+
+    # cache sessions need I/O, the sync access fails until loaded
+    request = HttpRequest(scope)
+    with pytest.raises(RuntimeError, match="aload"):
+        _ = request.user
+    assert await aget_user(request) == user
+    assert request.user is scope["user"]
+    assert loads == []
+
+    @login_required
+    async def profile(request: HttpRequest) -> HttpResponse:
+        return HttpResponse(request.user.account)
+
+    scope = deferred_scope(session.session_key)
+    await m(scope, receive, send)
+    resp = await profile(HttpRequest(scope))
+    assert resp.body == b"u1"
+
+    scope = deferred_scope("missing")
+    await m(scope, receive, send)
+    with pytest.raises(LoginRequired):
+        await profile(HttpRequest(scope))
+
+    # auth endpoints load the session, with or without the middleware
+    resp = await logout(HttpRequest(deferred_scope("missing")))
+    assert resp.status_code == 200
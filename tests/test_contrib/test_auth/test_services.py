@@ -3,9 +3,13 @@ import typing as t
 import pytest
 
 from tests.apps.auth.common.models import User
+from unfazed.cache import caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.conf import settings
 from unfazed.contrib.auth.schema import LoginCtx, RegisterCtx
 from unfazed.contrib.auth.services import AuthService, load_backends
 from unfazed.contrib.auth.settings import AuthBackend, UnfazedContribAuthSettings
+from unfazed.exception import AccountNotFound, TooManyAttempts, WrongPassword
 
 
 @pytest.fixture(autouse=True)
@@ -49,3 +53,39 @@ async def test_failed_load() -> None:
 
     with pytest.raises(ValueError):
         load_backends(auth_settings)
+
+
+async def test_login_throttle(monkeypatch: pytest.MonkeyPatch) -> None:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(setting, "LOGIN_THROTTLE_CACHE", "throttle")
+    monkeypatch.setattr(setting, "LOGIN_THROTTLE_LIMIT", 2)
+    caches["throttle"] = LocMemCache("throttle")
+
+    service = AuthService()
+    wrong = LoginCtx(account="admin", password="wrong")
+    right = LoginCtx(account="admin", password="admin")
+
+    # a success resets the account counter
+    with pytest.raises(WrongPassword):
+        await service.login(wrong, "10.0.0.1")
+    await service.login(right, "10.0.0.2")
+    with pytest.raises(WrongPassword):
+        await service.login(wrong, "10.0.0.3")
+
+    with pytest.raises(WrongPassword):
+        await service.login(wrong, "10.0.0.4")
+    with pytest.raises(TooManyAttempts):
+        await service.login(right, "10.0.0.5")
+
+    # the ip counter is shared across accounts
+    await caches["throttle"].clear()
+    for account in ("a1", "a2"):
+        with pytest.raises(AccountNotFound):
+            await service.login(LoginCtx(account=account), "10.0.0.6")
+    with pytest.raises(TooManyAttempts):
+        await service.login(right, "10.0.0.6")
+    await service.login(right, "10.0.0.7")
+
+    monkeypatch.setattr(setting, "LOGIN_THROTTLE_CACHE", "notexist")
+    with pytest.raises(ValueError):
+        await service.login(right)
@@ -0,0 +1,198 @@
+import time
+import typing as t
+
+import pytest
+
+from tests.apps.auth.common.models import User
+from unfazed.cache import caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.conf import settings
+from unfazed.contrib.auth.backends.token import TokenAuthBackend
+from unfazed.contrib.auth.middleware import TokenAuthenticationMiddleware
+from unfazed.contrib.auth.proxy import SessionUser
+from unfazed.contrib.auth.schema import LoginCtx
+from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
+from unfazed.contrib.auth.tokens import BloomFilter, TokenManager
+from unfazed.exception import InvalidToken
+from unfazed.type import Receive, Scope, Send
+
+
+@pytest.fixture
+def setting(monkeypatch: pytest.MonkeyPatch) -> UnfazedContribAuthSettings:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    monkeypatch.setattr(setting, "TOKEN_SECRETS", ["secret"])
+    return setting
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+async def test_token_manager(
+    setting: UnfazedContribAuthSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = TokenManager()
+
+    token = manager.issue({"sub": 1, "account": "u1"})
+    assert token.count(".") == 2
+
+    claims = await manager.verify(token)
+    assert claims["sub"] == 1 and claims["account"] == "u1"
+    assert claims["exp"] - claims["iat"] == setting.TOKEN_EXPIRE
+
+    # served from the lru afterwards
+    monkeypatch.setattr(manager, "decode", None)
+    assert await manager.verify(token) is claims
+    monkeypatch.undo()
+    monkeypatch.setattr(setting, "TOKEN_SECRETS", ["secret"])
+
+    header, payload, signature = token.split(".")
+    for bad in (
+        "",
+        "abc",
+        "a.b.c",
+        f"{header}.{payload}.{signature[:-2]}AA",
+        f"{header}.{payload}x.{signature}",
+    ):
+        with pytest.raises(InvalidToken):
+            await manager.verify(bad)
+
+    expired = manager.issue({"sub": 1}, expires_in=-1)
+    with pytest.raises(InvalidToken):
+        await manager.verify(expired)
+
+    short = manager.issue({"sub": 1}, expires_in=10)
+    await manager.verify(short)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    with pytest.raises(InvalidToken):
+        await manager.verify(short)
+
+
+async def test_token_lru_size(
+    setting: UnfazedContribAuthSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(setting, "TOKEN_CACHE_SIZE", 2)
+    manager = TokenManager()
+
+    tokens = [manager.issue({"sub": i}) for i in range(3)]
+    for token in tokens:
+        await manager.verify(token)
+    assert len(manager.verified) == 2
+
+
+async def test_token_rotation(
+    setting: UnfazedContribAuthSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = TokenManager()
+    old = manager.issue({"sub": 1})
+    await manager.verify(old)
+
+    monkeypatch.setattr(setting, "TOKEN_SECRETS", ["new", "secret"])
+    new = manager.issue({"sub": 2})
+    assert (await manager.verify(old))["sub"] == 1
+    assert (await manager.verify(new))["sub"] == 2
+    assert new.split(".")[0] != old.split(".")[0]
+
+    # retiring a secret also drops tokens verified with it
+    monkeypatch.setattr(setting, "TOKEN_SECRETS", ["new"])
+    with pytest.raises(InvalidToken):
+        await manager.verify(old)
+    assert (await manager.verify(new))["sub"] == 2
+
+    monkeypatch.setattr(setting, "TOKEN_SECRETS", [])
+    with pytest.raises(ValueError):
+        manager.issue({"sub": 1})
+
+
+async def test_token_revocation(
+    setting: UnfazedContribAuthSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = TokenManager()
+    token = manager.issue({"sub": 1})
+    other = manager.issue({"sub": 2})
+
+    with pytest.raises(ValueError):
+        await manager.revoke(token)
+
+    monkeypatch.setattr(setting, "TOKEN_REVOCATION_CACHE", "revoked")
+    cache = LocMemCache("revoked")
+    caches["revoked"] = cache
+
+    await manager.verify(token)
+    await manager.revoke(token)
+    with pytest.raises(InvalidToken):
+        await manager.verify(token)
+    await manager.verify(other)
+
+    # another process sees the revocation after its next sync
+    peer = TokenManager()
+    await peer.verify(other)
+    reads: t.List[str] = []
+    hget = cache.hget
+
+    async def counting_hget(key: str, field: str) -> t.Any:
+        reads.append(field)
+        return await hget(key, field)
+
+    monkeypatch.setattr(cache, "hget", counting_hget)
+    await manager.revoke(other)
+    await peer.verify(other)
+    assert reads == []
+
+    peer.synced_at = 0
+    with pytest.raises(InvalidToken):
+        await peer.verify(other)
+    assert len(reads) == 1
+
+    # expired revocations are pruned on sync
+    await cache.hset(manager.REVOKED_KEY, mapping={"gone": int(time.time()) - 1})
+    await peer.sync(cache)
+    assert "gone" not in await cache.hgetall(manager.REVOKED_KEY)
+
+    del caches["revoked"]
+
+
+async def test_token_middleware(setting: UnfazedContribAuthSettings) -> None:
+    await User.all().delete()
+    user = await User.create(account="u1", email="u1@unfazed.com", password="pwd")
+
+    backend = TokenAuthBackend()
+    assert backend.alias == "token"
+    session_info, resp = await backend.login(LoginCtx(account="u1", password="pwd"))
+    assert resp["token_type"] == "bearer"
+    assert session_info["id"] == user.id
+
+    seen: t.List[t.Any] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(scope.get("user", "unset"))
+
+    middleware = TokenAuthenticationMiddleware(app)
+
+    async def noop(*args: t.Any) -> t.Any:
+        pass
+
+    token = resp["access_token"].encode()
+    for headers in (
+        [(b"authorization", b"Bearer " + token)],
+        [(b"authorization", b"Bearer bad")],
+        [(b"authorization", b"Basic abc")],
+        [],
+    ):
+        await middleware({"type": "http", "headers": headers}, noop, noop)
+
+    proxy, invalid, basic, missing = seen
+    assert isinstance(proxy, SessionUser)
+    assert proxy.pk == user.id
+    assert proxy.account == "u1"
+    assert invalid is None
+    assert basic == "unset" and missing == "unset"
+
+    await User.all().delete()
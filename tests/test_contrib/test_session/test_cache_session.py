@@ -0,0 +1,146 @@
+import typing as t
+import uuid
+
+import pytest
+
+from unfazed.cache import caches
+from unfazed.cache.backends.locmem import LocMemCache
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.contrib.session.backends.cache import CacheSession
+from unfazed.contrib.session.settings import SessionSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse, JsonResponse
+from unfazed.route import Route
+from unfazed.test import Requestfactory
+
+UNFAZED_SETTINGS = {
+    "PROJECT": "test_cache_session",
+    "MIDDLEWARE": ["unfazed.contrib.session.middleware.SessionMiddleware"],
+    "CACHE": {
+        "default": {
+            "BACKEND": "unfazed.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test_cache_session",
+        },
+    },
+}
+
+
+async def set_session(request: HttpRequest) -> HttpResponse:
+    request.session["foo"] = "bar"
+    return HttpResponse("ok")
+
+
+async def read_session(request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"foo": request.session["foo"]})
+
+
+@pytest.fixture
+async def cache() -> t.AsyncGenerator[LocMemCache, None]:
+    cache = LocMemCache("test_cache_session_backend")
+    caches["session"] = cache
+    CacheSession._refreshed.clear()
+
+    yield cache
+
+    await cache.clear()
+    del caches["session"]
+
+
+async def test_hash_storage(
+    cache: LocMemCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    setting = SessionSettings.model_validate(
+        {
+            "SECRET": uuid.uuid4().hex,
+            "CACHE_ALIAS": "session",
+            "CACHE_STORAGE": "hash",
+        }
+    )
+
+    writes: t.List[t.Tuple[str, t.Any]] = []
+    hset, hdel = cache.hset, cache.hdel
+
+    async def counting_hset(key: str, mapping: t.Dict[str, t.Any]) -> int:
+        writes.append(("hset", dict(mapping)))
+        return await hset(key, mapping=mapping)
+
+    async def counting_hdel(key: str, *fields: str) -> int:
+        writes.append(("hdel", fields))
+        return await hdel(key, *fields)
+
+    monkeypatch.setattr(cache, "hset", counting_hset)
+    monkeypatch.setattr(cache, "hdel", counting_hdel)
+
+    session = CacheSession(setting)
+    session["a"] = 1
+    session["b"] = {"big": "x" * 100}
+    await session.save()
+    assert writes == [("hset", {"a": 1, "b": {"big": "x" * 100}})]
+    key = t.cast(str, session.session_key)
+    assert await cache.ttl(key) is not None
+
+    # only the changed fields are written
+    writes.clear()
+    session2 = CacheSession(setting, key)
+    await session2.load()
+    assert session2["b"] == {"big": "x" * 100}
+    session2["a"] = 2
+    del session2["b"]
+    await session2.save()
+    assert writes == [("hdel", ("b",)), ("hset", {"a": 2})]
+    assert await cache.hgetall(key) == {"a": 2}
+
+    # flush + set rewrites the hash
+    writes.clear()
+    await session2.flush()
+    session2["c"] = 3
+    await session2.save()
+    assert writes == [("hset", {"c": 3})]
+    assert await cache.hgetall(key) == {"c": 3}
+
+    # emptied sessions drop the key
+    await session2.flush()
+    await session2.save()
+    assert await cache.has_key(key) is False
+
+    session3 = CacheSession(setting, key)
+    await session3.load()
+    assert bool(session3) is False
+
+
+async def test_sliding_expiry(cache: LocMemCache) -> None:
+    setting = SessionSettings.model_validate(
+        {
+            "SECRET": uuid.uuid4().hex,
+            "CACHE_ALIAS": "session",
+            "ENGINE": "unfazed.contrib.session.backends.cache.CacheSession",
+            "COOKIE_MAX_AGE": 100,
+            "SLIDING_EXPIRY": True,
+            "SLIDING_INTERVAL": 60,
+        }
+    )
+    settings["UNFAZED_CONTRIB_SESSION_SETTINGS"] = setting
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(UNFAZED_SETTINGS),
+        routes=[Route("/login", set_session), Route("/read", read_session)],
+    )
+    await unfazed.setup()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/login")
+        assert "Max-Age=100" in resp.headers["set-cookie"]
+        key = resp.cookies["session_id"]
+
+        # saved just now, no refresh needed
+        await cache.expire(key, 10)
+        resp = await request.get("/read")
+        assert resp.json() == {"foo": "bar"}
+        assert "set-cookie" not in resp.headers
+        assert t.cast(float, await cache.ttl(key)) <= 10
+
+        # the interval has passed, ttl and cookie are extended without a rewrite
+        CacheSession._refreshed[key] -= 60
+        resp = await request.get("/read")
+        assert resp.json() == {"foo": "bar"}
+        assert "Max-Age=100" in resp.headers["set-cookie"]
+        assert t.cast(float, await cache.ttl(key)) > 90
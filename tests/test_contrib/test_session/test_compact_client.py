@@ -0,0 +1,152 @@
+import base64
+import time
+import typing as t
+import uuid
+
+import pytest
+
+from unfazed.contrib.session.backends.compact import CompactSession
+from unfazed.contrib.session.backends.default import SigningSession
+from unfazed.contrib.session.settings import SessionSettings
+
+SESSION_KEY = "unfazed_session_key"
+
+
+async def test_compact_session() -> None:
+    session_setting = SessionSettings(SECRET=uuid.uuid4().hex)
+
+    session = CompactSession(session_setting=session_setting, session_key=None)
+    await session.load()
+    assert bool(session) is False
+
+    # empty sessions produce no cookie
+    await session.save()
+    assert session.session_key == ""
+
+    session[SESSION_KEY] = {"foo": "bar"}
+    await session.save()
+    assert session.modified is False
+
+    token = session.session_key
+    assert token is not None
+    # url safe, no padding
+    assert "=" not in token and "+" not in token and "/" not in token
+
+    session2 = CompactSession(session_setting=session_setting, session_key=token)
+    await session2.load()
+    assert session2[SESSION_KEY] == {"foo": "bar"}
+    assert session2.modified is False
+
+    # lazy access decodes without awaiting
+    session3 = CompactSession(session_setting=session_setting, session_key=token)
+    session3.deferred = True
+    assert SESSION_KEY in session3
+
+
+async def test_compact_session_compression() -> None:
+    session_setting = SessionSettings(SECRET=uuid.uuid4().hex, COMPRESS_THRESHOLD=64)
+    data = {"cart": [{"sku": f"SKU-{i}", "qty": i} for i in range(50)]}
+
+    session = CompactSession(session_setting=session_setting)
+    session["data"] = data
+    await session.save()
+    compressed = session.session_key
+
+    session_setting.compress_threshold = None
+    session = CompactSession(session_setting=session_setting)
+    session["data"] = data
+    await session.save()
+    plain = session.session_key
+
+    assert compressed is not None and plain is not None
+    assert len(compressed) < len(plain)
+
+    for token in (compressed, plain):
+        session = CompactSession(session_setting=session_setting, session_key=token)
+        await session.load()
+        assert session["data"] == data
+
+
+async def test_compact_session_rotation() -> None:
+    old_setting = SessionSettings(SECRET="old")
+    session = CompactSession(session_setting=old_setting)
+    session[SESSION_KEY] = 1
+    await session.save()
+    token = session.session_key
+
+    # the old secret is still accepted as a fallback
+    new_setting = SessionSettings(SECRET="new", SECRET_FALLBACKS=["old"])
+    session = CompactSession(session_setting=new_setting, session_key=token)
+    await session.load()
+    assert session[SESSION_KEY] == 1
+
+    # and new cookies are signed with the current one
+    session[SESSION_KEY] = 2
+    await session.save()
+    session = CompactSession(
+        session_setting=SessionSettings(SECRET="new"),
+        session_key=session.session_key,
+    )
+    await session.load()
+    assert session[SESSION_KEY] == 2
+
+    # dropped secrets are rejected
+    session = CompactSession(
+        session_setting=SessionSettings(SECRET="new"), session_key=token
+    )
+    await session.load()
+    assert bool(session) is False
+
+
+@pytest.mark.parametrize(
+    "token",
+    ["", "not base64 !", "c2hvcnQ", base64.urlsafe_b64encode(b"x" * 40).decode()],
+)
+async def test_compact_session_invalid(token: str) -> None:
+    session = CompactSession(
+        session_setting=SessionSettings(SECRET=uuid.uuid4().hex), session_key=token
+    )
+    await session.load()
+    assert bool(session) is False
+
+
+async def test_compact_session_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    session_setting = SessionSettings(SECRET=uuid.uuid4().hex, COOKIE_MAX_AGE=10)
+    session = CompactSession(session_setting=session_setting)
+    session[SESSION_KEY] = 1
+    await session.save()
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    session = CompactSession(
+        session_setting=session_setting, session_key=session.session_key
+    )
+    await session.load()
+    assert bool(session) is False
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {SESSION_KEY: {"id": 42, "username": "alice", "is_superuser": False}},
+        {
+            SESSION_KEY: {"id": 42, "username": "alice"},
+            "cart": [{"sku": f"SKU-{i:04d}", "qty": 1} for i in range(100)],
+        },
+    ],
+    ids=["small", "large"],
+)
+async def test_compact_session_size(data: t.Dict[str, t.Any]) -> None:
+    # timings are in benchmarks/session.py
+    session_setting = SessionSettings(SECRET=uuid.uuid4().hex)
+    cookies = []
+    for engine in (SigningSession, CompactSession):
+        session = engine(session_setting=session_setting)
+        for key, value in data.items():
+            session[key] = value
+        await session.save()
+        assert session.session_key is not None
+        cookies.append(session.session_key)
+
+    signing, compact = cookies
+    assert len(compact) < len(signing)
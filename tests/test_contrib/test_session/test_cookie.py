@@ -0,0 +1,35 @@
+import pytest
+
+from unfazed.contrib.session.utils import CookieBuilder, build_cookie
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"max_age": 100},
+        {"max_age": 100, "domain": ".example.com", "secure": True},
+        {"path": None, "httponly": False, "samesite": None},
+        {"max_age": 0, "path": "/api", "samesite": "strict"},
+    ],
+)
+@pytest.mark.parametrize("value", ["abc", "abc==", "cachesession:1:a:b", 'a b"c'])
+def test_cookie_builder(kwargs: dict, value: str) -> None:
+    builder = CookieBuilder("session_id", **kwargs)
+
+    assert builder.build(value) == build_cookie("session_id", value, **kwargs)
+    assert builder.build(value, expires="E") == build_cookie(
+        "session_id", value, expires="E", **kwargs
+    )
+
+
+def test_cookie_builder_deletion() -> None:
+    builder = CookieBuilder(
+        "session_id", max_age=100, domain=".example.com", secure=True
+    )
+
+    assert builder.deletion == (
+        "session_id=null; Domain=.example.com; "
+        "expires=Thu, 01 Jan 1970 00:00:00 GMT; "
+        "HttpOnly; Max-Age=0; Path=/; SameSite=lax; Secure"
+    )
@@ -0,0 +1,144 @@
+import typing as t
+import uuid
+
+import pytest
+
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.contrib.session.backends.cache import CacheSession
+from unfazed.contrib.session.backends.default import SigningSession
+from unfazed.contrib.session.settings import SessionSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse, JsonResponse
+from unfazed.route import Route
+from unfazed.test import Requestfactory
+
+UNFAZED_SETTINGS = {
+    "PROJECT": "test_session_lazy",
+    "MIDDLEWARE": ["unfazed.contrib.session.middleware.SessionMiddleware"],
+    "CACHE": {
+        "default": {
+            "BACKEND": "unfazed.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test_session_lazy",
+        },
+    },
+}
+
+
+async def set_session(request: HttpRequest) -> HttpResponse:
+    await request.session.aload()
+    request.session["foo"] = "bar"
+    return HttpResponse("ok")
+
+
+async def read_session(request: HttpRequest) -> JsonResponse:
+    await request.session.aload()
+    return JsonResponse({"foo": request.session["foo"]})
+
+
+async def health(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("ok")
+
+
+ROUTES = [
+    Route("/login", set_session),
+    Route("/read", read_session),
+    Route("/health", health),
+]
+
+
+@pytest.mark.parametrize(
+    "engine",
+    [
+        "unfazed.contrib.session.backends.default.SigningSession",
+        "unfazed.contrib.session.backends.cache.CacheSession",
+    ],
+)
+async def test_lazy_session(engine: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings["UNFAZED_CONTRIB_SESSION_SETTINGS"] = SessionSettings.model_validate(
+        {
+            "SECRET": uuid.uuid4().hex,
+            "COOKIE_DOMAIN": "unfazed.com",
+            "ENGINE": engine,
+            "LAZY_LOAD": True,
+        }
+    )
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(UNFAZED_SETTINGS), routes=ROUTES
+    )
+    await unfazed.setup()
+
+    loads: t.List[str | None] = []
+    saves: t.List[str | None] = []
+    cls = SigningSession if engine.endswith("SigningSession") else CacheSession
+    load, save = cls.load, cls.save
+
+    async def counting_load(self: t.Any) -> None:
+        loads.append(self.session_key)
+        await load(self)
+
+    async def counting_save(self: t.Any) -> None:
+        saves.append(self.session_key)
+        await save(self)
+
+    monkeypatch.setattr(cls, "load", counting_load)
+    monkeypatch.setattr(cls, "save", counting_save)
+
+    async with Requestfactory(unfazed, base_url="http://unfazed.com") as request:
+        # no cookie, nothing to load
+        resp = await request.get("/health")
+        assert resp.status_code == 200
+        assert loads == []
+
+        resp = await request.get("/login")
+        assert resp.status_code == 200
+        assert "session_id" in resp.headers["set-cookie"]
+        assert loads == []
+        assert len(saves) == 1
+
+        # the cookie is sent but the endpoint never touches the session
+        resp = await request.get("/health")
+        assert resp.status_code == 200
+        assert loads == []
+        assert len(saves) == 1
+        assert "set-cookie" not in resp.headers
+
+        resp = await request.get("/read")
+        assert resp.json() == {"foo": "bar"}
+        assert len(loads) == 1
+        assert len(saves) == 1
+
+
+async def test_lazy_session_access() -> None:
+    setting = SessionSettings.model_validate(
+        {"SECRET": uuid.uuid4().hex, "CACHE_ALIAS": "default"}
+    )
+    session = SigningSession(setting, None)
+    session["foo"] = "bar"
+    await session.save()
+
+    # signing sessions decode the cookie on first access
+    lazy = SigningSession(setting, session.session_key)
+    lazy.deferred = True
+    assert lazy["foo"] == "bar"
+    assert lazy.deferred is False
+
+    # flushing needs no load
+    lazy = SigningSession(setting, session.session_key)
+    lazy.deferred = True
+    await lazy.flush()
+    assert lazy.deferred is False
+    assert bool(lazy) is False
+
+    # cache sessions need an explicit load
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings.model_validate(UNFAZED_SETTINGS)
+    unfazed = Unfazed()
+    unfazed.setup_cache()
+    cache_session = CacheSession(setting, "cachesession:key")
+    cache_session.deferred = True
+    with pytest.raises(RuntimeError):
+        _ = "foo" in cache_session
+
+    assert cache_session.deferred is True
+    await cache_session.aload()
+    assert bool(cache_session) is False
+    await cache_session.aload()
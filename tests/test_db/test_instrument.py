@@ -0,0 +1,148 @@
+import contextlib
+import logging
+import typing as t
+from pathlib import Path
+
+import pytest
+from tortoise import Tortoise, connections
+from tortoise.exceptions import ConfigurationError
+from tortoise.transactions import in_transaction
+
+from tests.apps.orm.common.models import User
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.db.tortoise.instrument import Instrument, normalize_sql
+from unfazed.http import HttpRequest, JsonResponse
+from unfazed.route import path
+from unfazed.test import Requestfactory
+
+
+class Exporter:
+    def __init__(self) -> None:
+        self.queries: t.List[t.Tuple[str, str, float]] = []
+        self.acquires: t.List[t.Tuple[str, float, int, int | None]] = []
+        self.requests: t.List[t.Tuple[int, t.Dict[str, int]]] = []
+
+    def on_query(self, alias: str, statement: str, duration: float) -> None:
+        self.queries.append((alias, statement, duration))
+
+    def on_acquire(
+        self, alias: str, wait: float, in_use: int, max_size: int | None
+    ) -> None:
+        self.acquires.append((alias, wait, in_use, max_size))
+
+    def on_request(self, queries: int, duplicates: t.Dict[str, int]) -> None:
+        self.requests.append((queries, duplicates))
+
+
+@pytest.fixture(autouse=True)
+def setup_db_env() -> t.Generator:
+    Tortoise.apps = {}
+    Tortoise._inited = False
+
+    yield
+
+    Instrument.installed = None
+
+
+async def list_users(request: HttpRequest) -> JsonResponse:
+    # one query per user, the classic N+1 shape
+    ret = []
+    for uid in range(4):
+        ret.append(await User.filter(uid=uid).count())
+    return JsonResponse({"counts": ret})
+
+
+def test_normalize_sql() -> None:
+    assert (
+        normalize_sql("SELECT * FROM user1 WHERE id IN (1, 2, 3) AND name='a''b'")
+        == "SELECT * FROM user1 WHERE id IN (?) AND name=?"
+    )
+    assert normalize_sql(
+        "SELECT `a` FROM t WHERE x IN (%s,%s) LIMIT 10"
+    ) == normalize_sql("SELECT `a`   FROM t WHERE x IN (%s,%s,%s) LIMIT 20")
+    assert (
+        normalize_sql("INSERT INTO t (a) VALUES ($1),($2),($3)")
+        == "INSERT INTO t (a) VALUES (?)"
+    )
+
+
+async def test_instrument(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    settings = {
+        "DEBUG": True,
+        "PROJECT_NAME": "test_instrument",
+        "INSTALLED_APPS": ["tests.apps.orm.common"],
+        "MIDDLEWARE": ["unfazed.db.tortoise.instrument.QueryCountMiddleware"],
+        "DATABASE": {
+            "CONNECTIONS": {
+                "default": {
+                    "ENGINE": "tortoise.backends.sqlite",
+                    "CREDENTIALS": {"FILE_PATH": str(tmp_path / "db.sqlite3")},
+                }
+            },
+            "INSTRUMENTATION": {
+                "EXPORTER": "tests.test_db.test_instrument.Exporter",
+                "SLOW_QUERY_THRESHOLD": 0,
+                "N_PLUS_ONE_THRESHOLD": 3,
+            },
+        },
+    }
+    # drop clients left over by other test modules
+    with contextlib.suppress(ConfigurationError):
+        await connections.close_all(discard=True)
+
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(settings),
+        routes=[path("/users", endpoint=list_users)],
+    )
+    await unfazed.setup()
+    await unfazed.migrate()
+
+    instrument = Instrument.installed
+    assert instrument is not None
+    exporter = t.cast(Exporter, instrument.exporter)
+
+    try:
+        instrument.reset()
+        exporter.queries.clear()
+
+        with caplog.at_level(logging.WARNING, logger="unfazed.db.slow_query"):
+            await User.create(username="foo", email="foo@unfazed.com", uid=1)
+            assert "slow query on default" in caplog.text
+
+        async with in_transaction("default"):
+            await User.create(username="bar", email="bar@unfazed.com", uid=2)
+            assert instrument.pools["default"].in_use >= 1
+
+        assert await User.filter(uid__in=[1, 2]).count() == 2
+        assert await User.filter(uid__in=[1, 2, 3]).count() == 2
+
+        snapshot = instrument.snapshot()
+        counts = [
+            stat["count"]
+            for statement, stat in snapshot["queries"].items()
+            if statement.startswith("SELECT COUNT")
+        ]
+        assert counts == [2]
+        assert snapshot["pools"]["default"]["in_use"] == 0
+        assert snapshot["pools"]["default"]["acquired"] >= 4
+        assert len(exporter.queries) >= 4
+        assert exporter.acquires
+
+        with instrument.scope() as request_queries:
+            await User.all().count()
+        assert request_queries.count == 1
+        assert request_queries.duplicates(3) == {}
+
+        async with Requestfactory(unfazed) as request:
+            with caplog.at_level(logging.WARNING):
+                resp = await request.get("/users")
+                assert resp.status_code == 200
+                assert "possible N+1 query" in caplog.text
+
+        queries, duplicates = exporter.requests[-1]
+        assert queries == 4
+        assert list(duplicates.values()) == [4]
+
+    finally:
+        await Tortoise.close_connections()
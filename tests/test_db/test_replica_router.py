@@ -0,0 +1,162 @@
+import asyncio
+import contextlib
+import typing as t
+from pathlib import Path
+
+import pytest
+from tortoise import Tortoise, connections
+from tortoise.exceptions import ConfigurationError
+from tortoise.transactions import in_transaction
+from tortoise.utils import get_schema_sql
+
+from tests.apps.orm.common.models import User
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.db.tortoise.router import (
+    ReplicaHealthCheck,
+    ReplicaRouter,
+    ReplicaSet,
+    use_primary,
+)
+from unfazed.schema import Replica
+
+
+@pytest.fixture(autouse=True)
+def setup_db_env() -> t.Generator:
+    Tortoise.apps = {}
+    Tortoise._inited = False
+
+    yield
+
+    ReplicaRouter.replica_set = None
+
+
+def _sqlite(path: Path) -> t.Dict:
+    return {
+        "ENGINE": "tortoise.backends.sqlite",
+        "CREDENTIALS": {"FILE_PATH": str(path)},
+    }
+
+
+def test_replica_set_choose() -> None:
+    replica_set = ReplicaSet(
+        Replica.model_validate(
+            {
+                "PRIMARY": "default",
+                "REPLICAS": {"r1": 2, "r2": 1, "r3": 0},
+            }
+        )
+    )
+
+    # smooth weighted round-robin keeps every cycle balanced
+    picked = [replica_set.choose() for _ in range(6)]
+    assert picked.count("r1") == 4
+    assert picked.count("r2") == 2
+    assert "r3" not in picked
+    assert picked[:3] != ["r1", "r1", "r2"]
+
+    replica_set.eject("r1")
+    assert replica_set.is_ejected("r1")
+    assert {replica_set.choose() for _ in range(3)} == {"r2"}
+
+    # unknown names are ignored
+    replica_set.eject("r3")
+    assert not replica_set.is_ejected("r3")
+
+    replica_set.eject("r2")
+    assert replica_set.choose() == "default"
+
+    replica_set.restore("r1")
+    assert replica_set.choose() == "r1"
+
+    # cooldown expires on its own
+    replica_set.eject("r2", seconds=0)
+    assert not replica_set.is_ejected("r2")
+
+
+async def test_replica_router(tmp_path: Path) -> None:
+    settings = {
+        "DEBUG": True,
+        "PROJECT_NAME": "test_replica_router",
+        "INSTALLED_APPS": ["tests.apps.orm.common"],
+        "DATABASE": {
+            "CONNECTIONS": {
+                "default": _sqlite(tmp_path / "primary.sqlite3"),
+                "replica1": _sqlite(tmp_path / "replica1.sqlite3"),
+                "replica2": _sqlite(tmp_path / "replica2.sqlite3"),
+            },
+            "REPLICA": {
+                "PRIMARY": "default",
+                "REPLICAS": {"replica1": 1, "replica2": 1},
+                "STICKY_SECONDS": 0,
+            },
+        },
+    }
+    # drop clients left over by other test modules
+    with contextlib.suppress(ConfigurationError):
+        await connections.close_all(discard=True)
+
+    unfazed = Unfazed(settings=UnfazedSettings.model_validate(settings))
+    await unfazed.setup()
+    await unfazed.migrate()
+    schema = get_schema_sql(connections.get("default"), safe=True)
+    for name in ["replica1", "replica2"]:
+        await connections.get(name).execute_script(schema)
+
+    replica_set = ReplicaRouter.replica_set
+    assert replica_set is not None
+
+    try:
+        # writes go to primary, reads are spread over replicas
+        await User.create(username="foo", email="foo@unfazed.com", uid=1)
+        assert await User.filter(username="foo").count() == 0
+        assert await User.filter(username="foo").count() == 0
+
+        await connections.get("replica1").execute_query(
+            "INSERT INTO user (username, email, uid) VALUES ('bar', 'bar', 2)"
+        )
+        seen = [await User.filter(username="bar").count() for _ in range(4)]
+        assert sorted(seen) == [0, 0, 1, 1]
+
+        with use_primary():
+            assert await User.filter(username="foo").count() == 1
+
+        async with in_transaction("default"):
+            assert await User.filter(username="foo").count() == 1
+
+        replica_set.eject("replica1")
+        replica_set.eject("replica2")
+        assert await User.filter(username="foo").count() == 1
+
+        # health check restores replicas that answer
+        lifespan = ReplicaHealthCheck(unfazed)
+        await lifespan.on_startup()
+        await asyncio.sleep(0.1)
+        await lifespan.on_shutdown()
+        assert replica_set.available == ["replica1", "replica2"]
+
+        # read your writes within the sticky window
+        replica_set.conf.sticky_seconds = 60
+        await User.create(username="baz", email="baz@unfazed.com", uid=3)
+        assert await User.filter(username="baz").count() == 1
+
+    finally:
+        await Tortoise.close_connections()
+        # tortoise merges configs across init calls, keep later tests single-db
+        for name in ["replica1", "replica2"]:
+            connections.db_config.pop(name, None)
+
+
+async def test_replica_misconfigured(tmp_path: Path) -> None:
+    settings = {
+        "DEBUG": True,
+        "PROJECT_NAME": "test_replica_router",
+        "INSTALLED_APPS": ["tests.apps.orm.common"],
+        "DATABASE": {
+            "CONNECTIONS": {"default": _sqlite(tmp_path / "primary.sqlite3")},
+            "REPLICA": {"REPLICAS": {"missing": 1}},
+        },
+    }
+    unfazed = Unfazed(settings=UnfazedSettings.model_validate(settings))
+    with pytest.raises(ValueError):
+        await unfazed.setup()
@@ -0,0 +1,141 @@
+import os
+import typing as t
+
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    NotModifiedResponse,
+)
+from unfazed.http.conditional import etag_matches, make_etag
+from unfazed.route import Route
+from unfazed.test import Requestfactory
+
+rendered: t.List[str] = []
+
+
+async def flagged(request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"foo": "bar"}, etag=True)
+
+
+async def versioned(request: HttpRequest) -> HttpResponse:
+    etag = '"v1"'
+    if request.etag_matches(etag):
+        return NotModifiedResponse(etag)
+
+    rendered.append(etag)
+    return JsonResponse({"version": 1}, etag=etag)
+
+
+async def plain(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("hello, world")
+
+
+async def missing(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("missing", status_code=404)
+
+
+async def download(request: HttpRequest) -> FileResponse:
+    path = os.path.join(os.path.dirname(__file__), "zenofpython.txt")
+    return FileResponse(path)
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"b", "a"', '"a"')
+    assert etag_matches('"a"', 'W/"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert make_etag(b"a") == make_etag(b"a") != make_etag(b"b")
+
+
+async def test_response_etag() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"DEBUG": True}),
+        routes=[
+            Route("/flagged", endpoint=flagged),
+            Route("/versioned", endpoint=versioned, methods=["GET", "POST"]),
+            Route("/plain", endpoint=plain),
+        ],
+    )
+    await unfazed.setup()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/flagged")
+        etag = resp.headers["etag"]
+        assert etag == make_etag(b'{"foo":"bar"}')
+
+        resp = await request.get("/flagged", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+        assert "content-type" not in resp.headers
+
+        resp = await request.get("/flagged", headers={"If-None-Match": '"other"'})
+        assert resp.status_code == 200
+
+        resp = await request.get("/versioned")
+        assert resp.headers["etag"] == '"v1"'
+        assert len(rendered) == 1
+
+        resp = await request.get("/versioned", headers={"If-None-Match": '"v1"'})
+        assert resp.status_code == 304
+        assert len(rendered) == 1
+
+        resp = await request.post("/versioned", headers={"If-None-Match": '"v1"'})
+        assert resp.status_code == 200
+        assert len(rendered) == 2
+
+        # no etag unless asked for
+        resp = await request.get("/plain")
+        assert "etag" not in resp.headers
+
+
+async def test_etag_middleware() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": True,
+                "MIDDLEWARE": ["unfazed.middleware.internal.etag.ETagMiddleware"],
+            }
+        ),
+        routes=[
+            Route("/plain", endpoint=plain, methods=["GET", "POST"]),
+            Route("/missing", endpoint=missing),
+            Route("/download", endpoint=download),
+        ],
+    )
+    await unfazed.setup()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/plain")
+        etag = resp.headers["etag"]
+        assert etag == make_etag(b"hello, world")
+
+        resp = await request.get("/plain", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+        resp = await request.head("/plain", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+        resp = await request.post("/plain", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+
+        resp = await request.get("/missing")
+        assert resp.status_code == 404
+        assert "etag" not in resp.headers
+
+        # streamed responses keep their own etag
+        resp = await request.get("/download")
+        etag = resp.headers["etag"]
+        assert etag.startswith("W/")
+        assert resp.content
+
+        resp = await request.get("/download", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
@@ -0,0 +1,156 @@
+import asyncio
+import typing as t
+
+import pytest
+
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.middleware.internal.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+)
+from unfazed.route import path
+from unfazed.schema import Admission
+from unfazed.test import Requestfactory
+
+gate = asyncio.Event()
+
+
+async def slow(request: HttpRequest) -> HttpResponse:
+    await gate.wait()
+    return HttpResponse("slow")
+
+
+async def fast(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("fast")
+
+
+def admission_middleware(unfazed: Unfazed) -> AdmissionMiddleware:
+    middleware = unfazed.middleware_stack
+    assert isinstance(middleware, AdmissionMiddleware)
+    return middleware
+
+
+async def test_admission_middleware() -> None:
+    gate.clear()
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": True,
+                "MIDDLEWARE": [
+                    "unfazed.middleware.internal.admission.AdmissionMiddleware"
+                ],
+                "ADMISSION": {
+                    "MAX_CONCURRENCY": 4,
+                    "PRIORITY_SHARES": {"critical": 1.0, "normal": 0.75, "low": 0.5},
+                    "RETRY_AFTER": 3,
+                },
+            }
+        ),
+        routes=[
+            path("/slow", endpoint=slow),
+            path("/health", endpoint=fast, priority="critical"),
+            *path("/report", routes=[path("/fast", endpoint=fast)], priority="low"),
+            path("/fast", endpoint=fast),
+        ],
+    )
+    await unfazed.setup()
+
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/fast")).status_code == 200
+        middleware = admission_middleware(unfazed)
+
+        pending = [asyncio.create_task(request.get("/slow")) for _ in range(2)]
+        while middleware.controller.in_flight < 2:
+            await asyncio.sleep(0.01)
+
+        # low fills half of the limit
+        resp = await request.get("/report/fast")
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "3"
+        assert (await request.get("/fast")).status_code == 200
+
+        pending.append(asyncio.create_task(request.get("/slow")))
+        while middleware.controller.in_flight < 3:
+            await asyncio.sleep(0.01)
+
+        assert (await request.get("/fast")).status_code == 503
+        assert (await request.get("/health")).status_code == 200
+
+        # only critical requests while the loop lags
+        gate.set()
+        for resp in await asyncio.gather(*pending):
+            assert resp.status_code == 200
+        middleware.controller.lag = 1.0
+        assert (await request.get("/fast")).status_code == 503
+        assert (await request.get("/health")).status_code == 200
+
+        middleware.controller.lag = 0.0
+        assert (await request.get("/fast")).status_code == 200
+        assert middleware.controller.in_flight == 0
+
+
+async def test_unknown_priority() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": True,
+                "MIDDLEWARE": [
+                    "unfazed.middleware.internal.admission.AdmissionMiddleware"
+                ],
+                "ADMISSION": {"MAX_CONCURRENCY": 4},
+            }
+        ),
+        routes=[path("/fast", endpoint=fast, priority="urgent")],
+    )
+    with pytest.raises(ValueError, match="urgent"):
+        await unfazed.setup()
+
+
+def test_adaptive_limit() -> None:
+    setting = Admission.model_validate(
+        {
+            "MAX_CONCURRENCY": 20,
+            "MIN_CONCURRENCY": 5,
+            "ADAPTIVE": True,
+            "TARGET_LATENCY": 0.1,
+            "BACKOFF": 0.5,
+        }
+    )
+    controller = AdmissionController(setting)
+
+    assert controller.acquire("normal")
+    controller.release(1.0)
+    assert controller.limit == 10
+    # one backoff per latency window
+    assert controller.acquire("normal")
+    controller.release(1.0)
+    assert controller.limit == 10
+
+    controller.last_backoff = 0.0
+    controller.in_flight = 6
+    controller.release(0.01)
+    assert controller.limit == 10.1
+
+    for _ in range(10):
+        controller.last_backoff = 0.0
+        controller.release(1.0)
+    assert controller.limit == 5
+
+
+def test_admission_settings() -> None:
+    async def app(scope: t.Any, receive: t.Any, send: t.Any) -> None:
+        pass
+
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings()
+    with pytest.raises(ValueError):
+        AdmissionMiddleware(app)
+
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings.model_validate(
+        {"ADMISSION": {"DEFAULT_PRIORITY": "missing"}}
+    )
+    with pytest.raises(ValueError):
+        AdmissionMiddleware(app)
+
+    settings.clear()
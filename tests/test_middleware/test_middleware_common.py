@@ -1,8 +1,20 @@
+import logging
+
+import pytest
+
 from unfazed.conf import UnfazedSettings
 from unfazed.core import Unfazed
+from unfazed.exception import PermissionDenied, WrongPassword
 from unfazed.http import HttpRequest, HttpResponse
+from unfazed.middleware.hooks import HookMiddleware
+from unfazed.middleware.internal.common import (
+    CommonMiddleware,
+    TracebackSampler,
+    get_template,
+)
 from unfazed.route.routing import Route
 from unfazed.test import Requestfactory
+from unfazed.type import Message, Scope
 
 
 async def endpoint1(request: HttpRequest) -> HttpResponse:
@@ -13,6 +25,19 @@ async def endpoint2(request: HttpRequest) -> HttpResponse:
     raise ValueError("Error")
 
 
+async def endpoint3(request: HttpRequest) -> HttpResponse:
+    raise PermissionDenied()
+
+
+async def endpoint4(request: HttpRequest) -> HttpResponse:
+    raise WrongPassword()
+
+
+class TagMiddleware(HookMiddleware):
+    async def on_response_start(self, scope: Scope, message: Message) -> None:
+        message["headers"].append((b"x-tag", b"1"))
+
+
 _Settings = {
     "DEBUG": True,
     "MIDDLEWARE": [
@@ -59,3 +84,89 @@ async def test_middleware_common() -> None:
     async with Requestfactory(unfazed2) as request:
         response = await request.get("/enpoint2")
         assert response.status_code == 500
+
+
+async def test_middleware_common_fast_path(caplog: pytest.LogCaptureFixture) -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(_Settings2),
+        routes=[
+            Route("/enpoint2", endpoint=endpoint2),
+            Route("/enpoint3", endpoint=endpoint3),
+            Route("/enpoint4", endpoint=endpoint4),
+        ],
+    )
+
+    await unfazed.setup()
+
+    caplog.clear()
+    caplog.set_level(logging.ERROR, logger="unfazed.middleware")
+    async with Requestfactory(unfazed) as request:
+        response = await request.get("/enpoint3")
+        assert response.status_code == 403
+        assert response.text == "Permission Denied"
+        assert not caplog.records
+
+        for _ in range(CommonMiddleware.traceback_limit + 2):
+            response = await request.get("/enpoint2")
+            assert response.status_code == 500
+            assert response.text == "Internal Server Error"
+
+    records = [r for r in caplog.records if r.name == "unfazed.middleware"]
+    assert len(records) == CommonMiddleware.traceback_limit + 2
+    assert len([r for r in records if r.exc_info]) == CommonMiddleware.traceback_limit
+
+    # a business code is not an HTTP status
+    async with Requestfactory(unfazed) as request:
+        assert (await request.get("/enpoint4")).status_code == 500
+
+    # the template is compiled once
+    assert get_template() is get_template()
+
+
+async def test_middleware_common_fresh_responses() -> None:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": False,
+                "MIDDLEWARE": [
+                    "tests.test_middleware.test_middleware_common.TagMiddleware",
+                    "unfazed.middleware.internal.common.CommonMiddleware",
+                ],
+            }
+        ),
+        routes=[
+            Route("/enpoint2", endpoint=endpoint2),
+            Route("/enpoint3", endpoint=endpoint3),
+        ],
+    )
+    await unfazed.setup()
+
+    # headers added by outer middlewares do not pile up across requests
+    async with Requestfactory(unfazed) as request:
+        for path in ("/enpoint2", "/enpoint2", "/enpoint3", "/enpoint3"):
+            response = await request.get(path)
+            assert response.headers.get_list("x-tag") == ["1"]
+
+
+def test_traceback_sampler(caplog: pytest.LogCaptureFixture) -> None:
+    def error(n: int) -> Exception:
+        try:
+            if n == 1:
+                raise ValueError("one")
+            raise ValueError("two")
+        except ValueError as e:
+            return e
+
+    sampler = TracebackSampler(limit=2, interval=60)
+    assert sampler.allow(error(1))
+    assert sampler.allow(error(1))
+    assert not sampler.allow(error(1))
+    # a different site has its own budget
+    assert sampler.allow(error(2))
+    assert sampler.suppressed == 1
+
+    sampler.window_start -= 60
+    caplog.set_level(logging.ERROR, logger="unfazed.middleware")
+    assert sampler.allow(error(1))
+    assert "1 error tracebacks suppressed" in caplog.text
+    assert sampler.suppressed == 0
@@ -0,0 +1,221 @@
+import copy
+import gzip
+import typing as t
+import zlib
+
+import pytest
+
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.core import Unfazed
+from unfazed.middleware.internal import compression as compression_module
+from unfazed.middleware.internal.compression import (
+    CompressionMiddleware,
+    parse_accept_encoding,
+)
+from unfazed.type import Message, Receive, Scope, Send
+
+
+@pytest.fixture(autouse=True)
+def setup_compression_settings() -> t.Generator:
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings.model_validate(
+        {
+            "COMPRESSION": {
+                "ENCODINGS": ["gzip"],
+                "MINIMUM_SIZE": 100,
+                "COMPRESSIBLE_TYPES": ["text/*", "application/json"],
+                "THREADPOOL_MIN_SIZE": None,
+            }
+        }
+    )
+
+    yield
+
+    settings.clear()
+
+
+def make_app(messages: t.List[Message]) -> t.Callable:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        for message in messages:
+            await send(copy.deepcopy(message))
+
+    return app
+
+
+def start(content_type: str = "text/plain", **extra: str) -> Message:
+    headers = [(b"content-type", content_type.encode())]
+    headers.extend((k.encode(), v.encode()) for k, v in extra.items())
+    return {"type": "http.response.start", "status": 200, "headers": headers}
+
+
+async def call(
+    middleware: CompressionMiddleware,
+    accept_encoding: str = "gzip",
+    extensions: t.Dict | None = None,
+) -> t.List[Message]:
+    scope = {
+        "type": "http",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "extensions": extensions or {},
+    }
+    sent: t.List[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+def header(message: Message, name: str) -> str | None:
+    for key, value in message["headers"]:
+        if key.decode().lower() == name:
+            return value.decode()
+    return None
+
+
+def test_parse_accept_encoding() -> None:
+    assert parse_accept_encoding("gzip, br;q=0.5, zstd;q=x, ,*;q=0") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "zstd": 0.0,
+        "*": 0.0,
+    }
+
+
+async def test_negotiation() -> None:
+    middleware = CompressionMiddleware(make_app([]))
+    # tie break by the configured order
+    middleware.encodings = ["br", "gzip"]
+
+    assert middleware.choose("gzip, br") == "br"
+    assert middleware.choose("gzip, br;q=0.5") == "gzip"
+    assert middleware.choose("*") == "br"
+    assert middleware.choose("gzip;q=0") is None
+    assert middleware.choose("identity") is None
+    assert middleware.choose("") is None
+    assert "gzip, br" in middleware.negotiated
+
+
+async def test_gzip_body() -> None:
+    body = b"hello world " * 100
+    app = make_app([start(), {"type": "http.response.body", "body": body}])
+
+    sent = await call(CompressionMiddleware(app))
+
+    assert header(sent[0], "content-encoding") == "gzip"
+    assert header(sent[0], "vary") == "Accept-Encoding"
+    assert header(sent[0], "content-length") == str(len(sent[1]["body"]))
+    assert gzip.decompress(sent[1]["body"]) == body
+
+    # no acceptable encoding
+    sent = await call(CompressionMiddleware(app), accept_encoding="identity")
+    assert header(sent[0], "content-encoding") is None
+    assert sent[1]["body"] == body
+
+
+async def test_passthrough() -> None:
+    # too small
+    app = make_app([start(), {"type": "http.response.body", "body": b"hello"}])
+    sent = await call(CompressionMiddleware(app))
+    assert header(sent[0], "content-encoding") is None
+    assert header(sent[0], "vary") == "Accept-Encoding"
+    assert sent[1]["body"] == b"hello"
+
+    # not compressible
+    body = b"\x89PNG" * 100
+    app = make_app([start("image/png"), {"type": "http.response.body", "body": body}])
+    sent = await call(CompressionMiddleware(app))
+    assert header(sent[0], "content-encoding") is None
+    assert sent[1]["body"] == body
+
+    # already encoded
+    app = make_app(
+        [
+            start("application/json", **{"content-encoding": "br"}),
+            {"type": "http.response.body", "body": body},
+        ]
+    )
+    sent = await call(CompressionMiddleware(app))
+    assert header(sent[0], "content-encoding") == "br"
+    assert sent[1]["body"] == body
+
+    # partial content, the range refers to the identity body
+    text = b"hello world " * 100
+    ranged = start(**{"content-range": f"bytes 0-{len(text) - 1}/2000"})
+    for message in (ranged, {**start(), "status": 206}):
+        app = make_app([message, {"type": "http.response.body", "body": text}])
+        sent = await call(CompressionMiddleware(app))
+        assert header(sent[0], "content-encoding") is None
+        assert sent[1]["body"] == text
+
+
+async def test_etag() -> None:
+    body = b"hello world " * 100
+    for etag, expected in (('"abc"', 'W/"abc"'), ('W/"abc"', 'W/"abc"')):
+        app = make_app([start(etag=etag), {"type": "http.response.body", "body": body}])
+        sent = await call(CompressionMiddleware(app))
+        assert header(sent[0], "content-encoding") == "gzip"
+        assert header(sent[0], "etag") == expected
+
+    # left alone when the body is sent as is
+    app = make_app([start(etag='"abc"'), {"type": "http.response.body", "body": b"x"}])
+    sent = await call(CompressionMiddleware(app))
+    assert header(sent[0], "etag") == '"abc"'
+
+
+async def test_streaming() -> None:
+    chunks = [b"chunk %d " % i * 50 for i in range(5)]
+    messages = [start("text/html; charset=utf-8", **{"content-length": "1000"})]
+    messages.extend(
+        {"type": "http.response.body", "body": chunk, "more_body": True}
+        for chunk in chunks
+    )
+    messages.append({"type": "http.response.body", "body": b"", "more_body": False})
+
+    settings["UNFAZED_SETTINGS"].COMPRESSION.threadpool_min_size = 100
+    sent = await call(CompressionMiddleware(make_app(messages)))
+
+    assert header(sent[0], "content-encoding") == "gzip"
+    assert header(sent[0], "content-length") is None
+    # every chunk is flushed and decodable on its own
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(sent[1]["body"]) == chunks[0]
+    compressed = b"".join(message["body"] for message in sent[1:])
+    assert gzip.decompress(compressed) == b"".join(chunks)
+
+
+async def test_pathsend_disabled() -> None:
+    seen: t.List[Scope] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(scope)
+
+    extensions: t.Dict[str, t.Any] = {
+        "http.response.pathsend": {},
+        "http.response.trailers": {},
+    }
+    await call(CompressionMiddleware(app), extensions=extensions)
+    assert "http.response.pathsend" not in seen[0]["extensions"]
+    assert "http.response.trailers" in seen[0]["extensions"]
+    assert "http.response.pathsend" in extensions
+
+    await call(CompressionMiddleware(app), "identity", extensions=extensions)
+    assert "http.response.pathsend" in seen[1]["extensions"]
+
+
+async def test_failed_setup(monkeypatch: pytest.MonkeyPatch) -> None:
+    app = Unfazed()
+
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings()
+    with pytest.raises(ValueError):
+        CompressionMiddleware(app=app)
+
+    settings["UNFAZED_SETTINGS"] = UnfazedSettings.model_validate(
+        {"COMPRESSION": {"ENCODINGS": ["br"]}}
+    )
+    monkeypatch.setattr(compression_module, "BROTLI_AVAILABLE", False)
+    with pytest.raises(ValueError):
+        CompressionMiddleware(app=app)
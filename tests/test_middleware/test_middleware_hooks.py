@@ -0,0 +1,208 @@
+import typing as t
+
+import pytest
+
+from unfazed.http import HttpRequest, HttpResponse, PlainTextResponse
+from unfazed.middleware import BaseMiddleware, HookMiddleware, compile_middlewares
+from unfazed.middleware.hooks import HookPipeline
+from unfazed.route import Route
+from unfazed.type import Message, Receive, Scope, Send
+
+
+class Recorder(HookMiddleware):
+    name = ""
+
+    async def on_request(self, scope: Scope, receive: Receive) -> t.Any:
+        scope["calls"].append(f"{self.name}.request")
+        if scope.get("stop") == self.name:
+            return PlainTextResponse(f"stopped by {self.name}")
+        return None
+
+    async def on_response_start(self, scope: Scope, message: Message) -> None:
+        scope["calls"].append(f"{self.name}.response")
+        if scope.get("fail") == self.name:
+            raise RuntimeError(f"{self.name} failed")
+        message["headers"].append((b"x-hook", self.name.encode()))
+
+    async def on_exception(self, scope: Scope, exc: Exception) -> t.Any:
+        scope["calls"].append(f"{self.name}.exception")
+        if scope.get("handle") == self.name:
+            return PlainTextResponse(str(exc), status_code=500)
+        return None
+
+
+class Outer(Recorder):
+    name = "outer"
+
+
+class Inner(Recorder):
+    name = "inner"
+
+
+class RequestOnly(HookMiddleware):
+    async def on_request(self, scope: Scope, receive: Receive) -> None:
+        scope["calls"].append("request_only.request")
+
+
+class Wrapper(BaseMiddleware):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope["calls"].append("wrapper")
+        await self.app(scope, receive, send)
+
+
+class Positional:
+    # plain ASGI middleware taking the app positionally
+    def __init__(self, app: t.Any, /) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope["calls"].append("positional")
+        await self.app(scope, receive, send)
+
+
+async def ok_app(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["calls"].append("app")
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def error_app(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["calls"].append("app")
+    raise ValueError("boom")
+
+
+async def late_error_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    raise ValueError("boom")
+
+
+async def call(app: t.Any, **extra: t.Any) -> t.Tuple[Scope, t.List[Message]]:
+    scope: Scope = {"type": "http", "headers": [], "calls": [], **extra}
+    sent: t.List[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return scope, sent
+
+
+def hook_headers(message: Message) -> t.List[bytes]:
+    return [value for key, value in message["headers"] if key == b"x-hook"]
+
+
+async def test_compile() -> None:
+    app = compile_middlewares(ok_app, [Outer, Inner, Wrapper, RequestOnly])
+
+    assert isinstance(app, HookPipeline)
+    assert [type(h) for h in app.hooks] == [Outer, Inner]
+    assert isinstance(app.app, Wrapper)
+    assert isinstance(app.app.app, HookPipeline)
+    assert app.app.app.app is ok_app
+
+    scope, sent = await call(app)
+    assert scope["calls"] == [
+        "outer.request",
+        "inner.request",
+        "wrapper",
+        "request_only.request",
+        "app",
+        "inner.response",
+        "outer.response",
+    ]
+    assert hook_headers(sent[0]) == [b"inner", b"outer"]
+
+    assert compile_middlewares(ok_app, []) is ok_app
+
+    scope, _ = await call(compile_middlewares(ok_app, [Outer, Positional]))
+    assert scope["calls"][:3] == ["outer.request", "positional", "app"]
+
+
+async def test_short_circuit() -> None:
+    app = compile_middlewares(ok_app, [Outer, Inner])
+
+    scope, sent = await call(app, stop="inner")
+    assert scope["calls"] == ["outer.request", "inner.request", "outer.response"]
+    assert sent[1]["body"] == b"stopped by inner"
+    assert hook_headers(sent[0]) == [b"outer"]
+
+
+async def test_exception() -> None:
+    app = compile_middlewares(error_app, [Outer, Inner])
+
+    scope, sent = await call(app, handle="outer")
+    assert scope["calls"] == [
+        "outer.request",
+        "inner.request",
+        "app",
+        "inner.exception",
+        "outer.exception",
+    ]
+    assert sent[0]["status"] == 500
+    assert sent[1]["body"] == b"boom"
+    assert hook_headers(sent[0]) == []
+
+    scope, sent = await call(app, handle="inner")
+    assert scope["calls"][-2:] == ["inner.exception", "outer.response"]
+    assert hook_headers(sent[0]) == [b"outer"]
+
+    with pytest.raises(ValueError):
+        await call(app)
+
+    # a failing response hook leaves the response unsent
+    with pytest.raises(RuntimeError):
+        await call(compile_middlewares(ok_app, [Outer, Inner]), fail="inner")
+    scope, sent = await call(
+        compile_middlewares(ok_app, [Outer, Inner]), fail="inner", handle="outer"
+    )
+    assert scope["calls"][-3:] == [
+        "inner.response",
+        "inner.exception",
+        "outer.exception",
+    ]
+    assert len(sent) == 2
+    assert sent[0]["status"] == 500
+    assert sent[1]["body"] == b"inner failed"
+
+    # too late to replace the response
+    app = compile_middlewares(late_error_app, [Outer])
+    with pytest.raises(ValueError):
+        await call(app, handle="outer")
+
+
+async def test_scope_types() -> None:
+    async def lifespan_app(scope: Scope, receive: Receive, send: Send) -> None:
+        scope["calls"].append("app")
+
+    app = compile_middlewares(lifespan_app, [Outer])
+    scope, _ = await call(app, type="lifespan")
+    assert scope["calls"] == ["app"]
+
+
+async def test_standalone() -> None:
+    app = Outer(ok_app)
+
+    scope, sent = await call(app)
+    assert scope["calls"] == ["outer.request", "app", "outer.response"]
+    assert hook_headers(sent[0]) == [b"outer"]
+
+
+async def endpoint(request: HttpRequest) -> HttpResponse:
+    return HttpResponse("ok")
+
+
+def test_route_middlewares() -> None:
+    route = Route(
+        "/",
+        endpoint=endpoint,
+        middlewares=[
+            "tests.test_middleware.test_middleware_hooks.Outer",
+            "tests.test_middleware.test_middleware_hooks.Inner",
+        ],
+    )
+
+    # the test module may be imported twice, compare by name
+    assert type(route.app).__name__ == "HookPipeline"
+    assert [type(h).__name__ for h in route.app.hooks] == ["Outer", "Inner"]
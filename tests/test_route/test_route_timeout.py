@@ -0,0 +1,149 @@
+import asyncio
+import time
+import typing as t
+
+import pytest
+from anyio.to_thread import current_default_thread_limiter
+
+from unfazed.concurrency import deadline, get_deadline, time_remaining
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.route import Route, path
+from unfazed.route.endpoint import EndpointHandler
+from unfazed.test import Requestfactory
+from unfazed.type import Message
+
+events: t.List[str] = []
+
+
+async def slow(request: HttpRequest) -> HttpResponse:
+    remaining = time_remaining()
+    assert remaining is not None and remaining <= 0.1
+    try:
+        await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        events.append("cancelled")
+        raise
+    return HttpResponse("slow")
+
+
+def sync_slow(request: HttpRequest) -> HttpResponse:
+    # the deadline reaches the threadpool
+    assert get_deadline() is not None
+    time.sleep(0.3)
+    return HttpResponse("sync slow")
+
+
+async def fast(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(f"{time_remaining()}")
+
+
+async def own_timeout(request: HttpRequest) -> HttpResponse:
+    raise TimeoutError("upstream timed out")
+
+
+async def make_app(**extra: t.Any) -> Unfazed:
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate({"DEBUG": True, **extra}),
+        routes=[
+            Route("/slow", endpoint=slow, timeout=0.05),
+            *path("/sync", routes=[path("/slow", endpoint=sync_slow)], timeout=0.05),
+            Route("/fast", endpoint=fast),
+            Route("/own", endpoint=own_timeout, timeout=1),
+        ],
+    )
+    await unfazed.setup()
+    return unfazed
+
+
+async def test_route_timeout() -> None:
+    events.clear()
+    unfazed = await make_app()
+
+    async with Requestfactory(unfazed) as request:
+        resp = await request.get("/slow")
+        assert resp.status_code == 504
+        assert events == ["cancelled"]
+
+        limiter = current_default_thread_limiter()
+        borrowed = limiter.borrowed_tokens
+        start = time.perf_counter()
+        resp = await request.get("/sync/slow")
+        assert resp.status_code == 504
+        assert time.perf_counter() - start < 0.25
+        # the thread keeps its slot until it returns
+        assert limiter.borrowed_tokens == borrowed + 1
+        await asyncio.sleep(0.35)
+        assert limiter.borrowed_tokens == borrowed
+
+        # no deadline without a timeout
+        assert (await request.get("/fast")).text == "None"
+
+        with pytest.raises(TimeoutError):
+            await request.get("/own")
+
+
+async def test_global_timeout() -> None:
+    unfazed = await make_app(REQUEST_TIMEOUT=10)
+
+    async with Requestfactory(unfazed) as request:
+        remaining = float((await request.get("/fast")).text)
+        assert 9 < remaining <= 10
+
+        # routes keep their own timeout
+        assert (await request.get("/slow")).status_code == 504
+
+
+async def test_cancel_on_disconnect() -> None:
+    events.clear()
+    unfazed = await make_app(CANCEL_ON_DISCONNECT=True)
+    route = unfazed.routes[0]
+    assert isinstance(route, Route)
+    route.update_timeout(None)
+
+    sent: t.List[Message] = []
+    messages: t.List[Message] = [
+        {"type": "http.request", "body": b"", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive() -> Message:
+        await asyncio.sleep(0.01)
+        return messages.pop(0)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/slow",
+        "headers": [],
+        "query_string": b"",
+        "path_params": {},
+        "app": unfazed,
+    }
+    handler = route.endpoint_handler
+    assert isinstance(handler, EndpointHandler)
+
+    with deadline(0.1):
+        await asyncio.wait_for(handler(scope, receive, send), 0.5)
+
+    assert events == ["cancelled"]
+    assert sent == []
+
+
+def test_deadline() -> None:
+    assert get_deadline() is None
+    with deadline(10) as outer:
+        assert outer is not None
+        # an inner deadline cannot extend the outer one
+        with deadline(20) as inner:
+            assert inner == outer
+        with deadline(1) as inner:
+            assert inner is not None and inner < outer
+        with deadline(None) as inner:
+            assert inner == outer
+        assert get_deadline() == outer
+    assert time_remaining() is None
@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+import copy
+import typing as t
+
+import pytest
+from tortoise import Model
+from tortoise.exceptions import OperationalError
+from tortoise.transactions import in_transaction
+
+from tests.apps.serializer.models import Bag, Course, Student
+from unfazed.serializer import RelationLoader, Serializer, load_related
+
+pinned: contextvars.ContextVar[bool] = contextvars.ContextVar("pinned", default=False)
+
+
+@pytest.fixture
+async def setup_loader_env() -> t.AsyncGenerator[t.List[Student], None]:
+    await Bag.all().delete()
+    await Course.all().delete()
+    await Student.all().delete()
+
+    students = [await Student.create(name=f"s{i}", age=i) for i in range(3)]
+    for student in students:
+        await Bag.create(student=student, name=f"{student.name}-bag")
+
+    course = await Course.create(name="math")
+    await course.students.add(students[0], students[1])
+
+    yield students
+
+    await Bag.all().delete()
+    await Course.all().delete()
+    await Student.all().delete()
+
+
+async def test_relation_loader(
+    setup_loader_env: t.List[Student], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: t.List[t.Tuple[int, t.Tuple[str, ...]]] = []
+    fetch_for_list = Model.fetch_for_list.__func__  # type: ignore
+
+    async def counting_fetch_for_list(
+        cls: t.Type[Model], instances: t.List[Model], *args: str, **kw: t.Any
+    ) -> None:
+        calls.append((len(instances), args))
+        await fetch_for_list(cls, instances, *args, **kw)
+
+    monkeypatch.setattr(Student, "fetch_for_list", classmethod(counting_fetch_for_list))
+
+    # concurrent lookups share one fetch per relation
+    students = await Student.all().order_by("id")
+    await asyncio.gather(*[load_related(s, "bags", "courses") for s in students])
+    assert sorted(calls) == [(3, ("bags",)), (3, ("courses",))]
+    assert [len(s.bags) for s in students] == [1, 1, 1]
+    assert [len(s.courses) for s in students] == [1, 1, 0]
+
+    # the same instance registered twice is fetched once
+    calls.clear()
+    student = students[0]
+    await asyncio.gather(load_related(student, "bags"), load_related(student, "bags"))
+    assert calls == [(1, ("bags",))]
+
+    # lookups in separate ticks are not merged
+    calls.clear()
+    await load_related(students[0], "bags")
+    await load_related(students[1], "bags")
+    assert calls == [(1, ("bags",)), (1, ("bags",))]
+
+    # the shared fetch does not run in the context of the first caller
+    seen: t.List[bool] = []
+
+    async def recording_fetch_for_list(
+        cls: t.Type[Model], instances: t.List[Model], *args: str, **kw: t.Any
+    ) -> None:
+        seen.append(pinned.get())
+        await fetch_for_list(cls, instances, *args, **kw)
+
+    async def load_in_context(student: Student) -> None:
+        pinned.set(True)
+        await load_related(student, "bags")
+
+    with monkeypatch.context() as m:
+        m.setattr(Student, "fetch_for_list", classmethod(recording_fetch_for_list))
+        await asyncio.gather(
+            load_in_context(students[0]), load_related(students[1], "bags")
+        )
+    assert seen == [False]
+
+    # nothing to load
+    calls.clear()
+    await load_related([], "bags")
+    await load_related(students[0])
+    assert calls == []
+
+    # lookups inside a transaction see its uncommitted rows
+    async with in_transaction("default") as conn:
+        await Bag.create(student=students[2], name="extra", using_db=conn)
+        await load_related(students[2], "bags")
+        assert len(students[2].bags) == 2
+
+    # errors reach every waiter
+    loader = RelationLoader()
+    with pytest.raises(OperationalError):
+        await asyncio.gather(
+            loader.load(students[0], "notexist"), loader.load(students[1], "notexist")
+        )
+
+    # lookups routed to other connections are not merged
+    calls.clear()
+    primary = Student._choose_db()
+    replica = copy.copy(primary)
+    replica.connection_name = "replica"
+    routed: t.List[str] = []
+
+    def choose_db(for_write: bool = False) -> t.Any:
+        db = primary if pinned.get() else replica
+        routed.append(db.connection_name)
+        return db
+
+    async def load_pinned(student: Student) -> None:
+        pinned.set(True)
+        await load_related(student, "bags")
+
+    monkeypatch.setattr(Student, "_choose_db", choose_db)
+    await asyncio.gather(
+        load_pinned(students[0]),
+        load_related(students[1], "bags"),
+        load_related(students[2], "bags"),
+    )
+    assert sorted(calls) == [(1, ("bags",)), (2, ("bags",))]
+    assert sorted(routed) == [primary.connection_name, "replica", "replica"]
+
+
+async def test_relation_loader_isolates_errors(
+    setup_loader_env: t.List[Student], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    students = await Student.all().order_by("id")
+    broken = students[2]
+    fetch_for_list = Model.fetch_for_list.__func__  # type: ignore
+
+    async def failing_fetch_for_list(
+        cls: t.Type[Model], instances: t.List[Model], *args: str, **kw: t.Any
+    ) -> None:
+        if broken in instances:
+            raise OperationalError("broken row")
+        await fetch_for_list(cls, instances, *args, **kw)
+
+    monkeypatch.setattr(Student, "fetch_for_list", classmethod(failing_fetch_for_list))
+
+    # a failed batch is retried per caller, only the broken caller fails
+    ret = await asyncio.gather(
+        load_related(students[0], "bags"),
+        load_related(students[1], "bags"),
+        load_related(broken, "bags"),
+        return_exceptions=True,
+    )
+    assert ret[0] is None and ret[1] is None
+    assert isinstance(ret[2], OperationalError)
+    assert [len(s.bags) for s in students[:2]] == [1, 1]
+
+
+async def test_serializer_retrieve_batched(
+    setup_loader_env: t.List[Student], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class StudentSerializer(Serializer):
+        class Meta:
+            model = Student
+            enable_relations = True
+
+    calls: t.List[int] = []
+    fetch_for_list = Model.fetch_for_list.__func__  # type: ignore
+
+    async def counting_fetch_for_list(
+        cls: t.Type[Model], instances: t.List[Model], *args: str, **kw: t.Any
+    ) -> None:
+        calls.append(len(instances))
+        await fetch_for_list(cls, instances, *args, **kw)
+
+    monkeypatch.setattr(Student, "fetch_for_list", classmethod(counting_fetch_for_list))
+
+    students = await Student.all().order_by("id")
+    ret = await asyncio.gather(*[StudentSerializer.retrieve(s) for s in students])
+
+    assert [r.name for r in ret] == ["s0", "s1", "s2"]
+    assert [r.bags[0].name for r in ret] == ["s0-bag", "s1-bag", "s2-bag"]
+    # one fetch per relation for all three students
+    assert calls == [3] * len(StudentSerializer.get_fetch_fields())
@@ -1,9 +1,13 @@
+import typing as t
 import uuid
 from datetime import timedelta
 from decimal import Decimal
 
 import pytest
 from pydantic import BaseModel, Field
+from tortoise.exceptions import DoesNotExist
+from tortoise.signals import Signals, post_save
+from tortoise.transactions import in_transaction
 
 from tests.apps.serializer.models import (
     Bag,
@@ -250,6 +254,91 @@ async def test_serializer_methods() -> None:
     assert await Car.filter(id=new_car.id).count() == 0
 
 
+async def test_bulk_methods() -> None:
+    class StudentSerializer(Serializer):
+        class Meta:
+            model = Student
+            exclude = ["bags", "profile", "courses"]
+            batch_size = 2
+
+    class StudentCreate(BaseModel):
+        name: str
+        age: int
+
+    class StudentUpdate(BaseModel):
+        id: int
+        name: str
+        age: int | None = None
+
+    await Student.filter(name__startswith="bulk").delete()
+
+    saved: t.List[t.Tuple[str, bool]] = []
+
+    async def on_save(
+        sender: t.Any, instance: Student, created: bool, *args: t.Any
+    ) -> None:
+        saved.append((instance.name, created))
+
+    post_save(Student)(on_save)
+
+    # bulk create, generated pks are set and save signals fire
+    created = await StudentSerializer.bulk_create_from_ctx(
+        [StudentCreate(name=f"bulk_{i}", age=i) for i in range(5)]
+    )
+    assert [ins.name for ins in created] == [f"bulk_{i}" for i in range(5)]
+    assert await Student.filter(name__startswith="bulk").count() == 5
+    assert all(ins.pk is not None for ins in created)
+    assert [(await Student.get(id=ins.pk)).name for ins in created] == [
+        ins.name for ins in created
+    ]
+    assert saved == [(f"bulk_{i}", True) for i in range(5)]
+
+    assert await StudentSerializer.bulk_create_from_ctx([]) == []
+
+    # bulk update, keeps the input order
+    students = await Student.filter(name__startswith="bulk").order_by("-age")
+    updated = await StudentSerializer.bulk_update_from_ctx(
+        [StudentUpdate(id=s.id, name=f"{s.name}_updated") for s in students],
+        batch_size=3,
+    )
+    assert [ins.id for ins in updated] == [s.id for s in students]
+    assert saved[-5:] == [(f"{s.name}_updated", False) for s in students]
+    Student._listeners[Signals.post_save][Student].remove(on_save)
+
+    refreshed = await Student.filter(name__startswith="bulk").order_by("age")
+    assert [s.name for s in refreshed] == [f"bulk_{i}_updated" for i in range(5)]
+    # None values are ignored just like `update`
+    assert [s.age for s in refreshed] == list(range(5))
+
+    assert await StudentSerializer.bulk_update_from_ctx([]) == []
+
+    # serializer instances are accepted as ctx
+    await StudentSerializer.bulk_update_from_ctx(
+        [StudentSerializer(id=refreshed[0].id, name="bulk_serializer", age=100)]
+    )
+    assert (await Student.get(id=refreshed[0].id)).age == 100
+
+    # missing id
+    with pytest.raises(ValueError):
+        await StudentSerializer.bulk_update_from_ctx(
+            [StudentCreate(name="bulk_no_id", age=1)]
+        )
+
+    # not existed id rollback whole transaction
+    with pytest.raises(DoesNotExist):
+        async with in_transaction() as conn:
+            await StudentSerializer.bulk_create_from_ctx(
+                [StudentCreate(name="bulk_rollback", age=1)], using_db=conn
+            )
+            await StudentSerializer.bulk_update_from_ctx(
+                [StudentUpdate(id=999999, name="bulk_not_existed")], using_db=conn
+            )
+
+    assert await Student.filter(name="bulk_rollback").count() == 0
+
+    await Student.filter(name__startswith="bulk").delete()
+
+
 async def test_relations() -> None:
     s1 = await Student.create(name="student1", age=18)
     s2 = await Student.create(name="student2", age=19)
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+import typing as t
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from unfazed.cache import caches
+from unfazed.cache.backends.redis import DefaultBackend
+from unfazed.conf import UnfazedSettings
+from unfazed.core import Unfazed
+from unfazed.schema import Tasks
+from unfazed.tasks import MemoryBroker, RedisBroker, task, tasks
+from unfazed.tasks.lifespan import TaskWorker
+
+HOST = os.getenv("REDIS_HOST", "redis")
+
+events: t.List[t.Any] = []
+
+
+@task
+async def notify(user_id: int, channel: str = "email") -> None:
+    events.append((user_id, channel))
+
+
+@task(max_retries=3, retry_backoff=0.01)
+async def flaky(key: str) -> None:
+    events.append(key)
+    if events.count(key) < 3:
+        raise ConnectionError("webhook unavailable")
+
+
+@task(max_retries=1, retry_backoff=0.01)
+async def broken() -> None:
+    raise ConnectionError("always down")
+
+
+@task(retry_on=(ConnectionError,))
+async def invalid() -> None:
+    raise ValueError("bad payload")
+
+
+@task(timeout=1)
+async def slow(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+    events.append(seconds)
+
+
+async def wait_until(condition: t.Callable[[], bool], timeout: float = 2) -> None:
+    start = time.perf_counter()
+    while not condition():
+        assert time.perf_counter() - start < timeout
+        await asyncio.sleep(0.01)
+
+
+async def test_task_worker() -> None:
+    events.clear()
+    unfazed = Unfazed(
+        settings=UnfazedSettings.model_validate(
+            {
+                "DEBUG": True,
+                "INSTALLED_APPS": ["tests.apps.tasks.common"],
+                "TASKS": {"CONCURRENCY": 2, "DRAIN_TIMEOUT": 0.05},
+            }
+        )
+    )
+    await unfazed.setup()
+    broker = tasks.broker
+    assert isinstance(broker, MemoryBroker)
+
+    lifespan = TaskWorker(unfazed)
+    await lifespan.on_startup()
+    worker = lifespan.worker
+    assert worker is not None
+
+    # tasks of installed apps are registered on startup
+    await tasks["tests.apps.tasks.common.tasks.record"].delay("signup")
+    from tests.apps.tasks.common.tasks import received
+
+    await notify.delay(1)
+    await notify.apply([2], {"channel": "sms"}, countdown=0.05)
+    await wait_until(lambda: worker.processed == 3)
+    assert received == ["signup"]
+    assert events == [(1, "email"), (2, "sms")]
+
+    # retried with backoff until it succeeds
+    events.clear()
+    await flaky.delay("hook")
+    await wait_until(lambda: worker.processed == 4)
+    assert events == ["hook"] * 3
+    assert worker.retried == 2
+
+    # buried once the retries run out, or at once for other exceptions
+    await broken.delay()
+    await invalid.delay()
+    await wait_until(lambda: worker.failed == 2)
+    dead = {
+        message["task"]: message
+        for message in map(orjson.loads, broker.dead["default"])
+    }
+    assert dead[broken.name]["attempts"] == 2
+    assert dead[broken.name]["error"] == "ConnectionError('always down')"
+    assert dead[invalid.name]["attempts"] == 1
+
+    # malformed messages are buried as they came
+    for payload in ("not json", '{"task": "missing ids"}', "[1]"):
+        await broker.push("default", payload)
+    await wait_until(lambda: worker.failed == 5)
+    assert list(broker.dead["default"])[-3:] == [
+        "not json",
+        '{"task": "missing ids"}',
+        "[1]",
+    ]
+
+    # at most CONCURRENCY tasks run at once
+    events.clear()
+    for _ in range(3):
+        await slow.delay(0.1)
+    await asyncio.sleep(0.05)
+    assert worker.stats()["running"] == 2
+    await wait_until(lambda: len(events) == 3)
+
+    # tasks still running after the drain timeout go back to the queue
+    await slow.delay(0.5)
+    await asyncio.sleep(0.05)
+    await lifespan.on_shutdown()
+    assert lifespan.worker is None
+    assert len(broker.ready["default"]) == 1
+    assert orjson.loads(broker.ready["default"][0])["args"] == [0.5]
+
+
+async def test_eager_tasks() -> None:
+    events.clear()
+    tasks.setup(Tasks(EAGER=True))
+
+    await notify.delay(3)
+    assert events == [(3, "email")]
+
+    # calling the task calls the function
+    await notify(4, channel="push")
+    assert events == [(3, "email"), (4, "push")]
+
+    with pytest.raises(TypeError):
+        await notify.delay(object())
+
+    tasks.setting = tasks.broker = None
+    with pytest.raises(RuntimeError):
+        await notify.delay(5)
+
+    with pytest.raises(ValueError):
+        task(name=notify.name)(lambda: None)
+
+    with pytest.raises(ValidationError):
+        Tasks(CONCURRENCY=0)
+
+
+async def test_redis_broker() -> None:
+    backend = DefaultBackend(f"redis://{HOST}:6379", options={"PREFIX": "test_tasks"})
+    await backend.flushdb()
+    caches["test_tasks_redis"] = backend
+
+    broker = RedisBroker({"CACHE": "test_tasks_redis", "VISIBILITY_TIMEOUT": 0.1})
+
+    await broker.push("default", "first")
+    await broker.push("default", "second")
+    await broker.push("default", "later", delay=0.1)
+    assert await broker.pop("default") == "first"
+    await broker.ack("default", "first")
+
+    # not acked in time, delivered again
+    assert await broker.pop("default") == "second"
+    assert await broker.pop("default") is None
+    await asyncio.sleep(0.15)
+    assert {await broker.pop("default"), await broker.pop("default")} == {
+        "second",
+        "later",
+    }
+
+    await broker.retry("default", "later", "later again")
+    assert await broker.pop("default") == "later again"
+    await broker.bury("default", "later again", "dead")
+    _, _, inflight, dead = broker.make_keys("default")
+    assert await backend.client.lrange(dead, 0, -1) == [b"dead"]  # type: ignore
+    assert await backend.client.zrange(inflight, 0, -1) == [b"second"]
+
+    del caches["test_tasks_redis"]
+    await backend.close()
@@ -32,8 +32,20 @@ class BaseAppConfig(ABC):
             print("App is ready!")
     ```
 
+    Apps that must be ready before this one when `PARALLEL_STARTUP`
+    is enabled are listed in `depends_on`:
+
+    ```python
+
+    class AppConfig(BaseAppConfig):
+        depends_on = ("unfazed.contrib.auth",)
+    ```
+
     """
 
+    # names of apps whose `ready()` must finish before this one
+    depends_on: t.ClassVar[t.Sequence[str]] = ()
+
     def __init__(self, unfazed: "Unfazed", app_module: ModuleType) -> None:
         """
         Initialize the application configuration.
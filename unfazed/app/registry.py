@@ -1,6 +1,9 @@
+import asyncio
 import typing as t
+from graphlib import CycleError, TopologicalSorter
 
 from unfazed.type import CanBeImported
+from unfazed.utils import Timer
 
 from .base import BaseAppConfig
 
@@ -19,11 +22,17 @@ class AppCenter:
     Attributes:
         unfazed: The main Unfazed application instance
         installed_apps: List of application paths to be loaded
+        parallel: Run independent `ready()` hooks concurrently
+        report: Seconds spent importing, readying and waking up each app
         _store: Internal dictionary storing loaded application configurations
     """
 
     def __init__(
-        self, unfazed: "Unfazed", installed_apps: t.List[CanBeImported]
+        self,
+        unfazed: "Unfazed",
+        installed_apps: t.List[CanBeImported],
+        *,
+        parallel: bool = False,
     ) -> None:
         """
         Initialize the AppCenter with the main Unfazed instance and installed apps.
@@ -31,9 +40,12 @@ class AppCenter:
         Args:
             unfazed: The main Unfazed application instance
             installed_apps: List of application paths to be loaded
+            parallel: Run `ready()` hooks concurrently, honoring `depends_on`
         """
         self.unfazed = unfazed
         self.installed_apps = installed_apps
+        self.parallel = parallel
+        self.report: t.Dict[str, t.Dict[str, float]] = {}
         self._store: t.Dict[str, BaseAppConfig] = {}
 
     async def setup(self) -> None:
@@ -44,6 +56,30 @@ class AppCenter:
         It ensures that each application is loaded only once and properly initialized.
         Then it will wakeup settings modules.
 
+        When `parallel` is set, all apps are imported first and their
+        `ready()` hooks then run concurrently, see `load_apps` and `ready_apps`.
+
+        Raises:
+            RuntimeError: If an application is already loaded
+        """
+        if self.parallel:
+            self.load_apps()
+            await self.ready_apps()
+            return
+
+        for app_path in self.installed_apps:
+            if app_path in self._store:
+                raise RuntimeError(f"App with path {app_path} is already loaded")
+            temp_app = self.load_app(app_path)
+            await self.ready_app(temp_app)
+            self._store[temp_app.name] = temp_app
+
+    def load_apps(self) -> None:
+        """
+        Import every installed application without calling `ready()`.
+
+        Imports stay sequential, module imports hold the import lock anyway.
+
         Raises:
             RuntimeError: If an application is already loaded
         """
@@ -51,10 +87,68 @@ class AppCenter:
             if app_path in self._store:
                 raise RuntimeError(f"App with path {app_path} is already loaded")
             temp_app = self.load_app(app_path)
-            await temp_app.ready()
-            temp_app.wakeup("settings")
             self._store[temp_app.name] = temp_app
 
+    async def ready_apps(self) -> None:
+        """
+        Run `ready()` and the settings wakeup of every loaded application.
+
+        An app starts as soon as all apps in its `depends_on` are ready,
+        apps without pending dependencies run concurrently. If one hook
+        fails, the hooks still running are cancelled and the error is raised.
+
+        Raises:
+            ValueError: If an app depends on an app that is not installed
+            RuntimeError: If the dependencies contain a cycle
+        """
+        graph: t.Dict[str, t.Sequence[str]] = {}
+        for name, app in self._store.items():
+            for dependency in app.depends_on:
+                if dependency not in self._store:
+                    raise ValueError(
+                        f"App {name} depends on {dependency}, which is not installed"
+                    )
+            graph[name] = app.depends_on
+
+        sorter = TopologicalSorter(graph)
+        try:
+            sorter.prepare()
+        except CycleError as err:
+            raise RuntimeError(f"Circular app dependencies: {err.args[1]}") from err
+
+        running: t.Dict[asyncio.Task, str] = {}
+        try:
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    task = asyncio.create_task(self.ready_app(self._store[name]))
+                    running[task] = name
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = running.pop(task)
+                    task.result()
+                    sorter.done(name)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+
+    async def ready_app(self, app: BaseAppConfig) -> None:
+        """
+        Call `ready()` on an application and wake up its settings module.
+
+        Args:
+            app: The loaded application configuration
+        """
+        report = self.report.setdefault(app.name, {})
+        with Timer("ready", silent=True, record=report):
+            await app.ready()
+        with Timer("settings", silent=True, record=report):
+            app.wakeup("settings")
+
     def load_app(self, app_path: str) -> BaseAppConfig:
         """
         Load an application from the given path.
@@ -65,7 +159,10 @@ class AppCenter:
         Returns:
             BaseAppConfig: The loaded application configuration
         """
-        app_config = BaseAppConfig.from_entry(app_path, self.unfazed)
+        report: t.Dict[str, float] = {}
+        with Timer("import", silent=True, record=report):
+            app_config = BaseAppConfig.from_entry(app_path, self.unfazed)
+        self.report[app_config.name] = report
         return app_config
 
     def __getitem__(self, key: str) -> BaseAppConfig:
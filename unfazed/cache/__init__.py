@@ -1,4 +1,15 @@
 from .decorators import cached
 from .handler import caches
+from .ratelimit import RateLimit, RateLimitMiddleware, rate_limit
+from .response import ResponseCache, ResponseCacheMiddleware, cache_response
 
-__all__ = ["caches", "cached"]
+__all__ = [
+    "caches",
+    "cached",
+    "cache_response",
+    "ResponseCache",
+    "ResponseCacheMiddleware",
+    "rate_limit",
+    "RateLimit",
+    "RateLimitMiddleware",
+]
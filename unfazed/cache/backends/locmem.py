@@ -140,6 +140,79 @@ class LocMemCache:
     async def decr(self, key: str, delta: int = -1, version: int | None = None) -> int:
         return await self.incr(key, delta, version=version)
 
+    async def expire(
+        self, key: str, timeout: float | None, version: int | None = None
+    ) -> bool:
+        if not await self.has_key(key, version=version):
+            return False
+        key = self.make_key(key, version=version)
+        async with self._lock:
+            self._expire_info[key] = self.get_timeout(timeout)
+        return True
+
+    async def ttl(self, key: str, version: int | None = None) -> float | None:
+        """Seconds to live, None if the key never expires, -2 if missing."""
+        if not await self.has_key(key, version=version):
+            return -2
+        exp = self._expire_info[self.make_key(key, version=version)]
+        if exp is None:
+            return None
+        return exp - time.time()
+
+    # hash commands, the hash is stored as one pickled dict
+    # so a field update still rewrites the whole value in memory
+
+    async def hset(
+        self,
+        key: str,
+        mapping: t.Mapping[str, t.Any],
+        version: int | None = None,
+    ) -> int:
+        value = await self.hgetall(key, version=version)
+        added = len(mapping.keys() - value.keys())
+        value.update(mapping)
+
+        key = self.make_key(key, version=version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        async with self._lock:
+            if key not in self._cache:
+                if len(self._cache) >= self.max_entries:
+                    self._cull()
+                self._expire_info[key] = None
+            self._cache[key] = pickled
+            self._cache.move_to_end(key, last=False)
+        return added
+
+    async def hget(
+        self, key: str, field: str, version: int | None = None
+    ) -> t.Any | None:
+        value = await self.hgetall(key, version=version)
+        return value.get(field)
+
+    async def hgetall(self, key: str, version: int | None = None) -> t.Dict[str, t.Any]:
+        value = await self.get(key, default={}, version=version)
+        if not isinstance(value, dict):
+            raise TypeError(f"Key {key} does not hold a hash")
+        return value
+
+    async def hdel(self, key: str, *fields: str, version: int | None = None) -> int:
+        value = await self.hgetall(key, version=version)
+        removed = [field for field in fields if field in value]
+        if not removed:
+            return 0
+        for field in removed:
+            del value[field]
+
+        if not value:
+            await self.delete(key, version=version)
+            return len(removed)
+
+        key = self.make_key(key, version=version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        async with self._lock:
+            self._cache[key] = pickled
+        return len(removed)
+
     async def has_key(self, key: str, version: int | None = None) -> bool:
         key = self.make_key(key, version=version)
         async with self._lock:
@@ -304,3 +304,24 @@ class SerializerBackend:
     async def delete(self, *names: str) -> int:
         names = [self.make_key(key) for key in names]
         return await self.client.delete(*names)
+
+    # hash commands, field values go through the serializer and compressor
+    async def hset(self, name: str, mapping: t.Mapping[str, t.Any]) -> int:
+        key = self.make_key(name)
+        encoded = {field: self.encode(value) for field, value in mapping.items()}
+        return await self.client.hset(key, mapping=encoded)  # type: ignore[misc]
+
+    async def hget(self, name: str, field: str) -> t.Any:
+        key = self.make_key(name)
+        return self.decode(await self.client.hget(key, field))  # type: ignore[misc]
+
+    async def hgetall(self, name: str) -> t.Dict[str, t.Any]:
+        key = self.make_key(name)
+        ret = await self.client.hgetall(key)  # type: ignore[misc]
+        return {
+            field.decode("utf-8"): self.decode(value) for field, value in ret.items()
+        }
+
+    async def hdel(self, name: str, *fields: str) -> int:
+        key = self.make_key(name)
+        return await self.client.hdel(key, *fields)  # type: ignore[misc]
@@ -3,7 +3,7 @@ import typing as t
 import warnings
 from functools import wraps
 
-from unfazed.concurrency import run_in_threadpool
+from unfazed.concurrency import run_in_executor, run_in_threadpool
 
 from .handler import caches
 
@@ -27,6 +27,7 @@ def cached(
     using: str = "default",
     timeout: int = 60,
     include: t.List[str] | None = None,
+    executor: str | None = None,
 ) -> t.Callable:
     """
     Decorator for caching the results of async or sync functions.
@@ -40,6 +41,8 @@ def cached(
         timeout (int): Time in seconds before the cache entry expires. Defaults to 60.
         include (List[str] | None): List of parameter names to include in the cache key.
                                   If None, all parameters are included. Defaults to None.
+        executor (str | None): Named executor from settings.EXECUTORS that runs sync
+                               functions. Defaults to None, the shared threadpool.
 
     Returns:
         Callable: A decorated async function that caches its results.
@@ -146,6 +149,8 @@ def cached(
             else:
                 if inspect.iscoroutinefunction(func):
                     result = await func(*args, **kwargs)
+                elif executor is not None:
+                    result = await run_in_executor(executor, func, *args, **kwargs)
                 else:
                     result = await run_in_threadpool(func, *args, **kwargs)
                 await cache.set(key, result, timeout)
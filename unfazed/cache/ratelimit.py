@@ -0,0 +1,508 @@
+import hashlib
+import math
+import re
+import time
+import typing as t
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.middleware import BaseMiddleware
+from unfazed.protocol import ASGIType
+from unfazed.type import ASGIApp, Message, Receive, Scope, Send
+
+from .backends.locmem import LocMemCache
+from .handler import caches
+
+ALGORITHMS = ("sliding_window", "token_bucket")
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+PERIODS.update({name[0]: seconds for name, seconds in list(PERIODS.items())})
+
+# full names take an optional plural `s`, single letters do not
+RATE_PATTERN = re.compile(
+    r"^\s*(\d+)\s*/\s*(\d*)\s*(%s)\s*$"
+    % "|".join(
+        f"(?:{name})s?" if len(name) > 1 else name
+        for name in sorted(PERIODS, key=len, reverse=True)
+    )
+)
+
+# both scripts read the clock of the redis server, so the app servers'
+# clocks do not need to agree. ARGV: limit, period, cost, debt. `debt`
+# are hits already admitted by a local lease, recorded unconditionally.
+# Returns allowed, remaining and seconds until reset as a string.
+
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local debt = tonumber(ARGV[4])
+
+local index = math.floor(now / period)
+local elapsed = now - index * period
+local current = KEYS[1] .. ':' .. index
+local previous = KEYS[1] .. ':' .. (index - 1)
+
+if debt > 0 then
+    redis.call('INCRBY', current, debt)
+    redis.call('EXPIRE', current, period * 2)
+end
+
+local used = tonumber(redis.call('GET', previous) or '0') * (1 - elapsed / period)
+    + tonumber(redis.call('GET', current) or '0')
+local reset = tostring(period - elapsed)
+
+if used + cost > limit then
+    return {0, math.max(0, math.floor(limit - used)), reset}
+end
+
+redis.call('INCRBY', current, cost)
+redis.call('EXPIRE', current, period * 2)
+return {1, math.max(0, math.floor(limit - used - cost)), reset}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local rate = limit / tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local debt = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or limit
+local ts = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + (now - ts) * rate) - debt
+
+local allowed = 0
+local reset = (cost - tokens) / rate
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+    reset = (limit - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(limit / rate) + 1)
+return {allowed, math.max(0, math.floor(tokens)), tostring(reset)}
+"""
+
+
+def parse_rate(rate: str) -> t.Tuple[int, int]:
+    """
+    Parse `"100/minute"`, `"10/s"` or `"1000/6h"` into
+    `(limit, period in seconds)`.
+    """
+    match = RATE_PATTERN.match(rate.lower())
+    if match is None:
+        raise ValueError(
+            f"invalid rate {rate}, expected e.g. '100/minute', '10/s' or '1000/6h'"
+        )
+    count, multiplier, unit = match.groups()
+    if unit not in PERIODS:
+        unit = unit[:-1]  # plural
+    period = int(multiplier or 1) * PERIODS[unit]
+    if not int(count) or not period:
+        raise ValueError(f"invalid rate {rate}, limit and period must be positive")
+    return int(count), period
+
+
+def ip_key(scope: Scope) -> str | None:
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+def user_key(scope: Scope) -> str | None:
+    user = scope.get("user")
+    if user is None and "resolve_user" in scope:
+        # resolved on demand by the authentication middleware, a
+        # deferred session that needs I/O counts by ip
+        try:
+            user = HttpRequest(scope).user
+        except RuntimeError:
+            user = None
+    user_id = getattr(user, "id", None)
+    if user_id is None:
+        return ip_key(scope)
+    return f"user:{user_id}"
+
+
+def token_key(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            digest = hashlib.blake2b(value, digest_size=16).hexdigest()
+            return f"token:{digest}"
+    return ip_key(scope)
+
+
+KEY_FUNCTIONS: t.Dict[str, t.Callable[[Scope], str | None]] = {
+    "ip": ip_key,
+    "user": user_key,
+    "token": token_key,
+}
+
+
+class RateLimitResult:
+    __slots__ = ("allowed", "limit", "remaining", "reset")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset: float):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        # seconds until the quota is restored
+        self.reset = reset
+
+    def headers(self) -> t.List[t.Tuple[bytes, bytes]]:
+        ret = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-remaining", str(self.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+        if not self.allowed:
+            ret.append((b"retry-after", str(max(1, math.ceil(self.reset))).encode()))
+        return ret
+
+
+class LocalRateStore:
+    """
+    Counters kept in the process, for `LocMemCache` aliases.
+
+    Keeps at most the backend's `MAX_ENTRIES` keys, the least recently
+    seen are dropped first.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self.state: t.OrderedDict[str, t.List[float]] = OrderedDict()
+
+    def load(self, key: str, default: t.List[float]) -> t.List[float]:
+        state = self.state.get(key)
+        if state is None:
+            if len(self.state) >= self.max_keys:
+                self.state.popitem(last=False)
+            state = self.state[key] = default
+        else:
+            self.state.move_to_end(key)
+        return state
+
+    async def hit(
+        self, key: str, limit: int, period: int, algorithm: str
+    ) -> RateLimitResult:
+        now = time.monotonic()
+
+        if algorithm == "token_bucket":
+            rate = limit / period
+            state = self.load(key, [float(limit), now])
+            tokens = min(float(limit), state[0] + (now - state[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            state[0], state[1] = tokens, now
+            reset = (limit - tokens) / rate if allowed else (1 - tokens) / rate
+            return RateLimitResult(allowed, limit, int(tokens), reset)
+
+        # state: window index, previous count, current count
+        index = now // period
+        state = self.load(key, [index, 0, 0])
+        if state[0] != index:
+            previous = state[2] if state[0] == index - 1 else 0
+            state[0], state[1], state[2] = index, previous, 0
+
+        elapsed = now - index * period
+        used = state[1] * (1 - elapsed / period) + state[2]
+        allowed = used + 1 <= limit
+        if allowed:
+            state[2] += 1
+            used += 1
+        remaining = max(0, math.floor(limit - used))
+        return RateLimitResult(allowed, limit, remaining, period - elapsed)
+
+
+class Lease:
+    __slots__ = ("budget", "pending", "remaining", "expires", "reset_at")
+
+    def __init__(
+        self, budget: int, remaining: int, expires: float, reset_at: float
+    ) -> None:
+        self.budget = budget
+        # hits admitted locally, not yet recorded in redis
+        self.pending = 0
+        self.remaining = remaining
+        self.expires = expires
+        self.reset_at = reset_at
+
+
+class RedisRateStore:
+    """
+    Counters kept in redis and updated by atomic Lua scripts, shared by
+    every process using the alias.
+
+    A client far below its limit gets a local lease: after a round trip
+    reports at least half of the limit remaining, up to `precheck_share`
+    of the remaining hits are admitted without contacting redis for
+    `sync_interval` seconds. They are recorded with the next round trip.
+    Each process may therefore overshoot a limit by its lease, set
+    `precheck_share` to 0 for exact limits.
+    """
+
+    def __init__(
+        self,
+        backend: t.Any,
+        precheck_share: float,
+        sync_interval: float,
+    ) -> None:
+        self.backend = backend
+        self.precheck_share = precheck_share
+        self.sync_interval = sync_interval
+
+        client: Redis = backend.client
+        self.scripts = {
+            "sliding_window": client.register_script(SLIDING_WINDOW_SCRIPT),
+            "token_bucket": client.register_script(TOKEN_BUCKET_SCRIPT),
+        }
+        self.leases: t.OrderedDict[str, Lease] = OrderedDict()
+        self.max_leases = 10000
+
+    async def hit(
+        self, key: str, limit: int, period: int, algorithm: str
+    ) -> RateLimitResult:
+        now = time.monotonic()
+
+        debt = 0
+        lease = self.leases.pop(key, None)
+        if lease is not None:
+            if now < lease.expires and lease.pending < lease.budget:
+                lease.pending += 1
+                self.leases[key] = lease
+                return RateLimitResult(
+                    True,
+                    limit,
+                    lease.remaining - lease.pending,
+                    max(0.0, lease.reset_at - now),
+                )
+            debt = lease.pending
+
+        # braces keep the keys of one client in one cluster slot
+        redis_key = "{" + self.backend.make_key(key) + "}"
+        allowed, remaining, reset = await self.scripts[algorithm](
+            keys=[redis_key], args=[limit, period, 1, debt]
+        )
+        result = RateLimitResult(bool(allowed), limit, remaining, float(reset))
+
+        budget = int(remaining * self.precheck_share)
+        if budget and remaining * 2 >= limit:
+            if len(self.leases) >= self.max_leases:
+                self.leases.popitem(last=False)
+            self.leases[key] = Lease(
+                budget,
+                remaining,
+                now + min(self.sync_interval, result.reset),
+                now + result.reset,
+            )
+
+        return result
+
+
+class RateLimit:
+    """
+    Limit the requests per client key within a period.
+
+    - `rate`: e.g. `"100/minute"`, `"10/s"` or `"1000/6h"`.
+    - `key`: `"ip"`, `"user"` (the authenticated user, falling back to
+      the ip), `"token"` (the `Authorization` header, falling back to
+      the ip) or a callable taking the scope. A key of None skips the
+      limit for that request.
+    - `algorithm`: `"sliding_window"` weights the previous fixed window
+      by its overlap with the sliding one, `"token_bucket"` refills
+      `limit` tokens per period and allows bursts up to `limit`.
+    - `using`: the cache alias. Redis aliases share the counters
+      between processes, see `RedisRateStore`. `LocMemCache` aliases
+      keep them in the process.
+    """
+
+    def __init__(
+        self,
+        rate: str,
+        *,
+        key: str | t.Callable[[Scope], str | None] = "ip",
+        using: str = "default",
+        algorithm: str = "sliding_window",
+        name: str = "default",
+        key_prefix: str = "unfazed_ratelimit",
+        precheck_share: float = 0.1,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self.limit, self.period = parse_rate(rate)
+
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"invalid algorithm {algorithm}, expected one of {ALGORITHMS}"
+            )
+
+        if isinstance(key, str):
+            if key not in KEY_FUNCTIONS:
+                raise ValueError(
+                    f"invalid key {key}, expected one of {list(KEY_FUNCTIONS)} or a callable"
+                )
+            self.get_key = KEY_FUNCTIONS[key]
+        else:
+            self.get_key = key
+
+        self.rate = rate
+        self.using = using
+        self.algorithm = algorithm
+        self.name = name
+        self.key_prefix = key_prefix
+        self.precheck_share = precheck_share
+        self.sync_interval = sync_interval
+
+        self._backend: t.Any = None
+        self._store: LocalRateStore | RedisRateStore | None = None
+
+    @property
+    def store(self) -> LocalRateStore | RedisRateStore:
+        if self.using not in caches:
+            raise ValueError(f"RateLimit Error: cache alias {self.using} not in caches")
+
+        backend = caches[self.using]
+        if backend is not self._backend or self._store is None:
+            self._store = self.make_store(backend)
+            self._backend = backend
+        return self._store
+
+    def make_store(self, backend: t.Any) -> LocalRateStore | RedisRateStore:
+        if isinstance(backend, LocMemCache):
+            return LocalRateStore(backend.max_entries)
+        if isinstance(getattr(backend, "client", None), Redis):
+            return RedisRateStore(backend, self.precheck_share, self.sync_interval)
+        raise ValueError(
+            f"RateLimit Error: cache alias {self.using} is neither a redis nor a locmem backend"
+        )
+
+    async def hit(self, scope: Scope) -> RateLimitResult | None:
+        client_key = self.get_key(scope)
+        if client_key is None:
+            return None
+        key = f"{self.key_prefix}:{self.name}:{client_key}"
+        return await self.store.hit(key, self.limit, self.period, self.algorithm)
+
+    def wrap(self, app: ASGIApp) -> "RateLimitMiddleware":
+        return RateLimitMiddleware(app, limiter=self)
+
+
+class RateLimitMiddleware(BaseMiddleware):
+    """
+    Answer requests over a `RateLimit` with `429 Too Many Requests`.
+
+    Every limited response carries `RateLimit-Limit`,
+    `RateLimit-Remaining` and `RateLimit-Reset`, a `429` also carries
+    `Retry-After`. Configure it by subclassing:
+
+    ```python
+
+    class SearchLimit(RateLimitMiddleware):
+        rate = "30/minute"
+        key = "user"
+
+
+    patterns = [
+        path("/search", endpoint=search, middlewares=["myapp.middleware.SearchLimit"]),
+    ]
+
+    ```
+
+    or decorate the endpoint with `rate_limit`.
+    """
+
+    rate: str = "60/minute"
+    key: str = "ip"
+    using: str = "default"
+    algorithm: str = "sliding_window"
+    precheck_share: float = 0.1
+
+    def __init__(self, app: ASGIApp, limiter: RateLimit | None = None) -> None:
+        super().__init__(app)
+        cls = type(self)
+        self.limiter = limiter or RateLimit(
+            self.rate,
+            key=self.get_key if self.overrides_get_key() else self.key,
+            using=self.using,
+            algorithm=self.algorithm,
+            name=f"{cls.__module__}.{cls.__qualname__}",
+            precheck_share=self.precheck_share,
+        )
+
+    def overrides_get_key(self) -> bool:
+        return type(self).get_key is not RateLimitMiddleware.get_key
+
+    def get_key(self, scope: Scope) -> str | None:
+        """
+        Override to compute the client key from the scope.
+        """
+        return KEY_FUNCTIONS[self.key](scope)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.hit(scope)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = result.headers()
+        if not result.allowed:
+            response = HttpResponse("Too Many Requests", status_code=429)
+            response.raw_headers.extend(headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == ASGIType.HTTP_RESPONSE_START:
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def rate_limit(
+    rate: str,
+    *,
+    key: str | t.Callable[[Scope], str | None] = "ip",
+    using: str = "default",
+    algorithm: str = "sliding_window",
+    precheck_share: float = 0.1,
+) -> t.Callable:
+    """
+    Limit the requests to an endpoint, see `RateLimit`.
+
+    The route wraps the endpoint with `RateLimitMiddleware`, a limited
+    request does not parse or validate the request parameters.
+
+    ```python
+
+    @rate_limit("10/minute", key="user", using="redis")
+    async def export_report(request: HttpRequest) -> JsonResponse:
+        ...
+
+    ```
+    """
+
+    def decorator(endpoint: t.Callable) -> t.Callable:
+        limiter = RateLimit(
+            rate,
+            key=key,
+            using=using,
+            algorithm=algorithm,
+            name=f"{endpoint.__module__}.{endpoint.__qualname__}",
+            precheck_share=precheck_share,
+        )
+        setattr(endpoint, "rate_limit", limiter)
+        return endpoint
+
+    return decorator
@@ -0,0 +1,379 @@
+import asyncio
+import hashlib
+import logging
+import time
+import typing as t
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+
+from unfazed.http.conditional import etag_matches, make_etag, send_not_modified
+from unfazed.middleware import BaseMiddleware
+from unfazed.protocol import ASGIType
+from unfazed.type import ASGIApp, Message, Receive, Scope, Send
+
+from .handler import caches
+
+logger = logging.getLogger("unfazed.cache")
+
+# a shared cache must not store responses carrying these directives
+UNCACHEABLE_DIRECTIVES = {"no-store", "no-cache", "private"}
+
+
+class ResponseCache:
+    """
+    Store whole responses in a cache backend.
+
+    Responses to `GET` are stored with their status, headers and body,
+    keyed by scheme, host, path, normalized query string and the request
+    headers in `vary`. `HEAD` is answered from the `GET` entry.
+
+    An entry is fresh for `timeout` seconds. For another
+    `stale_timeout` seconds it is still served, while one background
+    request per key and process refreshes it.
+
+    Only `200` responses are stored, and only if they set no cookie,
+    carry no `no-store`, `no-cache` or `private` directive and vary on
+    no header outside `vary`. Requests that may get a personalized
+    response are never served from or stored in the cache: requests
+    with an `Authorization` header, with a `Cookie` header unless
+    `cookie` is in `vary`, and requests of an authenticated user.
+
+    Entries get an `ETag` if the response has none, a matching
+    `If-None-Match` is answered with `304 Not Modified`.
+    """
+
+    def __init__(
+        self,
+        using: str = "default",
+        timeout: int = 60,
+        stale_timeout: int = 0,
+        vary: t.Sequence[str] | None = None,
+        max_size: int = 1 << 20,
+        key_prefix: str = "unfazed_response",
+    ) -> None:
+        self.using = using
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.vary = [name.lower() for name in vary or ()]
+        self.max_size = max_size
+        self.key_prefix = key_prefix
+
+        # keys being refreshed by this process
+        self.refreshing: t.Set[str] = set()
+        self.tasks: t.Set[asyncio.Task] = set()
+
+    @property
+    def backend(self) -> t.Any:
+        if self.using not in caches:
+            raise ValueError(
+                f"ResponseCache Error: cache alias {self.using} not in caches"
+            )
+        return caches[self.using]
+
+    def wrap(self, app: ASGIApp) -> "ResponseCacheMiddleware":
+        return ResponseCacheMiddleware(app, cache=self)
+
+    def make_key(self, scope: Scope, headers: Headers) -> str:
+        query = scope.get("query_string", b"").decode("latin-1")
+        if query:
+            query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+        varied = "\n".join(",".join(headers.getlist(name)) for name in self.vary)
+        # hosts served by one deployment must not share entries
+        origin = f"{scope.get('scheme', 'http')}://{headers.get('host', '').lower()}"
+        digest = hashlib.blake2b(
+            f"{origin}\n{query}\n{varied}".encode("utf-8", "surrogateescape"),
+            digest_size=16,
+        ).hexdigest()
+        return f"{self.key_prefix}:GET:{scope['path']}:{digest}"
+
+    def bypass(self, scope: Scope, headers: Headers) -> bool:
+        if "authorization" in headers:
+            return True
+        if "cookie" in headers and "cookie" not in self.vary:
+            return True
+        # set by the authentication middlewares, None for anonymous users
+        return scope.get("user") is not None
+
+    def is_cacheable(self, message: Message) -> bool:
+        if message["status"] != 200:
+            return False
+
+        headers = Headers(raw=message["headers"])
+        if "set-cookie" in headers:
+            return False
+
+        directives = {
+            d.strip().partition("=")[0].lower()
+            for d in headers.get("cache-control", "").split(",")
+        }
+        if directives & UNCACHEABLE_DIRECTIVES:
+            return False
+
+        for value in headers.getlist("vary"):
+            for name in value.split(","):
+                if name.strip().lower() not in self.vary:
+                    return False
+
+        return True
+
+    async def get(self, key: str) -> t.Dict[str, t.Any] | None:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, entry: t.Dict[str, t.Any]) -> None:
+        await self.backend.set(key, entry, self.timeout + self.stale_timeout)
+
+    def refresh(self, key: str, app: ASGIApp, scope: Scope) -> None:
+        if key in self.refreshing:
+            return
+        self.refreshing.add(key)
+
+        scope = {**scope, "method": "GET"}
+        task = asyncio.create_task(self.run_refresh(key, app, scope))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run_refresh(self, key: str, app: ASGIApp, scope: Scope) -> None:
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Message) -> None:
+            return None
+
+        try:
+            recorder = ResponseRecorder(self, key, send, None)
+            await app(scope, receive, recorder.send)
+        except Exception:
+            logger.exception(f"failed to refresh cached response {key}")
+        finally:
+            self.refreshing.discard(key)
+
+
+class ResponseRecorder:
+    def __init__(
+        self,
+        cache: ResponseCache,
+        key: str,
+        send: Send,
+        if_none_match: str | None,
+    ) -> None:
+        self.cache = cache
+        self.key = key
+        self.raw_send = send
+        self.if_none_match = if_none_match
+        self.start_message: Message | None = None
+        self.recording = False
+        self.chunks: t.List[bytes] = []
+        self.size = 0
+        self.status = 200
+        self.headers: t.List[t.Tuple[bytes, bytes]] = []
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == ASGIType.HTTP_RESPONSE_START:
+            self.recording = self.cache.is_cacheable(message)
+            if self.recording:
+                # held until the first body tells whether an etag can be set
+                self.start_message = message
+            else:
+                await self.raw_send(message)
+            return
+
+        if not self.recording or message_type != "http.response.body":
+            await self.raw_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body:
+                etag = self.ensure_etag(start, body)
+                await self.store(start, body)
+                if self.if_none_match is not None and etag_matches(
+                    self.if_none_match, etag
+                ):
+                    await send_not_modified(self.raw_send, start["headers"])
+                    return
+            self.headers = start["headers"]
+            self.status = start["status"]
+            await self.raw_send(start)
+            if not more_body:
+                await self.raw_send(message)
+                return
+
+        self.chunks.append(body)
+        self.size += len(body)
+        if self.size > self.cache.max_size:
+            self.recording = False
+            self.chunks = []
+        elif not more_body:
+            body = b"".join(self.chunks)
+            start = {"status": self.status, "headers": list(self.headers)}
+            self.ensure_etag(start, body)
+            await self.store(start, body)
+
+        await self.raw_send(message)
+
+    def ensure_etag(self, start: Message, body: bytes) -> str:
+        for name, value in start["headers"]:
+            if name.lower() == b"etag":
+                return value.decode("latin-1")
+        etag = make_etag(body)
+        start["headers"] = [*start["headers"], (b"etag", etag.encode("latin-1"))]
+        return etag
+
+    async def store(self, start: Message, body: bytes) -> None:
+        if len(body) > self.cache.max_size:
+            return
+        entry = {
+            "status": start["status"],
+            "headers": [
+                (name, value)
+                for name, value in start["headers"]
+                if name.lower() != b"content-length"
+            ],
+            "body": body,
+            "created": time.time(),
+        }
+        await self.cache.set(self.key, entry)
+
+
+class ResponseCacheMiddleware(BaseMiddleware):
+    """
+    Serve `GET` and `HEAD` requests from a `ResponseCache`.
+
+    A hit is answered without running the inner layers, so the endpoint's
+    validation, queries and serialization are skipped. Configure it by
+    subclassing:
+
+    ```python
+
+    class CatalogueCache(ResponseCacheMiddleware):
+        timeout = 300
+        stale_timeout = 60
+        vary = ("Accept-Language",)
+
+
+    patterns = [
+        path("/products", endpoint=list_products, middlewares=["myapp.middleware.CatalogueCache"]),
+    ]
+
+    ```
+
+    or decorate the endpoint with `cache_response`.
+    """
+
+    using: str = "default"
+    timeout: int = 60
+    stale_timeout: int = 0
+    vary: t.Sequence[str] = ()
+    max_size: int = 1 << 20
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache | None = None) -> None:
+        super().__init__(app)
+        self.cache = cache or ResponseCache(
+            using=self.using,
+            timeout=self.timeout,
+            stale_timeout=self.stale_timeout,
+            vary=self.vary,
+            max_size=self.max_size,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        cache = self.cache
+        headers = Headers(scope=scope)
+        if cache.bypass(scope, headers):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache.make_key(scope, headers)
+        if_none_match = headers.get("if-none-match")
+
+        entry = await cache.get(key)
+        if entry is not None:
+            age = time.time() - entry["created"]
+            if age >= cache.timeout:
+                cache.refresh(key, self.app, scope)
+            await self.replay(entry, age, scope, send, if_none_match)
+            return
+
+        if scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = ResponseRecorder(cache, key, send, if_none_match)
+        await self.app(scope, receive, recorder.send)
+
+    async def replay(
+        self,
+        entry: t.Dict[str, t.Any],
+        age: float,
+        scope: Scope,
+        send: Send,
+        if_none_match: str | None,
+    ) -> None:
+        headers = [*entry["headers"], (b"age", str(int(age)).encode())]
+
+        etag = next((v for k, v in entry["headers"] if k.lower() == b"etag"), None)
+        if if_none_match is not None and etag is not None:
+            if etag_matches(if_none_match, etag.decode("latin-1")):
+                await send_not_modified(send, headers)
+                return
+
+        body: bytes = entry["body"]
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry["status"],
+                "headers": headers,
+            }
+        )
+        if scope["method"] == "HEAD":
+            body = b""
+        await send({"type": "http.response.body", "body": body})
+
+
+def cache_response(
+    using: str = "default",
+    timeout: int = 60,
+    stale_timeout: int = 0,
+    vary: t.Sequence[str] | None = None,
+    max_size: int = 1 << 20,
+) -> t.Callable:
+    """
+    Cache the responses of an endpoint, see `ResponseCache`.
+
+    The route wraps the endpoint with `ResponseCacheMiddleware`, a hit
+    does not parse or validate the request parameters.
+
+    ```python
+
+    @cache_response(timeout=300, stale_timeout=60, vary=["Accept-Language"])
+    async def list_products(request: HttpRequest) -> JsonResponse:
+        ...
+
+    ```
+    """
+
+    cache = ResponseCache(
+        using=using,
+        timeout=timeout,
+        stale_timeout=stale_timeout,
+        vary=vary,
+        max_size=max_size,
+    )
+
+    def decorator(endpoint: t.Callable) -> t.Callable:
+        setattr(endpoint, "response_cache", cache)
+        return endpoint
+
+    return decorator
@@ -4,6 +4,21 @@ from functools import partial
 from anyio.to_process import run_sync as _run_in_processpool
 from anyio.to_thread import run_sync as _run_in_threadpool
 
+from .deadline import deadline, get_deadline, time_remaining
+from .executor import ExecutorHandler, ExecutorPool, executors
+
+__all__ = [
+    "run_in_threadpool",
+    "run_in_processpool",
+    "run_in_executor",
+    "executors",
+    "ExecutorHandler",
+    "ExecutorPool",
+    "deadline",
+    "get_deadline",
+    "time_remaining",
+]
+
 P = t.ParamSpec("P")
 T = t.TypeVar("T")
 
@@ -52,3 +67,30 @@ async def run_in_processpool(
 
     new_func = partial(func, *args, **kwargs)
     return await _run_in_processpool(new_func)
+
+
+async def run_in_executor(
+    name: str, func: t.Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Run a function in the named executor from `EXECUTORS`.
+
+    `"default"`, unless declared in `EXECUTORS`, is the shared threadpool
+    of `run_in_threadpool`.
+
+    Args:
+        name: The name of the executor.
+        func: The function to run.
+        *args: The arguments to pass to the function.
+        **kwargs: The keyword arguments to pass to the function.
+
+    Returns:
+        The return value of the function.
+
+    Raises:
+        KeyError: If the executor is not declared in `EXECUTORS`.
+    """
+
+    if name == "default" and name not in executors:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await executors[name].run(func, *args, **kwargs)
@@ -0,0 +1,55 @@
+import contextlib
+import time
+import typing as t
+from contextvars import ContextVar
+
+# `time.monotonic()` by which the current request must be answered
+_deadline: ContextVar[float | None] = ContextVar("unfazed_deadline", default=None)
+
+
+def get_deadline() -> float | None:
+    """
+    The current deadline as a `time.monotonic()` value, None without one.
+
+    Endpoints with a timeout run under a deadline, it is also visible in
+    sync endpoints running in the threadpool and in tasks they create.
+    """
+    return _deadline.get()
+
+
+def time_remaining() -> float | None:
+    """
+    Seconds left until the current deadline, None without one.
+
+    Pass it on to bound slow calls by the time the request has left:
+
+    ```python
+
+    remaining = time_remaining()
+    rows = await asyncio.wait_for(Product.filter(active=True), remaining)
+
+    ```
+    """
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current - time.monotonic())
+
+
+@contextlib.contextmanager
+def deadline(timeout: float | None) -> t.Iterator[float | None]:
+    """
+    Set the deadline to `timeout` seconds from now, unless an outer
+    deadline is sooner. Yields the resulting deadline.
+    """
+    current = _deadline.get()
+    if timeout is not None:
+        new = time.monotonic() + timeout
+        if current is None or new < current:
+            current = new
+
+    token = _deadline.set(current)
+    try:
+        yield current
+    finally:
+        _deadline.reset(token)
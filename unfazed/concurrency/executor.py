@@ -0,0 +1,174 @@
+import asyncio
+import contextvars
+import multiprocessing
+import time
+import typing as t
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from unfazed.schema import Executor as ExecutorSetting
+from unfazed.utils import Storage
+
+P = t.ParamSpec("P")
+T = t.TypeVar("T")
+
+
+class ExecutorPool:
+    """
+    A named, bounded pool of threads or processes.
+
+    At most `MAX_WORKERS` calls run at once, the others wait in the event
+    loop, not in the pool, so a cancelled caller stops waiting without
+    leaving work behind. A caller cancelled while its call runs returns
+    at once, the call keeps its worker until it finishes.
+
+    Threads run the call in a copy of the caller's context, e.g. the
+    request deadline. Processes need picklable, module-level functions
+    and arguments.
+    """
+
+    def __init__(self, name: str, setting: ExecutorSetting) -> None:
+        self.name = name
+        self.setting = setting
+        self.pool: Executor | None = None
+
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+
+        # calls waiting for a worker, calls running
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        # seconds spent waiting for a worker
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def get_pool(self) -> Executor:
+        if self.pool is None:
+            setting = self.setting
+            if setting.KIND == "thread":
+                self.pool = ThreadPoolExecutor(
+                    max_workers=setting.MAX_WORKERS,
+                    thread_name_prefix=setting.THREAD_NAME_PREFIX
+                    or f"unfazed-{self.name}",
+                )
+            else:
+                mp_context = None
+                if setting.START_METHOD is not None:
+                    mp_context = multiprocessing.get_context(setting.START_METHOD)
+                self.pool = ProcessPoolExecutor(
+                    max_workers=setting.MAX_WORKERS,
+                    mp_context=mp_context,
+                    max_tasks_per_child=setting.MAX_TASKS_PER_CHILD,
+                )
+        return self.pool
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None or self.loop is not loop:
+            self.loop = loop
+            self.semaphore = asyncio.Semaphore(self.setting.MAX_WORKERS)
+        return self.semaphore
+
+    async def run(self, func: t.Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        semaphore = self.get_semaphore()
+
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        wait = time.perf_counter() - start
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.running += 1
+
+        call = partial(func, *args, **kwargs)
+        try:
+            if self.setting.KIND == "thread":
+                future: Future[T] = self.get_pool().submit(
+                    contextvars.copy_context().run, call
+                )
+            else:
+                future = self.get_pool().submit(call)
+        except BaseException:
+            self.release(semaphore)
+            raise
+
+        loop = asyncio.get_running_loop()
+
+        def done(_: Future[T]) -> None:
+            try:
+                loop.call_soon_threadsafe(self.release, semaphore)
+            except RuntimeError:  # pragma: no cover
+                # the loop is closed, its semaphore is gone with it
+                pass
+
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def release(self, semaphore: asyncio.Semaphore) -> None:
+        self.running -= 1
+        self.completed += 1
+        semaphore.release()
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        """
+        Queue depth and wait times of the pool.
+
+        ```python
+
+        {
+            "kind": "thread",
+            "max_workers": 4,
+            "queued": 2,
+            "running": 4,
+            "completed": 120,
+            "wait_max": 0.8,
+            "wait_avg": 0.05,
+        }
+
+        ```
+        """
+        started = self.completed + self.running
+        return {
+            "kind": self.setting.KIND,
+            "max_workers": self.setting.MAX_WORKERS,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "wait_max": self.wait_max,
+            "wait_avg": self.wait_total / started if started else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait, cancel_futures=True)
+            self.pool = None
+
+
+class ExecutorHandler(Storage[ExecutorPool]):
+    """
+    The named executors declared in `EXECUTORS`, a singleton accessible
+    via `executors`.
+
+    ```python
+
+    from unfazed.concurrency import executors
+
+    executors["reports"].stats()
+
+    ```
+    """
+
+    def stats(self) -> t.Dict[str, t.Dict[str, t.Any]]:
+        return {name: pool.stats() for name, pool in self}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for _, pool in self:
+            pool.shutdown(wait=wait)
+
+
+executors: ExecutorHandler = ExecutorHandler()
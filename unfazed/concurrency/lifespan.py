@@ -0,0 +1,12 @@
+from unfazed.concurrency import executors, run_in_threadpool
+from unfazed.lifespan import BaseLifeSpan
+
+
+class ExecutorShutdown(BaseLifeSpan):
+    """
+    Shut down the pools of the named executors when the application
+    shuts down, running calls are waited for and queued ones cancelled.
+    """
+
+    async def on_shutdown(self) -> None:
+        await run_in_threadpool(executors.shutdown)
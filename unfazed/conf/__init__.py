@@ -3,11 +3,15 @@ import typing as t
 from pydantic import BaseModel, Field
 
 from unfazed.schema import (
+    Admission,
     Cache,
+    Compression,
     Cors,
     Database,
+    Executor,
     GZip,
     OpenAPI,
+    Tasks,
     TrustedHost,
 )
 from unfazed.type import CanBeImported
@@ -32,6 +36,14 @@ class UnfazedSettings(BaseModel):
     CORS: Cors | None = None
     TRUSTED_HOST: TrustedHost | None = None
     GZIP: GZip | None = None
+    COMPRESSION: Compression | None = None
+    ADMISSION: Admission | None = None
+    PARALLEL_STARTUP: bool = False
+    REQUEST_TIMEOUT: float | None = None
+    CANCEL_ON_DISCONNECT: bool = False
+    THREADPOOL_SIZE: int | None = None
+    EXECUTORS: t.Dict[str, Executor] | None = None
+    TASKS: Tasks | None = None
 
 
 __all__ = ["UnfazedSettings", "settings", "register_settings"]
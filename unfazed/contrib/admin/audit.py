@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import typing as t
+
+from unfazed.conf import settings
+from unfazed.lifespan import BaseLifeSpan
+
+from .models import LogEntry
+from .settings import UnfazedContribAdminSettings
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSink:
+    """
+    Buffer admin audit entries and write them with `bulk_create`.
+
+    `put` only enqueues, a background task writes a batch once
+    `batch_size` entries are waiting or `interval` seconds after the
+    first one arrived. The queue is bounded, when it is full `put`
+    waits for the writer, so a slow database slows admin actions down
+    instead of growing memory. `stop` writes everything still queued.
+
+    Until `start` is called, e.g. without the `AuditFlusher` lifespan,
+    `put` writes the entry inline.
+    """
+
+    def __init__(
+        self, max_size: int = 10000, batch_size: int = 100, interval: float = 1.0
+    ) -> None:
+        self.task: asyncio.Task | None = None
+        self.configure(max_size, batch_size, interval)
+
+    def configure(self, max_size: int, batch_size: int, interval: float) -> None:
+        if self.running:
+            raise RuntimeError("AuditSink Error: can not configure a running sink")
+        self.batch_size = batch_size
+        self.interval = interval
+        # None is the stop sentinel
+        self.queue: asyncio.Queue[t.Dict[str, t.Any] | None] = asyncio.Queue(max_size)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def put(self, **fields: t.Any) -> None:
+        if not self.running:
+            await self.write([fields])
+            return
+        await self.queue.put(fields)
+
+    def start(self) -> None:
+        if not self.running:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        if self.running:
+            await self.queue.put(None)
+            await self.task
+        self.task = None
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+
+        while True:
+            fields = await queue.get()
+            if fields is None:
+                return
+
+            batch = [fields]
+            deadline = loop.time() + self.interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    fields = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if fields is None:
+                    stopping = True
+                    break
+                batch.append(fields)
+
+            await self.write(batch)
+            if stopping:
+                return
+
+    async def write(self, batch: t.List[t.Dict[str, t.Any]]) -> None:
+        entries = []
+        for fields in batch:
+            # bodies are decoded here, off the request path
+            for name in ("request", "response"):
+                value = fields[name]
+                if isinstance(value, bytes):
+                    fields[name] = value.decode("utf-8", "replace")
+            entries.append(LogEntry(**fields))
+
+        try:
+            if len(entries) == 1:
+                await entries[0].save()
+            else:
+                await LogEntry.bulk_create(entries)
+        except Exception:
+            # audit failures must not take the writer down
+            logger.exception(f"failed to write {len(entries)} admin log entries")
+
+
+audit_sink = AuditSink()
+
+
+class AuditFlusher(BaseLifeSpan):
+    """
+    Run `audit_sink` for the lifetime of the app.
+
+    ```python
+
+    UNFAZED_SETTINGS = {
+        "LIFESPAN": [
+            "unfazed.contrib.admin.registry.lifespan.AdminWakeup",
+            "unfazed.contrib.admin.audit.AuditFlusher",
+        ],
+    }
+
+    ```
+    """
+
+    async def on_startup(self) -> None:
+        try:
+            admin_settings: UnfazedContribAdminSettings = settings[
+                "UNFAZED_CONTRIB_ADMIN_SETTINGS"
+            ]
+        except KeyError:
+            pass
+        else:
+            audit_sink.configure(
+                admin_settings.auditQueueSize,
+                admin_settings.auditBatchSize,
+                admin_settings.auditFlushInterval,
+            )
+        audit_sink.start()
+
+    async def on_shutdown(self) -> None:
+        await audit_sink.stop()
@@ -2,11 +2,9 @@ import time
 import typing as t
 from functools import wraps
 
-import orjson as json
-
 from unfazed.http import HttpRequest, HttpResponse
 
-from .models import LogEntry
+from .audit import audit_sink
 
 
 def record(func: t.Callable) -> t.Callable:
@@ -14,7 +12,8 @@ def record(func: t.Callable) -> t.Callable:
     async def wrapper(
         request: HttpRequest, *args: t.Any, **kwargs: t.Any
     ) -> HttpResponse:
-        request_json = await request.json()
+        # the raw body, the endpoint parses it anyway
+        request_body = await request.body()
         resp: HttpResponse = await func(request, *args, **kwargs)
 
         if request.user:
@@ -29,13 +28,13 @@ def record(func: t.Callable) -> t.Callable:
         else:
             ip = "unknown"
 
-        await LogEntry.create(
+        await audit_sink.put(
             created_at=int(time.time()),
             account=account,
             path=request.url.path,
             ip=ip,
-            request=json.dumps(request_json).decode(),
-            response=t.cast(bytes, resp.body).decode(),
+            request=request_body,
+            response=t.cast(bytes, resp.body),
         )
 
         return resp
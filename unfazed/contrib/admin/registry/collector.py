@@ -16,11 +16,29 @@ T = t.TypeVar(
 
 
 class AdminCollector(Storage[T]):
+    def __init__(self) -> None:
+        super().__init__()
+        # bumped on every change, lets callers cache what they derive from it
+        self.version = 0
+
     def set(self, key: str, value: T, override: bool = False) -> None:
         if key in self.storage:
             if not override:
                 raise KeyError(f"Key {key} already exists in the store")
         self.storage[key] = value
+        self.version += 1
+
+    def __setitem__(self, key: str, value: T) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
 
     def __iter__(self) -> t.Iterator[t.Tuple[str, T]]:
         for key, value in self.storage.items():
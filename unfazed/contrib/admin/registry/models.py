@@ -33,6 +33,17 @@ from .schema import (
 from .utils import convert_field_type, smart_split
 
 
+async def load_permissions(request: HttpRequest) -> t.FrozenSet[str]:
+    user = request.user
+    if getattr(user, "is_superuser", False) or not hasattr(user, "has_permission"):
+        return frozenset()
+
+    # only users of the auth contrib carry permissions
+    from unfazed.contrib.auth.resolver import permission_resolver
+
+    return await permission_resolver.resolve(user)
+
+
 class BaseAdmin:
     help_text: str = ""
 
@@ -62,6 +73,41 @@ class BaseAdmin:
     ) -> bool:
         return request.user.is_superuser == 1
 
+    def check_view_perm(
+        self, request: HttpRequest, permissions: t.AbstractSet[str]
+    ) -> bool | None:
+        """
+        Decide view access from the preloaded permission set of the user.
+
+        Must agree with `has_view_perm`, return None to let
+        `batch_view_perm` await `has_view_perm` instead.
+        """
+        if type(self).has_view_perm is not BaseAdmin.has_view_perm:
+            return None
+        return request.user.is_superuser == 1
+
+    @classmethod
+    async def batch_view_perm(
+        cls, request: HttpRequest, admins: t.Iterable["BaseAdmin"]
+    ) -> t.Dict[str, bool]:
+        """
+        View access of many admins, keyed by admin name.
+
+        The permission set of the user is resolved once and every admin
+        is decided from it, only admins with a custom `has_view_perm`
+        and no matching `check_view_perm` are awaited one by one.
+        """
+        permissions = await load_permissions(request)
+
+        ret: t.Dict[str, bool] = {}
+        for admin_ins in admins:
+            granted = admin_ins.check_view_perm(request, permissions)
+            if granted is None:
+                granted = await admin_ins.has_view_perm(request)
+            ret[admin_ins.name] = granted
+
+        return ret
+
     async def has_change_perm(
         self, request: HttpRequest, *args: t.Any, **kw: t.Any
     ) -> bool:
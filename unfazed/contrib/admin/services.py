@@ -2,11 +2,13 @@ import inspect
 import typing as t
 
 from pydantic import BaseModel
-from starlette.concurrency import run_in_threadpool
 from tortoise import Model as TModel
 from tortoise.transactions import in_transaction
 
+from unfazed.concurrency import run_in_executor, run_in_threadpool
+from unfazed.conf import settings
 from unfazed.contrib.admin.registry.schema import AdminSite
+from unfazed.contrib.admin.settings import UnfazedContribAdminSettings
 from unfazed.exception import PermissionDenied
 from unfazed.http import HttpRequest
 from unfazed.schema import AdminRoute, Condition, Result
@@ -18,6 +20,7 @@ from .registry import (
     AdminCustomSerializeModel,
     AdminInlineSerializeModel,
     AdminSerializeModel,
+    BaseAdmin,
     CustomAdmin,
     ModelAdmin,
     ModelInlineAdmin,
@@ -27,21 +30,45 @@ from .registry import (
 )
 from .schema import Action
 
+MAX_ROUTE_CACHE = 256
+
 
 class IdSchema(BaseModel):
     id: int = 0
 
 
 class AdminModelService:
+    # route trees keyed by the admins a user may view, a set of
+    # permissions maps to the same tree for every user holding it
+    _route_cache: t.ClassVar[t.Dict[t.Tuple[str, ...], t.List[AdminRoute]]] = {}
+    _route_cache_version: t.ClassVar[int] = -1
+
     @classmethod
     async def list_route(cls, request: HttpRequest) -> t.List[AdminRoute]:
-        temp = {}
+        admins = [admin_ins for _, admin_ins in admin_collector]
+        granted = await BaseAdmin.batch_view_perm(request, admins)
+        visible = tuple(name for name, ok in granted.items() if ok)
 
-        admin_ins: t.Union[ModelAdmin, ModelInlineAdmin, CustomAdmin]
-        for _, admin_ins in admin_collector:
-            if not await admin_ins.has_view_perm(request):
-                continue
+        if cls._route_cache_version != admin_collector.version:
+            cls._route_cache.clear()
+            cls._route_cache_version = admin_collector.version
+
+        routes = cls._route_cache.get(visible)
+        if routes is None:
+            routes = cls.build_route([admin_collector[name] for name in visible])
+            if len(cls._route_cache) >= MAX_ROUTE_CACHE:
+                cls._route_cache.clear()
+            cls._route_cache[visible] = routes
 
+        return routes
+
+    @classmethod
+    def build_route(
+        cls, admins: t.Sequence[t.Union[ModelAdmin, ModelInlineAdmin, CustomAdmin]]
+    ) -> t.List[AdminRoute]:
+        temp = {}
+
+        for admin_ins in admins:
             route = admin_ins.to_route()
 
             if not route:
@@ -151,6 +178,17 @@ class AdminModelService:
         )
         if inspect.iscoroutinefunction(method):
             return await method(ctx=ctx)
+
+        try:
+            admin_settings: UnfazedContribAdminSettings = settings[
+                "UNFAZED_CONTRIB_ADMIN_SETTINGS"
+            ]
+        except KeyError:
+            executor = None
+        else:
+            executor = admin_settings.actionExecutor
+        if executor is not None:
+            return await run_in_executor(executor, method, ctx=ctx)
         return await run_in_threadpool(method, ctx=ctx)
 
     @classmethod
@@ -203,7 +241,6 @@ class AdminModelService:
 
         serializer_cls: t.Type[Serializer] = admin_ins.serializer
         _wait_save: t.List[Serializer] = []
-        saved_inses: t.List[TModel] = []
 
         for item in data:
             _validated_item = serializer_cls.model_validate(item)
@@ -214,17 +251,36 @@ class AdminModelService:
             serializers=_wait_save, request=request
         )
 
-        async with in_transaction() as connection:
-            for serializer in _wait_save:
-                idschema = IdSchema.model_validate(serializer.model_dump())
-                if idschema.id > 0:
-                    current_db_ins = await serializer_cls.get_object(idschema)
-                    db_ins = await serializer.update(
-                        current_db_ins, using_db=connection
-                    )
-                else:
-                    db_ins = await serializer.create(using_db=connection)
-                saved_inses.append(db_ins)
+        is_update: t.List[bool] = [
+            IdSchema.model_validate(serializer.model_dump()).id > 0
+            for serializer in _wait_save
+        ]
+        to_update = [s for s, flag in zip(_wait_save, is_update) if flag]
+        to_create = [s for s, flag in zip(_wait_save, is_update) if not flag]
+
+        # name the connection explicitly, replicas make the setup multi-db
+        connection_name = serializer_cls.Meta.model._meta.default_connection
+        async with in_transaction(connection_name) as connection:
+            updated_inses = await serializer_cls.bulk_update_from_ctx(
+                to_update, using_db=connection
+            )
+            created_inses = await serializer_cls.bulk_create_from_ctx(
+                to_create, using_db=connection
+            )
+
+        # writes in a transaction invalidate nothing on their own, drop
+        # cached permissions of rbac models now that they are committed
+        model = serializer_cls.Meta.model
+        if model.__module__.startswith("unfazed.contrib.auth."):
+            from unfazed.contrib.auth.signals import invalidate_permissions
+
+            await invalidate_permissions(model)
+
+        # keep the order of the incoming data
+        updated_iter, created_iter = iter(updated_inses), iter(created_inses)
+        saved_inses: t.List[TModel] = [
+            next(updated_iter) if flag else next(created_iter) for flag in is_update
+        ]
 
         # trigger after save
         await admin_ins.batch_after_save(instances=saved_inses, request=request)
@@ -70,3 +70,23 @@ class UnfazedContribAdminSettings(BaseModel):
         alias="WEBSITE_PREFIX",
         description="website prefix of this admin site",
     )
+    auditQueueSize: int = Field(
+        default=10000,
+        alias="AUDIT_QUEUE_SIZE",
+        description="max admin log entries waiting to be written by AuditFlusher",
+    )
+    auditBatchSize: int = Field(
+        default=100,
+        alias="AUDIT_BATCH_SIZE",
+        description="admin log entries written per bulk insert",
+    )
+    auditFlushInterval: float = Field(
+        default=1.0,
+        alias="AUDIT_FLUSH_INTERVAL",
+        description="seconds an admin log entry may wait for its batch to fill",
+    )
+    actionExecutor: str | None = Field(
+        default=None,
+        alias="ACTION_EXECUTOR",
+        description="thread executor from settings.EXECUTORS running sync admin actions, the shared threadpool if not set",
+    )
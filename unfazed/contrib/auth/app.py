@@ -3,4 +3,9 @@ from unfazed.app import BaseAppConfig
 
 class AppConfig(BaseAppConfig):
     async def ready(self) -> None:
-        pass
+        # register the signals that invalidate cached permissions and users
+        from . import signals  # noqa: F401
+        from .models import AbstractUser
+        from .proxy import connect_user_cache
+
+        connect_user_cache(AbstractUser.UserCls())
@@ -1,28 +1,31 @@
+import hmac
 import typing as t
 
+from unfazed.conf import settings
 from unfazed.contrib.auth.backends import BaseAuthBackend
+from unfazed.contrib.auth.hashers import BasePasswordHasher, load_hasher
 from unfazed.contrib.auth.models import AbstractUser
 from unfazed.contrib.auth.schema import LoginCtx, RegisterCtx
+from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
 from unfazed.exception import AccountExisted, AccountNotFound, WrongPassword
 
 
 class DefaultAuthBackend(BaseAuthBackend):
+    def __init__(self, options: t.Dict | None = None) -> None:
+        super().__init__(options)
+        auth_setting: UnfazedContribAuthSettings = settings[
+            "UNFAZED_CONTRIB_AUTH_SETTINGS"
+        ]
+        self.hasher: BasePasswordHasher | None = load_hasher(
+            auth_setting.PASSWORD_HASHER, auth_setting.PASSWORD_HASHER_EXECUTOR
+        )
+
     @property
     def alias(self) -> str:
         return "default"
 
     async def login(self, ctx: LoginCtx) -> t.Tuple[t.Dict, t.Any]:
-        # get user
-        account, password = ctx.account, ctx.password
-        UserCls: t.Type[AbstractUser] = AbstractUser.UserCls()
-
-        has_account = await UserCls.filter(account=account)
-        if not has_account:
-            raise AccountNotFound(f"{account} not found")
-
-        user = await UserCls.get_or_none(account=account, password=password)
-        if not user:
-            raise WrongPassword("Please Check your password")
+        user = await self.authenticate(ctx)
 
         # build session info
         session_info = await self.session_info(user, ctx)
@@ -32,6 +35,19 @@ class DefaultAuthBackend(BaseAuthBackend):
 
         return session_info, resp
 
+    async def authenticate(self, ctx: LoginCtx) -> AbstractUser:
+        account, password = ctx.account, ctx.password
+        UserCls: t.Type[AbstractUser] = AbstractUser.UserCls()
+
+        user = await UserCls.get_or_none(account=account)
+        if not user:
+            raise AccountNotFound(f"{account} not found")
+
+        if not await self.check_password(user, password):
+            raise WrongPassword("Please Check your password")
+
+        return user
+
     async def register(self, ctx: RegisterCtx) -> t.Any:
         account, password = ctx.account, ctx.password
         email = ctx.extra.get("email", "")
@@ -45,10 +61,28 @@ class DefaultAuthBackend(BaseAuthBackend):
         if not password:
             raise WrongPassword("password cannot be empty")
 
+        if self.hasher is not None:
+            password = await self.hasher.aencode(password)
+
         await UserCls.create(account=account, password=password, email=email)
 
         return {}
 
+    async def check_password(self, user: AbstractUser, password: str) -> bool:
+        hasher = self.hasher
+        if hasher is None:
+            return hmac.compare_digest(password.encode(), user.password.encode())
+
+        if not await hasher.averify(password, user.password):
+            return False
+
+        # rows written before the hasher was enabled are hashed on login
+        if hasher.needs_upgrade(user.password):
+            user.password = await hasher.aencode(password)
+            await user.save(update_fields=["password"])
+
+        return True
+
     async def session_info(
         self, user: AbstractUser, ctx: LoginCtx
     ) -> t.Dict[str, t.Any]:
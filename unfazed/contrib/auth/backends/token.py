@@ -0,0 +1,49 @@
+import typing as t
+
+from unfazed.contrib.auth.backends.default import DefaultAuthBackend
+from unfazed.contrib.auth.schema import LoginCtx
+from unfazed.contrib.auth.tokens import token_manager
+
+
+class TokenAuthBackend(DefaultAuthBackend):
+    """
+    Account / password login that answers with a bearer token.
+
+    The token carries the session info of the user as claims, so
+    `TokenAuthenticationMiddleware` can build `request.user` without a
+    session or a database read.
+
+    ```python
+
+    UNFAZED_CONTRIB_AUTH_SETTINGS = {
+        "USER_MODEL": "myapp.models.User",
+        "TOKEN_SECRETS": ["secret"],
+        "BACKENDS": {
+            "token": {
+                "BACKEND_CLS": "unfazed.contrib.auth.backends.token.TokenAuthBackend",
+            },
+        },
+    }
+
+    ```
+
+    Log in with `"platform": "token"`.
+    """
+
+    @property
+    def alias(self) -> str:
+        return "token"
+
+    async def login(self, ctx: LoginCtx) -> t.Tuple[t.Dict, t.Any]:
+        user = await self.authenticate(ctx)
+        session_info = await self.session_info(user, ctx)
+
+        expires_in = token_manager.setting.TOKEN_EXPIRE
+        token = token_manager.issue({"sub": user.id, **session_info}, expires_in)
+        resp = {
+            "access_token": token,
+            "token_type": "bearer",
+            "expires_in": expires_in,
+        }
+
+        return session_info, resp
@@ -5,6 +5,8 @@ from functools import wraps
 from unfazed.exception import LoginRequired, PermissionDenied
 from unfazed.http import HttpRequest, HttpResponse
 
+from .middleware import aget_user
+
 
 def login_required(func: t.Callable) -> t.Callable:
     """
@@ -33,7 +35,7 @@ def login_required(func: t.Callable) -> t.Callable:
     async def asyncwrapper(
         request: HttpRequest, *args: t.Any, **kwargs: t.Any
     ) -> HttpResponse:
-        if not request.user:
+        if not await aget_user(request):
             raise LoginRequired()
 
         return await func(request, *args, **kwargs)
@@ -75,7 +77,8 @@ def permission_required(perm: str) -> t.Callable:
         async def asyncwrapper(
             request: HttpRequest, *args: t.Any, **kwargs: t.Any
         ) -> HttpResponse:
-            if not await request.user.has_permission(perm):
+            user = await aget_user(request)
+            if not await user.has_permission(perm):
                 raise PermissionDenied(f"Permission {perm} is required")
 
             if inspect.iscoroutinefunction(func):
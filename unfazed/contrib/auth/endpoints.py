@@ -17,7 +17,10 @@ async def login(
     auth_settings: UnfazedContribAuthSettings = settings[
         "UNFAZED_CONTRIB_AUTH_SETTINGS"
     ]
-    session_info, ret = await a_s.login(ctx)
+    client = request.client.host if request.client else None
+    session_info, ret = await a_s.login(ctx, client)
+    # a session deferred by LAZY_LOAD may need I/O to load
+    await request.session.aload()
     request.session[auth_settings.SESSION_KEY] = session_info
     return JsonResponse(s.LoginSucceedResponse(data=ret))
 
@@ -30,6 +33,7 @@ async def logout(
         "UNFAZED_CONTRIB_AUTH_SETTINGS"
     ]
 
+    await request.session.aload()
     if auth_settings.SESSION_KEY not in request.session:
         return JsonResponse(s.LogoutSucceedResponse(data={}))
     else:
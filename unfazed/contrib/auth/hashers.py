@@ -0,0 +1,100 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import typing as t
+from abc import ABC, abstractmethod
+
+from unfazed.concurrency import run_in_executor, run_in_threadpool
+from unfazed.utils import import_string
+
+
+class BasePasswordHasher(ABC):
+    """
+    Hash and verify passwords stored in `AbstractUser.password`.
+
+    Encoded passwords start with `{algorithm}$`, values without that
+    prefix are treated as legacy plaintext rows, see `needs_upgrade`.
+
+    The key derivation is deliberately slow, `aencode` and `averify`
+    run it in the `executor` from `EXECUTORS`, or the shared threadpool
+    if it is None, so the event loop keeps serving requests.
+    """
+
+    algorithm: str
+    executor: str | None = None
+
+    @abstractmethod
+    def encode(self, password: str, salt: str | None = None) -> str: ...
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool: ...
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith(f"{self.algorithm}$")
+
+    def needs_upgrade(self, encoded: str) -> bool:
+        return not self.identify(encoded)
+
+    async def aencode(self, password: str) -> str:
+        if self.executor is not None:
+            return await run_in_executor(self.executor, self.encode, password)
+        return await run_in_threadpool(self.encode, password)
+
+    async def averify(self, password: str, encoded: str) -> bool:
+        if not self.identify(encoded):
+            # legacy plaintext row, cheap enough to compare inline
+            return hmac.compare_digest(password.encode(), encoded.encode())
+        if self.executor is not None:
+            return await run_in_executor(self.executor, self.verify, password, encoded)
+        return await run_in_threadpool(self.verify, password, encoded)
+
+
+class PBKDF2PasswordHasher(BasePasswordHasher):
+    """
+    PBKDF2-HMAC-SHA256, encoded as `pbkdf2_sha256$iterations$salt$hash`.
+
+    `hashlib.pbkdf2_hmac` releases the GIL, so concurrent logins use
+    several cores from the threadpool. Subclass and change `iterations`
+    to tune the cost, existing hashes keep their own iteration count.
+    """
+
+    algorithm = "pbkdf2_sha256"
+    iterations = 600000
+    digest = "sha256"
+
+    def encode(self, password: str, salt: str | None = None) -> str:
+        salt = salt or secrets.token_urlsafe(16)
+        return self._encode(password, salt, self.iterations)
+
+    def _encode(self, password: str, salt: str, iterations: int) -> str:
+        dk = hashlib.pbkdf2_hmac(
+            self.digest, password.encode(), salt.encode(), iterations
+        )
+        hash_str = base64.b64encode(dk).decode("ascii")
+        return f"{self.algorithm}${iterations}${salt}${hash_str}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            algorithm, iterations, salt, _ = encoded.split("$", 3)
+            rounds = int(iterations)
+        except ValueError:
+            return False
+        if algorithm != self.algorithm:
+            return False
+
+        expected = self._encode(password, salt, rounds)
+        return hmac.compare_digest(expected.encode(), encoded.encode())
+
+
+def load_hasher(
+    path: str | None, executor: str | None = None
+) -> BasePasswordHasher | None:
+    if path is None:
+        return None
+
+    hasher_cls: t.Type[BasePasswordHasher] = import_string(path)
+    hasher = hasher_cls()
+    if executor is not None:
+        hasher.executor = executor
+    return hasher
@@ -1,40 +1,115 @@
 import typing as t
+from functools import partial
 
 from unfazed.conf import settings
 from unfazed.contrib.auth.models import AbstractUser
+from unfazed.contrib.auth.proxy import SessionUser
 from unfazed.contrib.auth.settings import UnfazedContribAuthSettings
-from unfazed.type import ASGIApp, Receive, Scope, Send
+from unfazed.contrib.auth.tokens import token_manager
+from unfazed.exception import InvalidToken
+from unfazed.http import HttpRequest
+from unfazed.middleware.hooks import HookMiddleware
+from unfazed.type import ASGIApp, Receive, Scope
 
 if t.TYPE_CHECKING:
     from unfazed.contrib.session.backends.base import SessionBase  # pragma: no cover
 
 
-class AuthenticationMiddleware:
+class AuthenticationMiddleware(HookMiddleware):
+    """
+    Set `request.user` from the auth data in the session.
+
+    With `LAZY_USER` and a session deferred by `LAZY_LOAD`, the user is
+    resolved on first access of `request.user`, so requests that never
+    read it do not load the session. A deferred `CacheSession` needs
+    `await request.session.aload()` before that access, see `aget_user`.
+    """
+
+    scope_types = ("http", "websocket")
+
     def __init__(self, app: ASGIApp) -> None:
-        self.app = app
+        super().__init__(app)
 
         self.setting: UnfazedContribAuthSettings = settings[
             "UNFAZED_CONTRIB_AUTH_SETTINGS"
         ]
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] not in ("http", "websocket"):
-            await self.app(scope, receive, send)
-            return
-
+    async def on_request(self, scope: Scope, receive: Receive) -> None:
         if "user" in scope:
-            await self.app(scope, receive, send)
             return
 
         session: "SessionBase" = t.cast("SessionBase", scope.get("session"))
-        if session is None or (self.setting.SESSION_KEY not in session):
-            user = None
+        if session is None:
+            scope["user"] = None
+            return
+
+        if self.setting.LAZY_USER:
+            if session.deferred:
+                # read by `HttpRequest.user` on first access
+                scope["resolve_user"] = partial(self.resolve_user, session)
+            else:
+                scope["user"] = self.resolve_user(session)
+            return
 
+        await session.aload()
+        if self.setting.SESSION_KEY not in session:
+            scope["user"] = None
         else:
-            session_dict = session[self.setting.SESSION_KEY]
             UserCls = AbstractUser.UserCls()
-            user = await UserCls.from_session(session_dict)
+            scope["user"] = await UserCls.from_session(
+                session[self.setting.SESSION_KEY]
+            )
+
+    def resolve_user(self, session: "SessionBase") -> SessionUser | None:
+        if self.setting.SESSION_KEY not in session:
+            return None
+        return SessionUser(AbstractUser.UserCls(), session[self.setting.SESSION_KEY])
+
+
+async def aget_user(request: HttpRequest) -> t.Any:
+    """
+    `request.user`, after loading a session deferred by `LAZY_LOAD`.
+
+    Use it where the session may be a deferred `CacheSession`, which
+    can not be loaded on the sync access of `request.user`.
+    """
+    session = request.scope.get("session")
+    if session is not None:
+        await session.aload()
+    return request.user
+
+
+class TokenAuthenticationMiddleware(HookMiddleware):
+    """
+    Authenticate `Authorization: Bearer <token>` requests.
+
+    Tokens are verified locally by `token_manager`, `request.user` is a
+    `SessionUser` built from the token claims, so an authenticated
+    request needs neither a session nor a database read. Requests
+    without a bearer token are passed on untouched, put this middleware
+    before `AuthenticationMiddleware` to accept both. An invalid,
+    expired or revoked token sets `request.user` to None.
+    """
+
+    scope_types = ("http", "websocket")
+
+    async def on_request(self, scope: Scope, receive: Receive) -> None:
+        if "user" in scope:
+            return
 
-        scope["user"] = user
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and credentials:
+                    token = credentials.strip()
+                break
 
-        await self.app(scope, receive, send)
+        if token is not None:
+            try:
+                claims = await token_manager.verify(token)
+            except InvalidToken:
+                scope["user"] = None
+            else:
+                snapshot = {"id": claims["sub"], **claims}
+                scope["user"] = SessionUser(AbstractUser.UserCls(), snapshot)
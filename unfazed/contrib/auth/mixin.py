@@ -5,8 +5,39 @@ from unfazed.protocol import AdminAuthProtocol
 
 from .models import AbstractUser
 
+if t.TYPE_CHECKING:
+    _MixinBase = AdminAuthProtocol
+else:
+    # the empty protocol members would shadow the permission names of
+    # the admin when the mixin is listed first
+    _MixinBase = object
+
+
+class AuthMixin(_MixinBase):
+    async def has_view_perm(
+        self, request: HttpRequest, *args: t.Any, **kw: t.Any
+    ) -> bool:
+        if request.user.is_superuser == 1:
+            return True
+        return await self.has_view_permission(request)
+
+    def check_view_perm(
+        self, request: HttpRequest, permissions: t.AbstractSet[str]
+    ) -> bool | None:
+        """
+        Decide view access from the permission set preloaded by
+        `BaseAdmin.batch_view_perm`, agreeing with `has_view_perm`.
+        """
+        cls = type(self)
+        if (
+            cls.has_view_perm is not AuthMixin.has_view_perm
+            or cls.has_view_permission is not AuthMixin.has_view_permission
+        ):
+            return None
+        if request.user.is_superuser == 1:
+            return True
+        return self.view_permission in permissions
 
-class AuthMixin(AdminAuthProtocol):
     async def has_view_permission(
         self, request: HttpRequest, *args: t.Any, **kw: t.Any
     ) -> bool:
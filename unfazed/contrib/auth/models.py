@@ -9,9 +9,11 @@ from unfazed.contrib.common.base_models import (
     ForeignKeyField,
     ManyToManyField,
 )
+from unfazed.serializer.loader import load_related
 from unfazed.type import Doc
 from unfazed.utils import import_string
 
+from .resolver import permission_resolver
 from .settings import UnfazedContribAuthSettings
 
 
@@ -41,28 +43,26 @@ class AbstractUser(BaseModel):
         return user_cls
 
     async def query_roles(self) -> t.List["Role"]:
-        await self.fetch_related("roles", "groups")
+        await load_related(self, "roles", "groups")
+
+        groups = list(self.groups)
+        await load_related(groups, "roles")
 
         ret = list(self.roles)
-        for group in self.groups:
-            roles_under_group = await group.query_roles()
-            ret.extend(roles_under_group)
+        for group in groups:
+            ret.extend(group.roles)
 
         return list(set(ret))
 
     async def query_groups(self) -> t.List["Group"]:
-        await self.fetch_related("groups")
+        await load_related(self, "groups")
         return list(self.groups)
 
     async def has_permission(self, access: str) -> bool:
         if self.is_superuser:
             return True
-        roles = await self.query_roles()
-        for role in roles:
-            if await role.has_permission(access):
-                return True
 
-        return False
+        return access in await permission_resolver.resolve(self)
 
     @classmethod
     async def from_session(cls, session_dict: t.Dict[str, t.Any]) -> "AbstractUser":
@@ -86,11 +86,11 @@ class Group(BaseModel):
     roles: ManyToManyRelation["Role"]
 
     async def query_roles(self) -> t.List["Role"]:
-        await self.fetch_related("roles")
+        await load_related(self, "roles")
         return list(self.roles)
 
     async def query_users(self) -> t.List["AbstractUser"]:
-        await self.fetch_related("users")
+        await load_related(self, "users")
         return list(self.users)
 
 
@@ -177,21 +177,23 @@ class Role(BaseModel):
     )
 
     async def query_users(self) -> t.List["AbstractUser"]:
-        await self.fetch_related("users", "groups")
+        await load_related(self, "users", "groups")
+
+        groups = list(self.groups)
+        await load_related(groups, "users")
 
         ret = list(self.users)
-        for group in self.groups:
-            users_under_group = await group.query_users()
-            ret.extend(users_under_group)
+        for group in groups:
+            ret.extend(group.users)
 
         return list(set(ret))
 
     async def query_groups(self) -> t.List["Group"]:
-        await self.fetch_related("groups")
+        await load_related(self, "groups")
         return list(self.groups)
 
     async def query_permissions(self) -> t.List["Permission"]:
-        await self.fetch_related("permissions")
+        await load_related(self, "permissions")
         return list(self.permissions)
 
     async def has_permission(self, access: str) -> bool:
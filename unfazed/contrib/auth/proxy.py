@@ -0,0 +1,193 @@
+import inspect
+import typing as t
+
+from tortoise.signals import post_delete, post_save
+
+from unfazed.cache import caches
+from unfazed.conf import settings
+
+from .models import AbstractUser
+from .resolver import permission_resolver
+from .settings import UnfazedContribAuthSettings
+
+CACHE_PREFIX = "unfazed_auth_user"
+
+
+def _get_cache() -> t.Any:
+    setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+    alias = setting.USER_CACHE
+    if alias is None:
+        return None
+    if alias not in caches:
+        raise ValueError(f"SessionUser Error: cache alias {alias} not in caches")
+    return caches[alias]
+
+
+class SessionUser:
+    """
+    Lazy user built from the auth session snapshot.
+
+    Fields stored in the session by `BaseAuthBackend.session_info`
+    (`id`, `account`, `email`, `is_superuser` for the default backend)
+    are served without touching the database. The full row is only
+    fetched by `await user.load()` or when an async model method is
+    called, and it is read from `USER_CACHE` first if configured.
+    Sync methods and properties of the model need `load()` first.
+
+    `isinstance(user, UserCls)` holds, so code that checks the type of
+    `request.user` keeps working. Snapshot values are as fresh as the
+    session, fields not in the snapshot need `load()` first.
+
+    Usage:
+
+    ```python
+
+    UNFAZED_CONTRIB_AUTH_SETTINGS = {
+        "USER_MODEL": "myapp.models.User",
+        "LAZY_USER": True,
+        "USER_CACHE": "default",
+    }
+
+    request.user.account  # from the session
+    await request.user.has_permission("article.edit")  # no user query
+    user = await request.user.load()  # full model instance
+
+    ```
+    """
+
+    def __init__(
+        self, user_cls: t.Type[AbstractUser], snapshot: t.Dict[str, t.Any]
+    ) -> None:
+        fields_map = user_cls._meta.fields_map
+        object.__setattr__(self, "_user_cls", user_cls)
+        object.__setattr__(
+            self,
+            "_snapshot",
+            {k: v for k, v in snapshot.items() if k in fields_map},
+        )
+        object.__setattr__(self, "_user", None)
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> t.Type[AbstractUser]:  # type: ignore[override]
+        return self._user_cls
+
+    @property
+    def pk(self) -> t.Any:
+        return self._snapshot["id"]
+
+    @property
+    def loaded(self) -> bool:
+        return self._user is not None
+
+    async def load(self) -> AbstractUser:
+        if self._user is not None:
+            return self._user
+
+        user_cls = self._user_cls
+        cache = _get_cache()
+        key = f"{CACHE_PREFIX}:{self.pk}"
+        row = await cache.get(key) if cache is not None else None
+        if row is not None:
+            user = user_cls._init_from_db(**row)
+        else:
+            user = await user_cls.get(id=self.pk)
+            if cache is not None:
+                row = {
+                    column: getattr(user, field)
+                    for field, column in user_cls._meta.fields_db_projection.items()
+                }
+                setting: UnfazedContribAuthSettings = settings[
+                    "UNFAZED_CONTRIB_AUTH_SETTINGS"
+                ]
+                await cache.set(key, row, setting.USER_CACHE_TIMEOUT)
+
+        object.__setattr__(self, "_user", user)
+        return user
+
+    async def has_permission(self, access: str) -> bool:
+        if self._user is not None:
+            return await self._user.has_permission(access)
+        if self._snapshot.get("is_superuser"):
+            return True
+
+        return access in await permission_resolver.resolve(t.cast(AbstractUser, self))
+
+    def __getattr__(self, name: str) -> t.Any:
+        user = self._user
+        if user is not None:
+            return getattr(user, name)
+
+        snapshot = self._snapshot
+        if name in snapshot:
+            return snapshot[name]
+
+        user_cls = self._user_cls
+        if name in user_cls._meta.fields_map:
+            raise AttributeError(
+                f"{name} is not in the session snapshot, await user.load() first"
+            )
+
+        attr = inspect.getattr_static(user_cls, name)
+        if isinstance(attr, (classmethod, staticmethod)):
+            return getattr(user_cls, name)
+
+        if inspect.iscoroutinefunction(attr):
+
+            async def method(*args: t.Any, **kwargs: t.Any) -> t.Any:
+                loaded = await self.load()
+                return await getattr(loaded, name)(*args, **kwargs)
+
+            return method
+
+        if hasattr(attr, "__get__"):
+            # sync methods and properties need the model instance
+            raise AttributeError(
+                f"{name} needs the user model instance, await user.load() first"
+            )
+
+        return attr
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        user = self._user
+        if user is not None:
+            setattr(user, name, value)
+        elif name.startswith("_"):
+            # private state, e.g. the resolved permission set
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError(f"await user.load() before setting {name}")
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, self._user_cls) and getattr(other, "pk", None) == self.pk
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.pk)
+
+    def __repr__(self) -> str:
+        return f"<SessionUser {self._user_cls.__name__}: {self.pk}>"
+
+
+async def _clear_cached_user(
+    sender: t.Type[AbstractUser], instance: t.Any, *args: t.Any
+) -> None:
+    cache = _get_cache()
+    if cache is not None:
+        await cache.delete(f"{CACHE_PREFIX}:{instance.pk}")
+
+
+_connected: t.Set[t.Type[AbstractUser]] = set()
+
+
+def connect_user_cache(user_cls: t.Type[AbstractUser]) -> None:
+    """
+    Drop cached rows of `user_cls` when a user is saved or deleted.
+
+    Safe to call more than once, the listeners are registered once.
+    """
+    if user_cls in _connected:
+        return
+    _connected.add(user_cls)
+    post_save(user_cls)(_clear_cached_user)
+    post_delete(user_cls)(_clear_cached_user)
@@ -0,0 +1,121 @@
+import typing as t
+import uuid
+
+from unfazed.cache import caches
+from unfazed.conf import settings
+
+from .settings import UnfazedContribAuthSettings
+
+if t.TYPE_CHECKING:
+    from .models import AbstractUser
+
+
+class PermissionResolver:
+    """
+    Resolve the flattened permission set of a user.
+
+    The set is built from user -> roles -> permissions and
+    user -> groups -> roles -> permissions with two joined queries, then
+    cached on the user instance for the rest of the request and, when
+    `PERMISSION_CACHE` is set, in that cache alias for other requests
+    and processes.
+
+    Cache entries are keyed by a version token. Saving or deleting a
+    `UserGroup`, `UserRole`, `GroupRole`, `RolePermission` or `Permission`,
+    and deleting a `Role` or `Group`, replaces the token, which invalidates
+    every cached set at once, see `unfazed.contrib.auth.signals`. Saving a
+    `Role` or `Group` does not change any permission set. Many-to-many
+    `add()` / `remove()` calls and bulk operations bypass model signals,
+    and writes in a transaction are skipped by them, call `invalidate()`
+    after them, once committed. The admin batch save does so.
+
+    Usage:
+
+    ```python
+
+    UNFAZED_CONTRIB_AUTH_SETTINGS = {
+        "USER_MODEL": "myapp.models.User",
+        "PERMISSION_CACHE": "default",
+        "PERMISSION_CACHE_TIMEOUT": 300,
+    }
+
+    perms = await permission_resolver.resolve(user)
+    "article.edit" in perms
+
+    await user.roles.add(editor)
+    await permission_resolver.invalidate()
+
+    ```
+    """
+
+    PREFIX = "unfazed_auth_permission"
+    VERSION_KEY = "unfazed_auth_permission_version"
+    ATTR = "_unfazed_permissions"
+
+    def __init__(self) -> None:
+        # bumped on every local change, guards the per-instance cache
+        self.local_version = 0
+
+    @property
+    def setting(self) -> UnfazedContribAuthSettings:
+        return settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+
+    @property
+    def cache(self) -> t.Any:
+        alias = self.setting.PERMISSION_CACHE
+        if alias is None:
+            return None
+        if alias not in caches:
+            raise ValueError(
+                f"PermissionResolver Error: cache alias {alias} not in caches"
+            )
+        return caches[alias]
+
+    async def resolve(self, user: "AbstractUser") -> t.FrozenSet[str]:
+        cached = getattr(user, self.ATTR, None)
+        if cached is not None and cached[0] == self.local_version:
+            return cached[1]
+
+        local_version = self.local_version
+        cache = self.cache
+        if cache is None:
+            ret = await self.query(user)
+        else:
+            version = await self.get_version(cache)
+            key = f"{self.PREFIX}:{version}:{user.pk}"
+            accesses = await cache.get(key)
+            if accesses is None:
+                ret = await self.query(user)
+                await cache.set(key, sorted(ret), self.setting.PERMISSION_CACHE_TIMEOUT)
+            else:
+                ret = frozenset(accesses)
+
+        setattr(user, self.ATTR, (local_version, ret))
+        return ret
+
+    async def query(self, user: "AbstractUser") -> t.FrozenSet[str]:
+        # joined from the user model, so the resolver needs no model import
+        queryset = user.__class__.filter(id=user.pk)
+        direct = await queryset.values_list("roles__permissions__access", flat=True)
+        via_groups = await queryset.values_list(
+            "groups__roles__permissions__access", flat=True
+        )
+        return frozenset(
+            t.cast(t.List[str], [i for i in direct + via_groups if i is not None])
+        )
+
+    async def get_version(self, cache: t.Any) -> str:
+        version = await cache.get(self.VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            await cache.set(self.VERSION_KEY, version)
+        return version
+
+    async def invalidate(self) -> None:
+        self.local_version += 1
+        cache = self.cache
+        if cache is not None:
+            await cache.set(self.VERSION_KEY, uuid.uuid4().hex)
+
+
+permission_resolver = PermissionResolver()
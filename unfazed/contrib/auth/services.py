@@ -2,11 +2,13 @@ import typing as t
 
 from unfazed.conf import settings
 from unfazed.contrib.auth.backends.base import BaseAuthBackend
+from unfazed.exception import AccountNotFound, WrongPassword
 from unfazed.type import Doc
 from unfazed.utils import import_string
 
 from .schema import LoginCtx, RegisterCtx
 from .settings import UnfazedContribAuthSettings
+from .throttle import LoginThrottle
 
 
 def load_backends(
@@ -40,9 +42,23 @@ class AuthService:
 
         return self.backends[backend]
 
-    async def login(self, ctx: LoginCtx) -> t.Tuple[t.Dict, t.Any]:
+    async def login(
+        self, ctx: LoginCtx, client: str | None = None
+    ) -> t.Tuple[t.Dict, t.Any]:
         backend = self.choose_backend(ctx.platform)
-        session_info, resp = await backend.login(ctx)
+
+        throttle = LoginThrottle.from_settings()
+        if throttle is None:
+            return await backend.login(ctx)
+
+        await throttle.check(ctx.account, client)
+        try:
+            session_info, resp = await backend.login(ctx)
+        except (AccountNotFound, WrongPassword):
+            await throttle.fail(ctx.account, client)
+            raise
+
+        await throttle.reset(ctx.account)
         return session_info, resp
 
     async def logout(self, session_info: t.Dict[str, t.Any]) -> t.Any:
@@ -38,3 +38,71 @@ class UnfazedContribAuthSettings(BaseModel):
     ]
     BACKENDS: t.Dict[str, AuthBackend] = {}
     SESSION_KEY: str = "unfazed_auth_session"
+    PERMISSION_CACHE: t.Annotated[
+        str | None,
+        Doc(
+            description="cache alias for resolved permission sets, only cached per request if not set",
+            examples=["default"],
+        ),
+    ] = None
+    PERMISSION_CACHE_TIMEOUT: int = 300
+    LAZY_USER: t.Annotated[
+        bool,
+        Doc(
+            description="serve request.user from the session snapshot, the row is loaded on demand",
+        ),
+    ] = False
+    USER_CACHE: t.Annotated[
+        str | None,
+        Doc(
+            description="cache alias for user rows loaded by the lazy user",
+            examples=["default"],
+        ),
+    ] = None
+    USER_CACHE_TIMEOUT: int = 60
+    PASSWORD_HASHER: t.Annotated[
+        CanBeImported | None,
+        Doc(
+            description="password hasher class used by the default backend, passwords are stored as plaintext if not set",
+            examples=["unfazed.contrib.auth.hashers.PBKDF2PasswordHasher"],
+        ),
+    ] = None
+    PASSWORD_HASHER_EXECUTOR: t.Annotated[
+        str | None,
+        Doc(
+            description="executor from settings.EXECUTORS hashing passwords, the shared threadpool if not set",
+            examples=["hashers"],
+        ),
+    ] = None
+    LOGIN_THROTTLE_CACHE: t.Annotated[
+        str | None,
+        Doc(
+            description="cache alias counting failed logins per account and ip, no throttling if not set",
+            examples=["default"],
+        ),
+    ] = None
+    LOGIN_THROTTLE_LIMIT: int = 5
+    LOGIN_THROTTLE_WINDOW: int = 300
+    TOKEN_SECRETS: t.Annotated[
+        t.List[str],
+        Doc(
+            description="secrets for bearer tokens, the first one signs, all of them verify",
+            examples=[["new-secret", "old-secret"]],
+        ),
+    ] = []
+    TOKEN_EXPIRE: int = 3600
+    TOKEN_CACHE_SIZE: t.Annotated[
+        int,
+        Doc(description="verified tokens kept in memory per process"),
+    ] = 10000
+    TOKEN_REVOCATION_CACHE: t.Annotated[
+        str | None,
+        Doc(
+            description="cache alias holding revoked token ids, tokens can not be revoked if not set",
+            examples=["default"],
+        ),
+    ] = None
+    TOKEN_REVOCATION_SYNC: t.Annotated[
+        int,
+        Doc(description="seconds between two syncs of the revocation filter"),
+    ] = 30
@@ -0,0 +1,58 @@
+import typing as t
+
+from tortoise import Model
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.signals import post_delete, post_save
+
+from .models import (
+    Group,
+    GroupRole,
+    Permission,
+    Role,
+    RolePermission,
+    UserGroup,
+    UserRole,
+)
+from .resolver import permission_resolver
+
+# models whose rows make up the permission sets of users
+PERMISSION_MODELS: t.Tuple[t.Type[Model], ...] = (
+    UserGroup,
+    UserRole,
+    GroupRole,
+    RolePermission,
+    Permission,
+)
+
+
+async def invalidate_permissions(model: t.Type[Model]) -> None:
+    """
+    Invalidate the cached permission sets after committed writes of
+    `model` that fired no signal or ran in a transaction.
+    """
+    if issubclass(model, PERMISSION_MODELS):
+        await permission_resolver.invalidate()
+
+
+async def _invalidate(using_db: t.Any) -> None:
+    # before the commit, a concurrent reader would cache the old set
+    # again under the new token, the writer invalidates after the commit
+    if not isinstance(using_db, TransactionalDBClient):
+        await permission_resolver.invalidate()
+
+
+@post_save(*PERMISSION_MODELS)
+async def _on_save(
+    sender: t.Type[t.Any],
+    instance: t.Any,
+    created: bool,
+    using_db: t.Any,
+    update_fields: t.Any,
+) -> None:
+    await _invalidate(using_db)
+
+
+# saving a role or group does not change any permission set
+@post_delete(*PERMISSION_MODELS, Role, Group)
+async def _on_delete(sender: t.Type[t.Any], instance: t.Any, using_db: t.Any) -> None:
+    await _invalidate(using_db)
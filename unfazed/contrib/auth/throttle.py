@@ -0,0 +1,75 @@
+import typing as t
+
+from unfazed.cache import caches
+from unfazed.conf import settings
+from unfazed.exception import TooManyAttempts
+
+from .settings import UnfazedContribAuthSettings
+
+
+class LoginThrottle:
+    """
+    Count failed logins per account and per client ip in a cache.
+
+    Once either counter reaches `LOGIN_THROTTLE_LIMIT` within
+    `LOGIN_THROTTLE_WINDOW` seconds, `check` raises `TooManyAttempts`
+    before the user table or the password hasher is touched. A
+    successful login resets the account counter, the ip counter only
+    expires, so one client can not cycle through many accounts.
+
+    Usage:
+
+    ```python
+
+    UNFAZED_CONTRIB_AUTH_SETTINGS = {
+        "USER_MODEL": "myapp.models.User",
+        "LOGIN_THROTTLE_CACHE": "default",
+        "LOGIN_THROTTLE_LIMIT": 5,
+        "LOGIN_THROTTLE_WINDOW": 300,
+    }
+
+    ```
+    """
+
+    PREFIX = "unfazed_auth_login"
+
+    def __init__(self, cache: t.Any, limit: int, window: int) -> None:
+        self.cache = cache
+        self.limit = limit
+        self.window = window
+
+    @classmethod
+    def from_settings(cls) -> t.Optional["LoginThrottle"]:
+        setting: UnfazedContribAuthSettings = settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+        alias = setting.LOGIN_THROTTLE_CACHE
+        if alias is None:
+            return None
+        if alias not in caches:
+            raise ValueError(f"LoginThrottle Error: cache alias {alias} not in caches")
+
+        return cls(
+            caches[alias], setting.LOGIN_THROTTLE_LIMIT, setting.LOGIN_THROTTLE_WINDOW
+        )
+
+    def make_keys(self, account: str, client: str | None) -> t.List[str]:
+        keys = [f"{self.PREFIX}:account:{account}"]
+        if client:
+            keys.append(f"{self.PREFIX}:ip:{client}")
+        return keys
+
+    async def check(self, account: str, client: str | None = None) -> None:
+        for key in self.make_keys(account, client):
+            count = await self.cache.get(key)
+            if count is not None and count >= self.limit:
+                raise TooManyAttempts()
+
+    async def fail(self, account: str, client: str | None = None) -> None:
+        for key in self.make_keys(account, client):
+            # the first failure opens the window, later ones keep its ttl
+            if await self.cache.get(key) is None:
+                await self.cache.set(key, 1, self.window)
+            else:
+                await self.cache.incr(key)
+
+    async def reset(self, account: str) -> None:
+        await self.cache.delete(f"{self.PREFIX}:account:{account}")
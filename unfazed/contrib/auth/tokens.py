@@ -0,0 +1,245 @@
+import base64
+import binascii
+import functools
+import hashlib
+import hmac
+import math
+import time
+import typing as t
+import uuid
+from collections import OrderedDict
+
+import orjson as json
+
+from unfazed.cache import caches
+from unfazed.conf import settings
+from unfazed.exception import InvalidToken
+
+from .settings import UnfazedContribAuthSettings
+
+
+def b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+@functools.lru_cache(maxsize=8)
+def keyring(secrets: t.Tuple[str, ...]) -> t.Tuple[str, t.Dict[str, bytes]]:
+    """
+    Signing key id and all verification keys, keyed by id.
+
+    The id of a key is derived from the secret, so tokens name the key
+    they were signed with and verification never tries every key.
+    """
+    keys = {}
+    for secret in secrets:
+        key = secret.encode("utf-8")
+        kid = hashlib.blake2b(key, digest_size=4, person=b"unfazed:token").hexdigest()
+        keys[kid] = key
+    return next(iter(keys)), keys
+
+
+class BloomFilter:
+    """
+    Fixed size bloom filter, `in` may return false positives but never
+    false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = size
+        self.hashes = max(1, round(size / capacity * math.log(2)))
+        self.bits = bytearray((size + 7) // 8)
+
+    def _positions(self, item: str) -> t.Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenManager:
+    """
+    Issue and verify stateless bearer tokens.
+
+    Tokens are JWTs signed with HS256. The first of `TOKEN_SECRETS`
+    signs, all of them verify, the `kid` header picks the key, so
+    secrets can be rotated by prepending a new one.
+
+    Verified claims are kept in a bounded LRU keyed by the sha256 of
+    the token, a repeated token costs one dict lookup. With
+    `TOKEN_REVOCATION_CACHE`, revoked token ids are stored in a cache
+    hash. Every process syncs them into a local bloom filter at most
+    once per `TOKEN_REVOCATION_SYNC` seconds and only asks the cache
+    about tokens the filter reports, so valid tokens are checked
+    without a cache read. A revocation is seen by other processes
+    after their next sync.
+
+    Usage:
+
+    ```python
+
+    UNFAZED_CONTRIB_AUTH_SETTINGS = {
+        "USER_MODEL": "myapp.models.User",
+        "TOKEN_SECRETS": ["new-secret", "old-secret"],
+        "TOKEN_REVOCATION_CACHE": "default",
+    }
+
+    token = token_manager.issue({"sub": user.id, "id": user.id})
+    claims = await token_manager.verify(token)
+    await token_manager.revoke(token)
+
+    ```
+    """
+
+    REVOKED_KEY = "unfazed_auth_token_revoked"
+
+    def __init__(self) -> None:
+        self.verified: t.OrderedDict[bytes, t.Dict[str, t.Any]] = OrderedDict()
+        # secrets the verified tokens were checked against
+        self.secrets: t.Tuple[str, ...] = ()
+        self.bloom: BloomFilter | None = None
+        self.synced_at = 0.0
+
+    @property
+    def setting(self) -> UnfazedContribAuthSettings:
+        return settings["UNFAZED_CONTRIB_AUTH_SETTINGS"]
+
+    @property
+    def revocation_cache(self) -> t.Any:
+        alias = self.setting.TOKEN_REVOCATION_CACHE
+        if alias is None:
+            return None
+        if alias not in caches:
+            raise ValueError(f"TokenManager Error: cache alias {alias} not in caches")
+        return caches[alias]
+
+    def get_keyring(self) -> t.Tuple[str, t.Dict[str, bytes]]:
+        secrets = tuple(self.setting.TOKEN_SECRETS)
+        if not secrets:
+            raise ValueError("TokenManager Error: TOKEN_SECRETS is empty")
+        if secrets != self.secrets:
+            # a retired secret must not keep its tokens alive
+            self.verified.clear()
+            self.secrets = secrets
+        return keyring(secrets)
+
+    def issue(self, claims: t.Dict[str, t.Any], expires_in: int | None = None) -> str:
+        kid, keys = self.get_keyring()
+        now = int(time.time())
+        if expires_in is None:
+            expires_in = self.setting.TOKEN_EXPIRE
+
+        payload = {"iat": now, "exp": now + expires_in, "jti": uuid.uuid4().hex}
+        payload.update(claims)
+
+        header = b64encode(json.dumps({"alg": "HS256", "typ": "JWT", "kid": kid}))
+        signing_input = header + b"." + b64encode(json.dumps(payload))
+        signature = hmac.new(keys[kid], signing_input, hashlib.sha256).digest()
+        return (signing_input + b"." + b64encode(signature)).decode("ascii")
+
+    def decode(self, token: str) -> t.Dict[str, t.Any]:
+        try:
+            raw = token.encode("ascii")
+            signing_input, signature = raw.rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".")
+            header = json.loads(b64decode(header_segment))
+            mac = b64decode(signature)
+        except (UnicodeEncodeError, ValueError, binascii.Error):
+            raise InvalidToken("malformed token")
+
+        _, keys = self.get_keyring()
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            raise InvalidToken("unsupported algorithm")
+        key = keys.get(header.get("kid", ""))
+        if key is None:
+            raise InvalidToken("unknown signing key")
+
+        expected = hmac.new(key, signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, mac):
+            raise InvalidToken("bad signature")
+
+        try:
+            claims = json.loads(b64decode(payload_segment))
+        except (ValueError, binascii.Error):
+            raise InvalidToken("malformed token")
+
+        if not isinstance(claims, dict) or "exp" not in claims:
+            raise InvalidToken("malformed token")
+        if claims["exp"] <= time.time():
+            raise InvalidToken("token expired")
+
+        return claims
+
+    async def verify(self, token: str) -> t.Dict[str, t.Any]:
+        self.get_keyring()
+        digest = hashlib.sha256(token.encode("utf-8", "surrogatepass")).digest()
+        verified = self.verified
+        claims = verified.get(digest)
+        if claims is None:
+            claims = self.decode(token)
+            verified[digest] = claims
+            if len(verified) > self.setting.TOKEN_CACHE_SIZE:
+                verified.popitem(last=False)
+        elif claims["exp"] <= time.time():
+            del verified[digest]
+            raise InvalidToken("token expired")
+        else:
+            verified.move_to_end(digest)
+
+        cache = self.revocation_cache
+        if cache is not None and await self.is_revoked(cache, claims):
+            raise InvalidToken("token revoked")
+
+        return claims
+
+    async def is_revoked(self, cache: t.Any, claims: t.Dict[str, t.Any]) -> bool:
+        if time.time() - self.synced_at >= self.setting.TOKEN_REVOCATION_SYNC:
+            await self.sync(cache)
+
+        jti = claims.get("jti")
+        if jti is None or self.bloom is None or jti not in self.bloom:
+            return False
+        # the filter may be wrong, the cache is not
+        return await cache.hget(self.REVOKED_KEY, jti) is not None
+
+    async def sync(self, cache: t.Any) -> None:
+        revoked: t.Dict[str, int] = await cache.hgetall(self.REVOKED_KEY)
+        now = time.time()
+        expired = [jti for jti, exp in revoked.items() if exp <= now]
+        if expired:
+            await cache.hdel(self.REVOKED_KEY, *expired)
+
+        live = [jti for jti, exp in revoked.items() if exp > now]
+        # leave room for revocations made locally until the next sync
+        bloom = BloomFilter(max(len(live) * 2, 1024))
+        for jti in live:
+            bloom.add(jti)
+        self.bloom = bloom
+        self.synced_at = now
+
+    async def revoke(self, token: str) -> None:
+        claims = self.decode(token)
+        cache = self.revocation_cache
+        if cache is None:
+            raise ValueError("TokenManager Error: TOKEN_REVOCATION_CACHE is not set")
+
+        await cache.hset(self.REVOKED_KEY, mapping={claims["jti"]: claims["exp"]})
+        if self.bloom is not None:
+            self.bloom.add(claims["jti"])
+
+
+token_manager = TokenManager()
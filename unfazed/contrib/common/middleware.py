@@ -1,10 +1,10 @@
 from unfazed.contrib.common.schema import ErrorResponse
 from unfazed.http import JsonResponse
-from unfazed.middleware import BaseMiddleware
-from unfazed.type import Receive, Scope, Send
+from unfazed.middleware import HookMiddleware
+from unfazed.type import Scope
 
 
-class CommonMiddleware(BaseMiddleware):
+class CommonMiddleware(HookMiddleware):
     """
     Contrib CommonMiddleware used for contrib/admin and contrib/auth.
 
@@ -39,23 +39,15 @@ class CommonMiddleware(BaseMiddleware):
 
     """
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        try:
-            await self.app(scope, receive, send)
-        except Exception as err:
-            if hasattr(err, "code"):
-                code = err.code
-            else:
-                code = 500
-
-            if hasattr(err, "message"):
-                message = err.message
-            else:
-                message = str(err)
-
-            response = JsonResponse(ErrorResponse(code=code, message=message))
-            await response(scope, receive, send)
+    async def on_exception(self, scope: Scope, exc: Exception) -> JsonResponse:
+        if hasattr(exc, "code"):
+            code = exc.code
+        else:
+            code = 500
+
+        if hasattr(exc, "message"):
+            message = exc.message
+        else:
+            message = str(exc)
+
+        return JsonResponse(ErrorResponse(code=code, message=message))
@@ -20,34 +20,75 @@ class SessionBase(ABC):
         self.session_key: str | None = session_key
         self.modified = False
         self.accessed = False
+        # set by SessionMiddleware when `LAZY_LOAD` is enabled,
+        # the data is loaded on first access instead of per request
+        self.deferred = False
+        # set by engines that extended the session ttl without saving,
+        # the middleware then re-sends the cookie
+        self.refreshed = False
 
         self._session: t.Dict[
             str, t.Annotated[t.Any, Doc(description="can be dumpable")]
         ] = {}
 
     def __contains__(self, key: str) -> bool:
+        self.ensure_loaded()
         return key in self._session
 
     def __getitem__(self, key: str) -> t.Any:
+        self.ensure_loaded()
         self.accessed = True
         return self._session[key]
 
     def __setitem__(self, key: str, value: t.Any) -> None:
+        self.ensure_loaded()
         self._session[key] = value
         self.modified = True
 
     def __delitem__(self, key: str) -> None:
+        self.ensure_loaded()
         if key in self._session:
             del self._session[key]
         self.modified = True
 
     def __bool__(self) -> bool:
+        self.ensure_loaded()
         return bool(self._session)
 
     async def delete(self) -> None:
+        # nothing to load, the data is dropped anyway
+        self.deferred = False
         self._session = {}
         self.modified = True
 
+    async def aload(self) -> None:
+        """
+        Load a deferred session, a no-op if it is already loaded.
+
+        Engines that need I/O to load, like `CacheSession`, must be
+        loaded this way before the first access when `LAZY_LOAD` is on.
+        """
+        if self.deferred:
+            self.deferred = False
+            await self.load()
+
+    def ensure_loaded(self) -> None:
+        if self.deferred:
+            # stays deferred if it can not be loaded on access
+            self.load_sync()
+            self.deferred = False
+
+    def load_sync(self) -> None:
+        """
+        Load the session without awaiting, used on first access of a
+        deferred session. Only engines that decode the cookie itself can
+        support it.
+        """
+        raise RuntimeError(
+            f"{self.__class__.__name__} can not be loaded on access, "
+            "call `await request.session.aload()` first"
+        )
+
     def get_max_age(self) -> int:
         return self.setting.cookie_max_age
 
@@ -1,15 +1,38 @@
 import time
+import typing as t
 import uuid
+from collections import OrderedDict
 
 from unfazed.cache import caches
 from unfazed.contrib.session.settings import SessionSettings
 
 from .base import SessionBase
 
+# sessions whose ttl this process refreshed recently, bounded so that
+# a burst of unique sessions can not grow it forever
+MAX_REFRESHED = 10000
+
 
 class CacheSession(SessionBase):
+    """
+    Session stored in a cache backend, the cookie only carries the key.
+
+    `CACHE_STORAGE` selects the layout:
+
+    - `blob`: the whole dict is stored under one key and rewritten on save.
+    - `hash`: every session key is a field of a hash, saving only writes
+      the fields that were set or deleted. The backend must support
+      `hset`, `hgetall` and `hdel`, e.g. `SerializerBackend`.
+
+    With `SLIDING_EXPIRY`, loading a session extends its ttl with
+    `expire` instead of a rewrite, at most once per `SLIDING_INTERVAL`
+    seconds per session and process.
+    """
+
     PREFIX = "cachesession:"
 
+    _refreshed: t.ClassVar[t.OrderedDict[str, float]] = OrderedDict()
+
     def __init__(
         self, session_setting: SessionSettings, session_key: str | None = None
     ) -> None:
@@ -26,6 +49,26 @@ class CacheSession(SessionBase):
             )
 
         self.client = caches[_cache_alias]
+        self.hash_storage = session_setting.cache_storage == "hash"
+
+        # fields changed since load, only used by hash storage
+        self._changed: t.Set[str] = set()
+        self._deleted: t.Set[str] = set()
+        self._rewrite = False
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        super().__setitem__(key, value)
+        self._changed.add(key)
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._changed.discard(key)
+        self._deleted.add(key)
+
+    async def delete(self) -> None:
+        await super().delete()
+        self._rewrite = True
 
     def generate_session_key(self) -> str:
         """
@@ -39,25 +82,62 @@ class CacheSession(SessionBase):
         return f"{self.PREFIX}{timestamp}:{uuid_hex_str1}:{uuid_hex_str2}"
 
     async def save(self) -> None:
+        created = not self.session_key
         if not self.session_key:
             self.session_key = self.generate_session_key()
 
         if not self._session:
             await self.client.delete(self.session_key)
 
-        else:
+        elif not self.hash_storage:
             await self.client.set(self.session_key, self._session, self.get_max_age())
 
+        else:
+            if self._rewrite and not created:
+                await self.client.delete(self.session_key)
+            if created or self._rewrite:
+                changed = self._session
+            else:
+                changed = {k: self._session[k] for k in self._changed}
+                if self._deleted:
+                    await self.client.hdel(self.session_key, *self._deleted)
+            if changed:
+                await self.client.hset(self.session_key, mapping=changed)
+            await self.client.expire(self.session_key, self.get_max_age())
+
+        self._changed.clear()
+        self._deleted.clear()
+        self._rewrite = False
+        self.mark_refreshed(self.session_key)
+
     async def load(self) -> None:
         if not self.session_key:
             self._session = {}
             return
 
-        ret = await self.client.get(self.session_key)
+        if self.hash_storage:
+            ret = await self.client.hgetall(self.session_key)
+        else:
+            ret = await self.client.get(self.session_key)
 
         # expired or not found
         if not ret:
             self._session = {}
+            return
 
-        else:
-            self._session = ret
+        self._session = ret
+        if self.setting.sliding_expiry and self.should_refresh(self.session_key):
+            await self.client.expire(self.session_key, self.get_max_age())
+            self.mark_refreshed(self.session_key)
+            self.refreshed = True
+
+    def should_refresh(self, session_key: str) -> bool:
+        last = self._refreshed.get(session_key)
+        return last is None or time.time() - last >= self.setting.sliding_interval
+
+    def mark_refreshed(self, session_key: str) -> None:
+        refreshed = self._refreshed
+        refreshed[session_key] = time.time()
+        refreshed.move_to_end(session_key)
+        while len(refreshed) > MAX_REFRESHED:
+            refreshed.popitem(last=False)
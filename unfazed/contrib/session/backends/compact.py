@@ -0,0 +1,138 @@
+import base64
+import binascii
+import functools
+import hashlib
+import hmac
+import logging
+import struct
+import time
+import zlib
+
+import orjson as json
+
+from unfazed.contrib.session.settings import SessionSettings
+
+from .base import SessionBase
+
+logger = logging.getLogger("unfazed.middleware")
+
+# high nibble: format version, low bits: flags
+VERSION = 1
+COMPRESSED = 0x01
+DIGEST_SIZE = 16
+HEADER = struct.Struct(">BI")
+
+
+@functools.lru_cache(maxsize=32)
+def derive_key(secret: str) -> bytes:
+    return hashlib.blake2b(
+        secret.encode("utf-8"), digest_size=32, person=b"unfazed:session"
+    ).digest()
+
+
+def sign(body: bytes, key: bytes) -> bytes:
+    return hashlib.blake2b(body, key=key, digest_size=DIGEST_SIZE).digest()
+
+
+class CompactSession(SessionBase):
+    """
+    Signed cookie session with a compact binary layout.
+
+    The cookie value is url-safe base64 without padding of:
+
+        header (1 byte version/flags, 4 bytes issued-at) | payload | mac
+
+    The payload is orjson and is zlib compressed when it is at least
+    `COMPRESS_THRESHOLD` bytes and compression actually shrinks it. The
+    mac is a keyed blake2b over header and payload, signed with `SECRET`
+    and verified against `SECRET` and then `SECRET_FALLBACKS`, so secrets
+    can be rotated without logging everybody out.
+
+    Cookies of `SigningSession` are not readable by this engine,
+    switching engines starts new sessions.
+
+    ```python
+
+    UNFAZED_CONTRIB_SESSION_SETTINGS = {
+        "SECRET": "new-secret",
+        "SECRET_FALLBACKS": ["old-secret"],
+        "ENGINE": "unfazed.contrib.session.backends.compact.CompactSession",
+    }
+
+    ```
+    """
+
+    def __init__(
+        self,
+        session_setting: SessionSettings,
+        session_key: str | None = None,
+    ) -> None:
+        super().__init__(session_setting, session_key)
+        self.keys = [
+            derive_key(secret)
+            for secret in (
+                session_setting.secret_key,
+                *session_setting.secret_fallbacks,
+            )
+        ]
+
+    def generate_session_key(self) -> str:
+        if not self._session:
+            return ""
+
+        payload = json.dumps(self._session)
+        flags = VERSION << 4
+        threshold = self.setting.compress_threshold
+        if threshold is not None and len(payload) >= threshold:
+            # fastest level, payloads are a few kilobytes at most
+            compressed = zlib.compress(payload, 1)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= COMPRESSED
+
+        body = HEADER.pack(flags, int(time.time())) + payload
+        token = base64.urlsafe_b64encode(body + sign(body, self.keys[0]))
+        return token.rstrip(b"=").decode("ascii")
+
+    async def save(self) -> None:
+        self.session_key = self.generate_session_key()
+
+        self.modified = False
+
+    async def load(self) -> None:
+        self.load_sync()
+
+    def load_sync(self) -> None:
+        self._session = {}
+        if not self.session_key:
+            return
+
+        try:
+            token = self.session_key.encode("ascii")
+            raw = base64.urlsafe_b64decode(token + b"=" * (-len(token) % 4))
+        except (UnicodeEncodeError, binascii.Error, ValueError) as e:
+            logger.error(f"CompactSession Error: failed decoding {e}")
+            return
+
+        if len(raw) < HEADER.size + DIGEST_SIZE:
+            logger.error("CompactSession Error: session too short")
+            return
+
+        body, mac = raw[:-DIGEST_SIZE], raw[-DIGEST_SIZE:]
+        if not any(hmac.compare_digest(sign(body, key), mac) for key in self.keys):
+            logger.error("CompactSession Error: bad signature")
+            return
+
+        flags, issued_at = HEADER.unpack_from(body)
+        if flags >> 4 != VERSION:
+            logger.error(f"CompactSession Error: unknown version {flags >> 4}")
+            return
+
+        if time.time() - issued_at > self.get_max_age():
+            logger.error("CompactSession Error: session expired")
+            return
+
+        payload = body[HEADER.size :]
+        if flags & COMPRESSED:
+            payload = zlib.decompress(payload)
+        self._session = json.loads(payload)
@@ -39,6 +39,9 @@ class SigningSession(SessionBase):
         self.modified = False
 
     async def load(self) -> None:
+        self.load_sync()
+
+    def load_sync(self) -> None:
         if self.session_key is None:
             self._session = {}
             return
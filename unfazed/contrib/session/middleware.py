@@ -6,24 +6,31 @@ from starlette.requests import HTTPConnection
 from unfazed.conf import settings
 from unfazed.contrib.session.backends.base import SessionBase
 from unfazed.contrib.session.settings import SessionSettings
-from unfazed.contrib.session.utils import build_cookie
-from unfazed.protocol import ASGIType
-from unfazed.type import ASGIApp, Message, Receive, Scope, Send
+from unfazed.contrib.session.utils import CookieBuilder
+from unfazed.middleware.hooks import HookMiddleware
+from unfazed.type import ASGIApp, Message, Receive, Scope
 from unfazed.utils import import_string
 
 
-class SessionMiddleware:
+class SessionMiddleware(HookMiddleware):
+    scope_types = ("http", "websocket")
+
     def __init__(self, app: ASGIApp) -> None:
-        self.app = app
+        super().__init__(app)
 
         self.setting: SessionSettings = settings["UNFAZED_CONTRIB_SESSION_SETTINGS"]
         self.engine_cls: t.Type[SessionBase] = import_string(self.setting.engine)
+        self.cookie = CookieBuilder(
+            self.setting.cookie_name,
+            max_age=self.setting.cookie_max_age,
+            path=self.setting.cookie_path,
+            domain=self.setting.cookie_domain,
+            secure=self.setting.cookie_secure,
+            httponly=self.setting.cookie_httponly,
+            samesite=self.setting.cookie_samesite,
+        )
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] not in ("http", "websocket"):
-            await self.app(scope, receive, send)
-            return
-
+    async def on_request(self, scope: Scope, receive: Receive) -> None:
         connection = HTTPConnection(scope)
 
         if self.setting.cookie_name in connection.cookies:
@@ -32,44 +39,37 @@ class SessionMiddleware:
             session_key = None
 
         session_store: SessionBase = self.engine_cls(self.setting, session_key)
-        await session_store.load()
+        # without a cookie there is nothing to load
+        if session_key is not None:
+            if self.setting.lazy_load:
+                session_store.deferred = True
+            else:
+                await session_store.load()
         scope["session"] = session_store
 
-        async def wrapped_send(message: Message) -> None:
-            if message["type"] == ASGIType.HTTP_RESPONSE_START:
-                headers = MutableHeaders(scope=message)
+    async def on_response_start(self, scope: Scope, message: Message) -> None:
+        session_store: SessionBase = scope["session"]
+
+        # if session is created / updated / deleted
+        # save the session and reset the cookie
+        if session_store.modified:
+            await session_store.save()
+            MutableHeaders(scope=message).append(
+                "Set-Cookie", self.make_cookie(session_store)
+            )
 
-                # if session is created / updated / deleted
-                # save the session and reset the cookie
-                if session_store.modified:
-                    await session_store.save()
+        # ttl extended, extend the cookie as well
+        elif session_store.refreshed:
+            MutableHeaders(scope=message).append(
+                "Set-Cookie", self.make_cookie(session_store)
+            )
 
-                    # if session is empty, delete the cookie
-                    if session_store:
-                        header_value = build_cookie(
-                            self.setting.cookie_name,
-                            t.cast(str, session_store.session_key),
-                            max_age=self.setting.cookie_max_age,
-                            expires=session_store.get_expiry_age(),
-                            path=self.setting.cookie_path,
-                            domain=self.setting.cookie_domain,
-                            secure=self.setting.cookie_secure,
-                            httponly=self.setting.cookie_httponly,
-                            samesite=self.setting.cookie_samesite,
-                        )
-                    else:
-                        header_value = build_cookie(
-                            self.setting.cookie_name,
-                            "null",
-                            max_age=0,
-                            expires=session_store.get_expiry_age(),
-                            path=self.setting.cookie_path,
-                            domain=self.setting.cookie_domain,
-                            secure=self.setting.cookie_secure,
-                            httponly=self.setting.cookie_httponly,
-                            samesite=self.setting.cookie_samesite,
-                        )
-                    headers.append("Set-Cookie", header_value)
-            await send(message)
+    def make_cookie(self, session_store: SessionBase) -> str:
+        # if session is empty, delete the cookie
+        if session_store:
+            return self.cookie.build(
+                t.cast(str, session_store.session_key),
+                expires=session_store.get_expiry_age(),
+            )
 
-        await self.app(scope, receive, wrapped_send)
+        return self.cookie.deletion
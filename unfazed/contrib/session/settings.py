@@ -10,6 +10,10 @@ from unfazed.type import CanBeImported
 class SessionSettings(BaseModel):
     # required
     secret_key: str = Field(..., alias="SECRET")
+    # previous secrets still accepted when verifying, only used by CompactSession
+    secret_fallbacks: t.List[str] = Field(
+        default_factory=list, alias="SECRET_FALLBACKS"
+    )
 
     # require recommended
     cookie_domain: str | None = Field(default=None, alias="COOKIE_DOMAIN")
@@ -28,6 +32,12 @@ class SessionSettings(BaseModel):
     )
     cookie_max_age: int = Field(default=60 * 60 * 24 * 7, alias="COOKIE_MAX_AGE")
 
+    # CompactSession payloads of at least this many bytes are zlib compressed
+    compress_threshold: int | None = Field(default=512, alias="COMPRESS_THRESHOLD")
+
+    # load the session on first access instead of on every request
+    lazy_load: bool = Field(default=False, alias="LAZY_LOAD")
+
     # If both Expires and Max-Age are set, Max-Age has precedence.
     # => so unfazed ignore `expires`
     # cookie_expires: int = Field(None, alias="COOKIE_EXPIRES")
@@ -35,3 +45,14 @@ class SessionSettings(BaseModel):
     # if you want to use cache session
     # set the cache alias
     cache_alias: str = Field(default="default", alias="CACHE_ALIAS")
+
+    # `blob` stores the whole dict under one key
+    # `hash` stores one hash field per session key, only changed fields are written
+    cache_storage: t.Literal["blob", "hash"] = Field(
+        default="blob", alias="CACHE_STORAGE"
+    )
+
+    # extend the ttl of active cache sessions
+    # at most once per `sliding_interval` seconds
+    sliding_expiry: bool = Field(default=False, alias="SLIDING_EXPIRY")
+    sliding_interval: int = Field(default=60, alias="SLIDING_INTERVAL")
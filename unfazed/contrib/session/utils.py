@@ -32,3 +32,73 @@ def build_cookie(
         cookie[key]["samesite"] = samesite
     cookie_val = cookie.output(header="").strip()
     return cookie_val
+
+
+class CookieBuilder:
+    """
+    Build `Set-Cookie` values for one cookie with fixed attributes.
+
+    The attribute suffix is rendered once, so a response only formats
+    the value. Attributes are emitted in the same order as
+    `build_cookie`, and the deletion header is a prebuilt constant.
+
+    ```python
+
+    builder = CookieBuilder("session_id", max_age=3600, secure=True)
+    builder.build("abc")  # 'session_id=abc; HttpOnly; Max-Age=3600; Path=/; ...'
+    builder.deletion  # 'session_id=null; expires=Thu, 01 Jan 1970 ...'
+
+    ```
+    """
+
+    EPOCH = "Thu, 01 Jan 1970 00:00:00 GMT"
+
+    # only used to quote values, the same way SimpleCookie does
+    _quoter: http.cookies.BaseCookie[str] = http.cookies.SimpleCookie()
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        max_age: int | None = None,
+        path: str | None = "/",
+        domain: str | None = None,
+        secure: bool = False,
+        httponly: bool = True,
+        samesite: t.Literal["lax", "strict", "none"] | None = "lax",
+    ) -> None:
+        self.key = key
+        self.prefix = f"{key}="
+        self.domain = f"; Domain={domain}" if domain is not None else ""
+        self.tail = self.render_tail(max_age, path, httponly, samesite, secure)
+        self.suffix = self.domain + self.tail
+
+        deletion_tail = self.render_tail(0, path, httponly, samesite, secure)
+        self.deletion = f"{key}=null{self.domain}; expires={self.EPOCH}{deletion_tail}"
+
+    @staticmethod
+    def render_tail(
+        max_age: int | None,
+        path: str | None,
+        httponly: bool,
+        samesite: str | None,
+        secure: bool,
+    ) -> str:
+        parts = []
+        if httponly:
+            parts.append("; HttpOnly")
+        if max_age is not None:
+            parts.append(f"; Max-Age={max_age}")
+        if path is not None:
+            parts.append(f"; Path={path}")
+        if samesite is not None:
+            parts.append(f"; SameSite={samesite}")
+        if secure:
+            parts.append("; Secure")
+        return "".join(parts)
+
+    def build(self, value: str, expires: str | None = None) -> str:
+        _, coded = self._quoter.value_encode(value)
+        if expires is None:
+            return self.prefix + coded + self.suffix
+        return f"{self.prefix}{coded}{self.domain}; expires={expires}{self.tail}"
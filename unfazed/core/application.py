@@ -2,6 +2,7 @@ import logging
 import sys
 import typing as t
 
+from anyio.to_thread import current_default_thread_limiter
 from starlette.datastructures import State
 from starlette.routing import Router
 
@@ -9,15 +10,18 @@ from unfazed import protocol as p
 from unfazed.app import AppCenter
 from unfazed.cache import caches
 from unfazed.command import CliCommandCenter, CommandCenter
+from unfazed.concurrency import ExecutorPool, executors
 from unfazed.conf import UnfazedSettings
 from unfazed.conf import settings as settings_proxy
 from unfazed.db import ModelCenter
 from unfazed.lifespan import BaseLifeSpan, lifespan_context, lifespan_handler
 from unfazed.logging import LogCenter
+from unfazed.middleware.hooks import compile_middlewares
 from unfazed.openapi import OpenApi
 from unfazed.openapi.routes import patterns
 from unfazed.route import Route, parse_urlconf
 from unfazed.schema import LogConfig
+from unfazed.tasks import tasks as task_handler
 from unfazed.type import ASGIApp, Receive, Scope, Send
 from unfazed.utils import Timer, import_string, unfazed_locker
 
@@ -48,6 +52,8 @@ class Unfazed:
     1. Settings - Load from UNFAZED_SETTINGS_MODULE environment variable
     2. Logging - Configure from settings.LOGGING with default fallback
     3. Cache - Setup from settings.CACHE (Memory/Redis backends)
+       executors from settings.EXECUTORS and the task broker from
+       settings.TASKS
     4. App Center - Initialize apps from settings.INSTALLED_APPS
     5. Model Center - Setup database from settings.DATABASE (Tortoise ORM)
     6. Routes - Configure from settings.ROOT_URLCONF and app routes
@@ -55,6 +61,9 @@ class Unfazed:
     8. Command Center - Collect commands from all apps
     9. Lifespan - Configure from settings.LIFESPAN
     10. OpenAPI - Setup from settings.OPENAPI
+
+    With settings.PARALLEL_STARTUP, apps are imported first, then the
+    Model Center is set up, then app `ready()` hooks run concurrently.
     """
 
     def __init__(
@@ -83,6 +92,7 @@ class Unfazed:
         self.user_middleware = middlewares or []
         self.middleware_stack: ASGIApp | None = None
         self.silent = silent
+        self._phases: t.Dict[str, float] = {}
 
     @property
     def debug(self) -> bool:
@@ -101,7 +111,11 @@ class Unfazed:
     @property
     def app_center(self) -> AppCenter:
         if self._app_center is None:
-            self._app_center = AppCenter(self, self.settings.INSTALLED_APPS)
+            self._app_center = AppCenter(
+                self,
+                self.settings.INSTALLED_APPS,
+                parallel=self.settings.PARALLEL_STARTUP,
+            )
         return self._app_center
 
     @property
@@ -133,6 +147,23 @@ class Unfazed:
     def routes(self) -> t.List[Route]:
         return self.router.routes  # type: ignore
 
+    @property
+    def startup_report(self) -> t.Dict[str, t.Any]:
+        """
+        Seconds spent in each setup phase and, per app, in importing,
+        `ready()` and the settings wakeup.
+
+        ```python
+
+        {
+            "phases": {"setup_logging": 0.001, "setup_app_center": 0.2, ...},
+            "apps": {"myapp": {"import": 0.1, "ready": 0.05, "settings": 0.0}},
+        }
+
+        ```
+        """
+        return {"phases": dict(self._phases), "apps": dict(self.app_center.report)}
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if not self.ready:
             await self.setup_at_startup(scope, receive, send)
@@ -163,10 +194,17 @@ class Unfazed:
         await self.model_center.migrate()
 
     def setup_routes(self) -> None:
-        if not self.settings.ROOT_URLCONF:
-            return
-        routes = parse_urlconf(self.settings.ROOT_URLCONF, self.app_center)
-        self.router.routes.extend(routes)
+        if self.settings.ROOT_URLCONF:
+            routes = parse_urlconf(self.settings.ROOT_URLCONF, self.app_center)
+            self.router.routes.extend(routes)
+
+        # executors are known by now, see `setup_executors`
+        admission = self.settings.ADMISSION
+        for route in self.router.routes:
+            if isinstance(route, Route):
+                route.check_executor()
+                if admission:
+                    route.check_priority(admission.priority_shares)
 
     def setup_middleware(self) -> None:
         if not self.settings.MIDDLEWARE:
@@ -183,6 +221,25 @@ class Unfazed:
             backend_cls = import_string(conf.BACKEND)
             caches[alias] = backend_cls(conf.LOCATION, conf.OPTIONS)
 
+    def setup_executors(self) -> None:
+        if (size := self.settings.THREADPOOL_SIZE) is not None:
+            # the shared threadpool of sync endpoints and run_in_threadpool
+            current_default_thread_limiter().total_tokens = size
+
+        if not (executor_settings := self.settings.EXECUTORS):
+            return
+
+        for name, conf in executor_settings.items():
+            if name in executors:
+                executors[name].shutdown(wait=False)
+            executors[name] = ExecutorPool(name, conf)
+
+    def setup_tasks(self) -> None:
+        if not (task_settings := self.settings.TASKS):
+            return
+
+        task_handler.setup(task_settings)
+
     def setup_logging(self) -> None:
         config = {}
         if self.settings.LOGGING:
@@ -218,32 +275,52 @@ class Unfazed:
         self.router.routes.extend(patterns)  # type: ignore
 
     def build_middleware_stack(self) -> ASGIApp:
-        app = self.router
-        for cls in reversed(self.user_middleware):
-            app = cls(app)  # type: ignore
-        return app
+        return compile_middlewares(self.router, self.user_middleware)
+
+    def _timer(self, name: str) -> Timer:
+        return Timer(name, silent=self.silent, record=self._phases)
+
+    async def setup_app_and_model_center(self) -> None:
+        """
+        Import all apps, set up the database, then run the `ready()`
+        hooks concurrently. The hooks run after the ORM is initialized,
+        so they may query the database as in sequential startup.
+        """
+        with self._timer("load_apps"):
+            self.app_center.load_apps()
+        with self._timer("setup_model_center"):
+            await self.model_center.setup()
+        with self._timer("ready_apps"):
+            await self.app_center.ready_apps()
 
     @unfazed_locker
     async def setup(self) -> None:
         """Setup application components in order"""
-        with Timer("setup_unfazed", silent=self.silent):
-            with Timer("setup_logging", silent=self.silent):
+        with self._timer("setup_unfazed"):
+            with self._timer("setup_logging"):
                 self.setup_logging()
-            with Timer("setup_cache", silent=self.silent):
+            with self._timer("setup_cache"):
                 self.setup_cache()
-            with Timer("setup_app_center", silent=self.silent):
-                await self.app_center.setup()
-            with Timer("setup_model_center", silent=self.silent):
-                await self.model_center.setup()
-            with Timer("setup_routes", silent=self.silent):
+            with self._timer("setup_executors"):
+                self.setup_executors()
+            with self._timer("setup_tasks"):
+                self.setup_tasks()
+            if self.settings.PARALLEL_STARTUP:
+                await self.setup_app_and_model_center()
+            else:
+                with self._timer("setup_app_center"):
+                    await self.app_center.setup()
+                with self._timer("setup_model_center"):
+                    await self.model_center.setup()
+            with self._timer("setup_routes"):
                 self.setup_routes()
-            with Timer("setup_middleware", silent=self.silent):
+            with self._timer("setup_middleware"):
                 self.setup_middleware()
-            with Timer("setup_command_center", silent=self.silent):
+            with self._timer("setup_command_center"):
                 await self.command_center.setup()
-            with Timer("setup_lifespan", silent=self.silent):
+            with self._timer("setup_lifespan"):
                 self.setup_lifespan()
-            with Timer("setup_openapi", silent=self.silent):
+            with self._timer("setup_openapi"):
                 self.setup_openapi()
             if not self.silent:
                 self.log_setup_info()
@@ -276,6 +353,13 @@ class Unfazed:
         for command in self.command_center.commands:
             logger.debug(f"    {command}")
 
+        logger.debug("STARTUP TIME:")
+        for phase, seconds in self._phases.items():
+            logger.debug(f"    {phase}: {seconds:.4f}s")
+        for app_name, timings in self.app_center.report.items():
+            detail = ", ".join(f"{k} {v:.4f}s" for k, v in timings.items())
+            logger.debug(f"    {app_name} | {detail}")
+
         logger.debug("-" * 103 + "\n")
 
     @unfazed_locker
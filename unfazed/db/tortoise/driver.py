@@ -8,6 +8,9 @@ import unfazed
 from unfazed.protocol import DataBaseDriver
 from unfazed.schema import AppModels, Command, Database
 
+from .instrument import Instrument
+from .router import ReplicaRouter, ReplicaSet
+
 if t.TYPE_CHECKING:
     from unfazed.core import Unfazed  # pragma: no cover
 
@@ -24,6 +27,7 @@ class Driver(DataBaseDriver):
     AERICH_MODELS = "aerich.models"
     AERICH_COMMAND_LABEL = "aerich.command"
     COMMAND_PATH_TEMPLATE = "unfazed.db.tortoise.commands.{}.Command"
+    REPLICA_ROUTER = "unfazed.db.tortoise.router.ReplicaRouter"
 
     def __init__(self, unfazed: "Unfazed", conf: Database) -> None:
         """Initialize the Tortoise ORM driver.
@@ -44,8 +48,10 @@ class Driver(DataBaseDriver):
 
         This method:
         1. Builds the apps configuration if not provided
-        2. Initializes Tortoise ORM with the configuration
-        3. Loads Aerich commands for database migrations
+        2. Installs the replica router if replicas are configured
+        3. Initializes Tortoise ORM with the configuration
+        4. Installs query instrumentation if configured
+        5. Loads Aerich commands for database migrations
 
         Raises:
             ConfigurationError: If database initialization fails
@@ -57,8 +63,18 @@ class Driver(DataBaseDriver):
         # init tortoise
         config = self.conf.model_dump(exclude_none=True)
         config.pop("driver")
+        config.pop("replica", None)
+        config.pop("instrumentation", None)
+        ReplicaRouter.replica_set = None
+        if self.conf.replica:
+            ReplicaRouter.replica_set = self.build_replica_set()
+            config["routers"] = config.get("routers", []) + [self.REPLICA_ROUTER]
         await Tortoise.init(config=config)
 
+        Instrument.installed = None
+        if self.conf.instrumentation:
+            Instrument(self.conf.instrumentation).install()
+
         # load aerich command
         for c in self.list_aerich_command():
             self.unfazed.command_center.load_command(c)
@@ -89,6 +105,23 @@ class Driver(DataBaseDriver):
 
         return {"models": AppModels(MODELS=models_list)}
 
+    def build_replica_set(self) -> ReplicaSet:
+        """Build the replica set used by the replica router.
+
+        Returns:
+            A ReplicaSet built from the REPLICA configuration
+
+        Raises:
+            ValueError: If the primary or a replica is not a configured connection
+        """
+        assert self.conf.replica is not None
+        names = [self.conf.replica.primary, *self.conf.replica.replicas]
+        for name in names:
+            if name not in self.conf.connections:
+                raise ValueError(f"replica connection {name} not found in CONNECTIONS")
+
+        return ReplicaSet(self.conf.replica)
+
     def list_aerich_command(self) -> t.List[Command]:
         """List all available Aerich commands for database migrations.
 
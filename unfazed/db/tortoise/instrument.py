@@ -0,0 +1,362 @@
+import functools
+import logging
+import re
+import time
+import typing as t
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from tortoise import connections
+from tortoise.backends.base.client import (
+    BaseDBAsyncClient,
+    NestedTransactionContext,
+)
+
+from unfazed.middleware import BaseMiddleware
+from unfazed.protocol import QueryExporter
+from unfazed.schema import Instrumentation
+from unfazed.type import Receive, Scope, Send
+from unfazed.utils import import_string
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger("unfazed.db.slow_query")
+
+EXECUTE_METHODS = (
+    "execute_query",
+    "execute_query_dict",
+    "execute_insert",
+    "execute_many",
+    "execute_script",
+)
+
+# distinct statements kept in memory, the rest is folded into OVERFLOW
+MAX_STATEMENTS = 1000
+OVERFLOW = "<other>"
+
+_QUOTED = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_SPACES = re.compile(r"\s+")
+
+_executing: ContextVar[bool] = ContextVar("unfazed_db_executing", default=False)
+_request_queries: ContextVar["RequestQueries | None"] = ContextVar(
+    "unfazed_db_request_queries", default=None
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce a statement to its shape so that queries differing only in
+    literals, placeholders or IN list length share one key.
+
+    ```python
+
+    normalize_sql("SELECT * FROM user WHERE id IN (1, 2, 3) AND name='foo'")
+    # SELECT * FROM user WHERE id IN (?) AND name=?
+
+    ```
+    """
+    sql = _QUOTED.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACES.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("(?)", sql)
+    sql = _VALUES_LIST.sub(r"\1", sql)
+    return sql
+
+
+class QueryStat:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def to_dict(self) -> t.Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "avg": self.total / self.count if self.count else 0.0,
+        }
+
+
+class PoolStat:
+    __slots__ = ("max_size", "in_use", "peak", "acquired", "wait_total", "wait_max")
+
+    def __init__(self, max_size: int | None) -> None:
+        self.max_size = max_size
+        self.in_use = 0
+        self.peak = 0
+        self.acquired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "max_size": self.max_size,
+            "in_use": self.in_use,
+            "peak": self.peak,
+            "acquired": self.acquired,
+            "wait_total": self.wait_total,
+            "wait_max": self.wait_max,
+            "saturation": self.in_use / self.max_size if self.max_size else None,
+        }
+
+
+class RequestQueries:
+    __slots__ = ("count", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: t.Counter[str] = Counter()
+
+    def duplicates(self, threshold: int) -> t.Dict[str, int]:
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+class _TimedAcquire:
+    """Wrap a connection / transaction context to track pool usage."""
+
+    __slots__ = ("_inner", "_instrument", "_alias", "_entered")
+
+    def __init__(self, inner: t.Any, instrument: "Instrument", alias: str) -> None:
+        self._inner = inner
+        self._instrument = instrument
+        self._alias = alias
+        self._entered = False
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self._inner, name)
+
+    async def __aenter__(self) -> t.Any:
+        start = time.perf_counter()
+        ret = await self._inner.__aenter__()
+        self._entered = True
+        self._instrument.record_acquire(self._alias, time.perf_counter() - start)
+        return ret
+
+    async def __aexit__(self, *exc_info: t.Any) -> None:
+        try:
+            await self._inner.__aexit__(*exc_info)
+        finally:
+            if self._entered:
+                self._instrument.record_release(self._alias)
+
+
+class Instrument:
+    """
+    Query timing and pool instrumentation for Tortoise connections.
+
+    The driver installs it on every configured connection when
+    `DATABASE.INSTRUMENTATION` is set. Each `execute_*` call is timed and
+    aggregated by normalized statement, every pool checkout is timed and
+    counted, and queries issued inside a `QueryCountMiddleware` request
+    are counted so repeated statements can be reported as N+1 patterns.
+
+    ```python
+
+    "DATABASE": {
+        "CONNECTIONS": {...},
+        "INSTRUMENTATION": {
+            "EXPORTER": "myproject.metrics.PrometheusExporter",
+            "SLOW_QUERY_THRESHOLD": 0.2,
+        },
+    }
+
+    # later
+    Instrument.installed.snapshot()
+
+    ```
+
+    """
+
+    installed: t.ClassVar["Instrument | None"] = None
+
+    def __init__(self, conf: Instrumentation) -> None:
+        self.conf = conf
+        self.exporter: QueryExporter | None = None
+        if conf.exporter:
+            self.exporter = import_string(conf.exporter)()
+        self.queries: t.Dict[str, QueryStat] = {}
+        self.pools: t.Dict[str, PoolStat] = {}
+
+    def install(self) -> None:
+        for alias in connections.db_config:
+            self.install_client(connections.get(alias), alias)
+        Instrument.installed = self
+
+    def install_client(
+        self, client: BaseDBAsyncClient, alias: str, pooled: bool = True
+    ) -> None:
+        if getattr(client, "_unfazed_instrumented", False):
+            return
+
+        for name in EXECUTE_METHODS:
+            setattr(client, name, self._wrap_execute(alias, getattr(client, name)))
+
+        if pooled:
+            self.pools.setdefault(
+                alias, PoolStat(getattr(client, "pool_maxsize", None))
+            )
+            acquire_connection = client.acquire_connection
+
+            def _acquire_connection() -> t.Any:
+                return _TimedAcquire(acquire_connection(), self, alias)
+
+            setattr(client, "acquire_connection", _acquire_connection)
+
+        in_transaction = client._in_transaction
+
+        def _in_transaction() -> t.Any:
+            ctx = in_transaction()
+            # sqlite contexts name the wrapped client `connection`
+            wrapped = getattr(ctx, "client", None) or getattr(ctx, "connection")
+            self.install_client(wrapped, alias, pooled=False)
+            # savepoints reuse the connection of the outer transaction
+            if isinstance(ctx, NestedTransactionContext):
+                return ctx
+            return _TimedAcquire(ctx, self, alias)
+
+        setattr(client, "_in_transaction", _in_transaction)
+        setattr(client, "_unfazed_instrumented", True)
+
+    def _wrap_execute(
+        self, alias: str, func: t.Callable[..., t.Awaitable]
+    ) -> t.Callable[..., t.Awaitable]:
+        @functools.wraps(func)
+        async def wrapper(query: str, *args: t.Any, **kwargs: t.Any) -> t.Any:
+            # some backends implement one execute method on top of another
+            if _executing.get():
+                return await func(query, *args, **kwargs)
+
+            token = _executing.set(True)
+            start = time.perf_counter()
+            try:
+                return await func(query, *args, **kwargs)
+            finally:
+                _executing.reset(token)
+                self.record_query(alias, query, time.perf_counter() - start)
+
+        return wrapper
+
+    def record_query(self, alias: str, sql: str, duration: float) -> None:
+        statement = normalize_sql(sql)
+
+        key = statement
+        if key not in self.queries and len(self.queries) >= MAX_STATEMENTS:
+            key = OVERFLOW
+        stat = self.queries.get(key)
+        if stat is None:
+            stat = self.queries[key] = QueryStat()
+        stat.add(duration)
+
+        request_queries = _request_queries.get()
+        if request_queries is not None:
+            request_queries.count += 1
+            request_queries.statements[statement] += 1
+
+        threshold = self.conf.slow_query_threshold
+        if threshold is not None and duration >= threshold:
+            slow_logger.warning(f"slow query on {alias} took {duration:.3f}s: {sql}")
+
+        if self.exporter is not None:
+            try:
+                self.exporter.on_query(alias, statement, duration)
+            except Exception:
+                logger.exception("query exporter failed")
+
+    def record_acquire(self, alias: str, wait: float) -> None:
+        pool = self.pools[alias]
+        pool.in_use += 1
+        pool.acquired += 1
+        pool.wait_total += wait
+        if wait > pool.wait_max:
+            pool.wait_max = wait
+        if pool.in_use > pool.peak:
+            pool.peak = pool.in_use
+
+        if self.exporter is not None:
+            try:
+                self.exporter.on_acquire(alias, wait, pool.in_use, pool.max_size)
+            except Exception:
+                logger.exception("query exporter failed")
+
+    def record_release(self, alias: str) -> None:
+        self.pools[alias].in_use -= 1
+
+    @contextmanager
+    def scope(self) -> t.Generator[RequestQueries, None, None]:
+        """Count the queries issued inside the block."""
+
+        request_queries = RequestQueries()
+        token = _request_queries.set(request_queries)
+        try:
+            yield request_queries
+        finally:
+            _request_queries.reset(token)
+            self.report(request_queries)
+
+    def report(self, request_queries: RequestQueries) -> None:
+        duplicates = request_queries.duplicates(self.conf.n_plus_one_threshold)
+        for statement, count in duplicates.items():
+            logger.warning(f"possible N+1 query, executed {count} times: {statement}")
+
+        if self.exporter is not None:
+            try:
+                self.exporter.on_request(request_queries.count, duplicates)
+            except Exception:
+                logger.exception("query exporter failed")
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        return {
+            "queries": {k: v.to_dict() for k, v in self.queries.items()},
+            "pools": {k: v.to_dict() for k, v in self.pools.items()},
+        }
+
+    def reset(self) -> None:
+        self.queries.clear()
+        for pool in self.pools.values():
+            pool.acquired = 0
+            pool.peak = pool.in_use
+            pool.wait_total = 0.0
+            pool.wait_max = 0.0
+
+
+class QueryCountMiddleware(BaseMiddleware):
+    """
+    Count the queries of every http request and report N+1 patterns.
+
+    Requires `DATABASE.INSTRUMENTATION`, otherwise it is a passthrough.
+
+    ```python
+
+    "MIDDLEWARE": ["unfazed.db.tortoise.instrument.QueryCountMiddleware"]
+
+    ```
+
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        instrument = Instrument.installed
+        if scope["type"] != "http" or instrument is None:
+            await self.app(scope, receive, send)
+            return
+
+        with instrument.scope():
+            await self.app(scope, receive, send)
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from tortoise import Model, connections
+from tortoise.backends.base.client import TransactionalDBClient
+
+from unfazed.lifespan import BaseLifeSpan
+from unfazed.schema import Replica
+
+if t.TYPE_CHECKING:
+    from unfazed.core import Unfazed  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+# monotonic timestamp of the last write seen in the current context,
+# reads issued shortly after a write are pinned to primary
+_last_write: ContextVar[float] = ContextVar("unfazed_db_last_write", default=0.0)
+_force_primary: ContextVar[bool] = ContextVar("unfazed_db_force_primary", default=False)
+
+
+class ReplicaSet:
+    """Weighted pool of read replicas with health based ejection.
+
+    Replicas are picked with smooth weighted round-robin, so equal weights
+    degrade to plain round-robin and traffic is spread evenly within every
+    cycle. An ejected replica is skipped until its cooldown expires or a
+    health check restores it. When no replica is available reads fall back
+    to the primary.
+    """
+
+    def __init__(self, conf: Replica) -> None:
+        self.conf = conf
+        self.primary = conf.primary
+        self.weights = {name: w for name, w in conf.replicas.items() if w > 0}
+        self._current = dict.fromkeys(self.weights, 0)
+        self._ejected: t.Dict[str, float] = {}
+
+    @property
+    def available(self) -> t.List[str]:
+        if self._ejected:
+            now = time.monotonic()
+            for name, until in list(self._ejected.items()):
+                if until <= now:
+                    del self._ejected[name]
+        return [name for name in self.weights if name not in self._ejected]
+
+    def choose(self) -> str:
+        best: str | None = None
+        total = 0
+        for name in self.available:
+            weight = self.weights[name]
+            self._current[name] += weight
+            total += weight
+            if best is None or self._current[name] > self._current[best]:
+                best = name
+
+        if best is None:
+            return self.primary
+
+        self._current[best] -= total
+        return best
+
+    def eject(self, name: str, seconds: float | None = None) -> None:
+        if name not in self.weights:
+            return
+        if seconds is None:
+            seconds = self.conf.eject_seconds
+        if name not in self._ejected:
+            logger.warning(f"replica {name} ejected for {seconds}s")
+        self._ejected[name] = time.monotonic() + seconds
+
+    def restore(self, name: str) -> None:
+        if self._ejected.pop(name, None) is not None:
+            logger.info(f"replica {name} restored")
+
+    def is_ejected(self, name: str) -> bool:
+        return name in self._ejected and name not in self.available
+
+    async def check(self) -> None:
+        """Ping every replica once, ejecting those that fail."""
+
+        async def _ping(name: str) -> None:
+            try:
+                conn = connections.get(name)
+                await asyncio.wait_for(
+                    conn.execute_query("SELECT 1"),
+                    timeout=self.conf.health_check_timeout,
+                )
+            except Exception as e:
+                logger.warning(f"replica {name} health check failed: {e}")
+                self.eject(name)
+            else:
+                self.restore(name)
+
+        await asyncio.gather(*[_ping(name) for name in self.weights])
+
+
+class ReplicaRouter:
+    """
+    Tortoise router that sends reads to replicas and writes to primary.
+
+    Only models whose default connection is the configured primary are
+    routed, everything else falls through to the next router or the
+    model's own connection.
+
+    Reads stay on primary when:
+    - the current context is inside a transaction on primary
+    - a write happened in the current context within `STICKY_SECONDS`
+    - the caller asked for it with `use_primary()`
+
+    The router is enabled by `DATABASE.REPLICA`:
+
+    ```python
+
+    "DATABASE": {
+        "CONNECTIONS": {"default": {...}, "replica1": {...}, "replica2": {...}},
+        "REPLICA": {
+            "PRIMARY": "default",
+            "REPLICAS": {"replica1": 2, "replica2": 1},
+        },
+    }
+
+    ```
+
+    """
+
+    replica_set: t.ClassVar[ReplicaSet | None] = None
+
+    def _routed(self, model: t.Type[Model]) -> ReplicaSet | None:
+        replica_set = self.replica_set
+        if replica_set is None:
+            return None
+        if model._meta.default_connection != replica_set.primary:
+            return None
+        return replica_set
+
+    def db_for_read(self, model: t.Type[Model]) -> str | None:
+        replica_set = self._routed(model)
+        if replica_set is None:
+            return None
+
+        if _force_primary.get():
+            return replica_set.primary
+
+        last_write = _last_write.get()
+        if (
+            last_write
+            and time.monotonic() - last_write < replica_set.conf.sticky_seconds
+        ):
+            return replica_set.primary
+
+        if isinstance(connections.get(replica_set.primary), TransactionalDBClient):
+            return replica_set.primary
+
+        return replica_set.choose()
+
+    def db_for_write(self, model: t.Type[Model]) -> str | None:
+        replica_set = self._routed(model)
+        if replica_set is None:
+            return None
+
+        if replica_set.conf.sticky_seconds > 0:
+            _last_write.set(time.monotonic())
+        return replica_set.primary
+
+
+@contextmanager
+def use_primary() -> t.Generator[None, None, None]:
+    """Route every read inside the block to primary.
+
+    Usage:
+
+    ```python
+
+    with use_primary():
+        user = await User.get(id=1)
+
+    ```
+    """
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReplicaHealthCheck(BaseLifeSpan):
+    """
+    Periodically ping replicas and eject the unhealthy ones.
+
+    Add it to `LIFESPAN` when `DATABASE.REPLICA` is configured:
+
+    ```python
+
+    "LIFESPAN": ["unfazed.db.tortoise.router.ReplicaHealthCheck"]
+
+    ```
+
+    """
+
+    def __init__(self, unfazed: "Unfazed") -> None:
+        super().__init__(unfazed)
+        self._task: asyncio.Task | None = None
+
+    async def _loop(self, replica_set: ReplicaSet) -> None:
+        while True:
+            await replica_set.check()
+            await asyncio.sleep(replica_set.conf.health_check_interval)
+
+    async def on_startup(self) -> None:
+        replica_set = ReplicaRouter.replica_set
+        if replica_set is None:
+            return
+        self._task = asyncio.create_task(self._loop(replica_set))
+
+    async def on_shutdown(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
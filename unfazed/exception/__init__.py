@@ -1,8 +1,10 @@
 from .auth import (
     AccountExisted,
     AccountNotFound,
+    InvalidToken,
     LoginRequired,
     PermissionDenied,
+    TooManyAttempts,
     WrongPassword,
 )
 from .base import BaseUnfazedException, UnfazedSetupError
@@ -23,6 +25,8 @@ __all__ = [
     "AccountNotFound",
     "WrongPassword",
     "AccountExisted",
+    "TooManyAttempts",
+    "InvalidToken",
     "MethodNotAllowed",
     "UnfazedSetupError",
 ]
@@ -24,3 +24,13 @@ class WrongPassword(BaseUnfazedException):
 class AccountExisted(BaseUnfazedException):
     def __init__(self, message: str = "Account existed", code: int = 406):
         super().__init__(message, code)
+
+
+class TooManyAttempts(BaseUnfazedException):
+    def __init__(self, message: str = "Too many login attempts", code: int = 429):
+        super().__init__(message, code)
+
+
+class InvalidToken(BaseUnfazedException):
+    def __init__(self, message: str = "Invalid token", code: int = 401):
+        super().__init__(message, code)
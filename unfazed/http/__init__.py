@@ -4,6 +4,7 @@ from .response import (
     HtmlResponse,
     HttpResponse,
     JsonResponse,
+    NotModifiedResponse,
     PlainTextResponse,
     RedirectResponse,
     StreamingResponse,
@@ -13,6 +14,7 @@ __all__ = [
     "HttpRequest",
     "HttpResponse",
     "JsonResponse",
+    "NotModifiedResponse",
     "PlainTextResponse",
     "RedirectResponse",
     "HtmlResponse",
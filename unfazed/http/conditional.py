@@ -0,0 +1,51 @@
+import hashlib
+import typing as t
+
+from unfazed.type import Send
+
+# headers a 304 repeats from the full response
+NOT_MODIFIED_HEADERS = {
+    b"cache-control",
+    b"content-location",
+    b"date",
+    b"etag",
+    b"expires",
+    b"vary",
+}
+
+
+def make_etag(body: bytes | memoryview) -> str:
+    """
+    Strong ETag of a rendered body, blake2b is fast enough to hash
+    every response and not worth a dependency on a faster one.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # weak comparison, as required for If-None-Match
+    if if_none_match.strip() == "*":
+        return True
+    value = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == value for tag in if_none_match.split(",")
+    )
+
+
+def not_modified_headers(
+    raw_headers: t.Iterable[t.Tuple[bytes, bytes]],
+) -> t.List[t.Tuple[bytes, bytes]]:
+    return [(k, v) for k, v in raw_headers if k.lower() in NOT_MODIFIED_HEADERS]
+
+
+async def send_not_modified(
+    send: Send, raw_headers: t.Iterable[t.Tuple[bytes, bytes]]
+) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 304,
+            "headers": not_modified_headers(raw_headers),
+        }
+    )
+    await send({"type": "http.response.body", "body": b""})
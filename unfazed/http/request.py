@@ -3,6 +3,8 @@ import typing as t
 import orjson as json
 from starlette.requests import Request
 
+from .conditional import etag_matches
+
 if t.TYPE_CHECKING:
     from unfazed.contrib.session.backends.base import SessionBase  # pragma: no cover
     from unfazed.core import Unfazed  # pragma: no cover
@@ -119,11 +121,17 @@ class HttpRequest(Request):
 
         Raises:
             ValueError: If AuthenticationMiddleware is not installed.
+            RuntimeError: If the user is resolved on demand from a deferred
+                session that can not be loaded without I/O.
         """
         if "user" not in self.scope:
-            raise ValueError(
-                "AuthenticationMiddleware must be installed to access request.user"
-            )
+            # set by AuthenticationMiddleware to resolve the user on demand
+            resolve = self.scope.get("resolve_user")
+            if resolve is None:
+                raise ValueError(
+                    "AuthenticationMiddleware must be installed to access request.user"
+                )
+            self.scope["user"] = resolve()
         return self.scope.get("user", None)
 
     @property
@@ -135,3 +143,19 @@ class HttpRequest(Request):
             Unfazed: The Unfazed application instance.
         """
         return self.scope["app"]
+
+    def etag_matches(self, etag: str) -> bool:
+        """
+        Check a conditional `GET` or `HEAD` against an ETag.
+
+        Args:
+            etag (str): The current ETag of the requested content.
+
+        Returns:
+            bool: True if `If-None-Match` matches, i.e. the client's copy
+            is current and `NotModifiedResponse` can be returned.
+        """
+        if self.method not in ("GET", "HEAD"):
+            return False
+        if_none_match = self.headers.get("if-none-match")
+        return if_none_match is not None and etag_matches(if_none_match, etag)
@@ -11,11 +11,14 @@ import orjson as json
 from pydantic import BaseModel
 from starlette.background import BackgroundTask
 from starlette.concurrency import iterate_in_threadpool
+from starlette.datastructures import Headers
 from starlette.responses import Response
 
 from unfazed.protocol import ASGIType
 from unfazed.type import ContentStream, PathLike, Receive, Scope, Send
 
+from .conditional import etag_matches, make_etag, send_not_modified
+
 T = t.TypeVar("T", bound=t.Union[t.Dict, t.List, str, bytes, BaseModel, ContentStream])
 
 
@@ -32,9 +35,13 @@ class HttpResponse[T](Response):
         headers: Optional HTTP headers.
         media_type: Content type of the response, defaults to "text/plain".
         background: Optional background task to run after the response is sent.
+        etag: `True` sets an `ETag` hashed from the rendered body, a string
+            is used as the `ETag` as is. A `GET` or `HEAD` with a matching
+            `If-None-Match` is then answered with an empty `304`.
     """
 
     media_type = "text/plain"
+    etag: str | None = None
 
     def __init__(
         self,
@@ -43,8 +50,55 @@ class HttpResponse[T](Response):
         headers: t.Mapping[str, str] | None = None,
         media_type: str | None = None,
         background: BackgroundTask | None = None,
+        etag: bool | str = False,
     ) -> None:
         super().__init__(content, status_code, headers, media_type, background)
+        if etag:
+            self.etag = make_etag(self.body) if etag is True else etag
+            self.headers["etag"] = self.etag
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            self.etag is not None
+            and self.status_code == 200
+            and scope["type"] == "http"
+            and scope["method"] in ("GET", "HEAD")
+        ):
+            if_none_match = Headers(scope=scope).get("if-none-match")
+            if if_none_match is not None and etag_matches(if_none_match, self.etag):
+                await send_not_modified(send, self.raw_headers)
+                return
+
+        await super().__call__(scope, receive, send)
+
+
+class NotModifiedResponse(HttpResponse):
+    """
+    Empty `304 Not Modified` response.
+
+    Lets an endpoint that knows the `ETag` of its content, e.g. from a
+    version column, answer a conditional request without building the
+    response at all.
+
+    Usage:
+    ```python
+    async def product(request: HttpRequest, ...) -> HttpResponse:
+        etag = f'"{product.version}"'
+        if request.etag_matches(etag):
+            return NotModifiedResponse(etag)
+
+        return JsonResponse(serialize(product), etag=etag)
+    ```
+    """
+
+    def __init__(
+        self, etag: str | None = None, headers: t.Mapping[str, str] | None = None
+    ) -> None:
+        super().__init__(status_code=304, headers=headers)
+        # a 304 has no body to describe
+        del self.headers["content-type"]
+        if etag is not None:
+            self.headers["etag"] = etag
 
 
 class PlainTextResponse(HttpResponse[str]):
@@ -1,4 +1,10 @@
 from .base import BaseMiddleware
+from .hooks import HookMiddleware, compile_middlewares
 from .internal.common import CommonMiddleware
 
-__all__ = ["CommonMiddleware", "BaseMiddleware"]
+__all__ = [
+    "CommonMiddleware",
+    "BaseMiddleware",
+    "HookMiddleware",
+    "compile_middlewares",
+]
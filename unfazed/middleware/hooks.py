@@ -0,0 +1,177 @@
+import typing as t
+
+from unfazed.protocol import ASGIType
+from unfazed.type import ASGIApp, Message, Receive, Scope, Send
+
+
+class HookMiddleware:
+    """
+    Middleware written as hooks instead of an ASGI wrapper.
+
+    - `on_request` runs before the app, returning a response, i.e. any
+      ASGI app, answers the request without calling the inner layers.
+    - `on_response_start` may change the `http.response.start` message.
+    - `on_exception` may return a response for an exception raised by
+      the inner layers, returning None re-raises it.
+
+    Consecutive hook middlewares in `MIDDLEWARE` or `Route(middlewares=...)`
+    are compiled into one `HookPipeline`, which checks the scope type
+    once, wraps `send` once and only calls the hooks a class overrides.
+    Hooks keep per-request state in the scope.
+
+    Usage:
+
+    ```python
+
+    class ServerTimingMiddleware(HookMiddleware):
+        async def on_request(self, scope: Scope, receive: Receive) -> None:
+            scope["started_at"] = time.perf_counter()
+
+        async def on_response_start(self, scope: Scope, message: Message) -> None:
+            cost = (time.perf_counter() - scope["started_at"]) * 1000
+            message["headers"].append((b"server-timing", f"app;dur={cost:.1f}".encode()))
+
+    ```
+    """
+
+    # scope types the hooks run for, others pass straight through
+    scope_types: t.ClassVar[t.Tuple[str, ...]] = ("http",)
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._pipeline: HookPipeline | None = None
+
+    async def on_request(self, scope: Scope, receive: Receive) -> ASGIApp | None:
+        return None
+
+    async def on_response_start(self, scope: Scope, message: Message) -> None:
+        return None
+
+    async def on_exception(self, scope: Scope, exc: Exception) -> ASGIApp | None:
+        return None
+
+    def overrides(self, name: str) -> bool:
+        return getattr(type(self), name) is not getattr(HookMiddleware, name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # used as a plain ASGI wrapper, e.g. by another framework
+        if self._pipeline is None:
+            self._pipeline = HookPipeline(self.app, [self])
+        await self._pipeline(scope, receive, send)
+
+
+class HookPlan:
+    def __init__(self, hooks: t.List[HookMiddleware]) -> None:
+        self.hooks = hooks
+        # (position, hook) of overridden hooks, response hooks run inner first
+        self.request = [
+            (i, h) for i, h in enumerate(hooks) if h.overrides("on_request")
+        ]
+        self.response = [
+            (i, h) for i, h in enumerate(hooks) if h.overrides("on_response_start")
+        ][::-1]
+        self.exception = [
+            (i, h) for i, h in enumerate(hooks) if h.overrides("on_exception")
+        ][::-1]
+
+
+class HookPipeline:
+    """
+    Run a stack of `HookMiddleware` as one ASGI layer.
+
+    Hooks run in the order of the stack, the first middleware being the
+    outermost, the same order as nested middlewares:
+
+    - `on_request` from outer to inner, a returned response is sent
+      through the response hooks of the outer middlewares only.
+    - `on_response_start` from inner to outer.
+    - `on_exception` from inner to outer, for middlewares whose
+      `on_request` already ran. Once the response started, the
+      exception is re-raised.
+    """
+
+    def __init__(self, app: ASGIApp, hooks: t.List[HookMiddleware]) -> None:
+        self.app = app
+        self.hooks = hooks
+        self.plans: t.Dict[str, HookPlan] = {}
+        for scope_type in ("http", "websocket"):
+            matched = [h for h in hooks if scope_type in h.scope_types]
+            if matched:
+                self.plans[scope_type] = HookPlan(matched)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        plan = self.plans.get(scope["type"])
+        if plan is None:
+            await self.app(scope, receive, send)
+            return
+
+        # hooks[:depth] have seen the request
+        depth = 0
+        started = False
+
+        wrapped_send = send
+        if plan.response or plan.exception:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal started
+                if message["type"] == ASGIType.HTTP_RESPONSE_START:
+                    for i, hook in plan.response:
+                        if i < depth:
+                            await hook.on_response_start(scope, message)
+                    # a failing hook leaves the response unsent, so the
+                    # exception hooks may still answer
+                    started = True
+                await send(message)
+
+            wrapped_send = send_wrapper
+
+        app = self.app
+        try:
+            for i, hook in plan.request:
+                depth = i
+                response = await hook.on_request(scope, receive)
+                if response is not None:
+                    app = response
+                    break
+            else:
+                depth = len(plan.hooks)
+
+            await app(scope, receive, wrapped_send)
+
+        except Exception as exc:
+            if started:
+                raise
+            for i, hook in plan.exception:
+                if i >= depth:
+                    continue
+                response = await hook.on_exception(scope, exc)
+                if response is not None:
+                    depth = i
+                    await response(scope, receive, wrapped_send)
+                    return
+            raise
+
+
+def compile_middlewares(
+    app: ASGIApp, middleware_classes: t.Sequence[t.Type[t.Any]]
+) -> ASGIApp:
+    """
+    Wrap `app` with `middleware_classes`, the first being the outermost.
+
+    Runs of consecutive `HookMiddleware` subclasses become one
+    `HookPipeline`, other middlewares wrap the app as usual.
+    """
+
+    hooks: t.List[HookMiddleware] = []
+    for cls in reversed(middleware_classes):
+        if isinstance(cls, type) and issubclass(cls, HookMiddleware):
+            hooks.append(cls(app))
+            continue
+        if hooks:
+            app = HookPipeline(app, hooks[::-1])
+            hooks = []
+        app = cls(app)
+
+    if hooks:
+        app = HookPipeline(app, hooks[::-1])
+    return app
@@ -0,0 +1,180 @@
+import asyncio
+import time
+import typing as t
+
+from starlette.routing import Match
+
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.http import HttpResponse
+from unfazed.schema import Admission
+from unfazed.type import ASGIApp, Receive, Scope, Send
+
+
+class AdmissionController:
+    """
+    Count in-flight requests and decide which ones are admitted.
+
+    A priority class may fill its share of the concurrency limit, e.g.
+    with a limit of 100 and a share of 0.5, `low` requests are rejected
+    once 50 requests are in flight. While the event loop lags more than
+    `MAX_LOOP_LAG`, only classes with a share of 1.0 are admitted.
+
+    With `ADAPTIVE`, the limit grows by `1 / limit` per request served
+    within `TARGET_LATENCY` and is multiplied by `BACKOFF` when one
+    takes longer, at most once per `TARGET_LATENCY`.
+    """
+
+    def __init__(self, setting: Admission) -> None:
+        self.setting = setting
+        self.limit = float(setting.max_concurrency)
+        self.in_flight = 0
+        self.lag = 0.0
+        self.last_backoff = 0.0
+
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.expected = 0.0
+
+    @property
+    def lagging(self) -> bool:
+        max_loop_lag = self.setting.max_loop_lag
+        return max_loop_lag is not None and self.lag > max_loop_lag
+
+    def acquire(self, priority: str) -> bool:
+        share = self.setting.priority_shares[priority]
+        if share < 1.0 and self.lagging:
+            return False
+        if self.in_flight >= max(1.0, self.limit * share):
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float) -> None:
+        self.in_flight -= 1
+
+        setting = self.setting
+        if not setting.adaptive:
+            return
+
+        if latency > setting.target_latency:
+            # back off once per latency window, not once per slow request
+            now = time.monotonic()
+            if now - self.last_backoff >= setting.target_latency:
+                self.last_backoff = now
+                self.limit = max(
+                    float(setting.min_concurrency), self.limit * setting.backoff
+                )
+        elif self.in_flight * 2 >= self.limit:
+            # only grow a limit that is actually used
+            self.limit = min(
+                float(setting.max_concurrency), self.limit + 1 / self.limit
+            )
+
+    def ensure_probe(self) -> None:
+        if self.setting.max_loop_lag is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.schedule_probe()
+
+    def schedule_probe(self) -> None:
+        # a timer instead of a task, it dies quietly with its loop
+        assert self.loop is not None
+        interval = self.setting.lag_interval
+        self.expected = self.loop.time() + interval
+        self.loop.call_later(interval, self.probe)
+
+    def probe(self) -> None:
+        assert self.loop is not None
+        self.lag = max(0.0, self.loop.time() - self.expected)
+        self.schedule_probe()
+
+
+class AdmissionMiddleware:
+    """
+    Shed load early instead of queueing requests until clients give up.
+
+    Requests over the limits of `AdmissionController` are answered with
+    `503 Service Unavailable` and `Retry-After` before the inner
+    middlewares and the endpoint run. Routes set their priority class
+    with `path(..., priority="critical")`, others get
+    `DEFAULT_PRIORITY`. Put it first in `MIDDLEWARE`.
+
+    ```python
+
+    UNFAZED_SETTINGS = {
+        "MIDDLEWARE": ["unfazed.middleware.internal.admission.AdmissionMiddleware", ...],
+        "ADMISSION": {"MAX_CONCURRENCY": 200, "ADAPTIVE": True},
+    }
+
+    ```
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        unfazed_settings: UnfazedSettings = settings["UNFAZED_SETTINGS"]
+        admission = unfazed_settings.ADMISSION
+
+        if not admission:
+            raise ValueError("ADMISSION settings not found")
+
+        if admission.default_priority not in admission.priority_shares:
+            raise ValueError(
+                f"DEFAULT_PRIORITY {admission.default_priority} not in PRIORITY_SHARES"
+            )
+
+        self.app = app
+        self.setting: Admission = admission
+        self.controller = AdmissionController(admission)
+
+        # (route, priority) of the routes that set a priority
+        self.priorities: t.List[t.Tuple[t.Any, str]] | None = None
+
+    def load_priorities(self, scope: Scope) -> t.List[t.Tuple[t.Any, str]]:
+        # route priorities are checked against PRIORITY_SHARES in `setup_routes`
+        routes = getattr(scope.get("app"), "routes", [])
+        ret = []
+        for route in routes:
+            priority = getattr(route, "priority", None)
+            if priority is not None:
+                ret.append((route, priority))
+        return ret
+
+    def reject(self) -> HttpResponse:
+        # a new response per request, responses keep per-request state
+        return HttpResponse(
+            "Service Unavailable",
+            status_code=503,
+            headers={"Retry-After": str(self.setting.retry_after)},
+        )
+
+    def resolve_priority(self, scope: Scope) -> str:
+        if self.priorities is None:
+            self.priorities = self.load_priorities(scope)
+
+        for route, priority in self.priorities:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return priority
+
+        return self.setting.default_priority
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        controller.ensure_probe()
+
+        if not controller.acquire(self.resolve_priority(scope)):
+            response = self.reject()
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
@@ -1,15 +1,26 @@
+import functools
 import logging
+import time
 import typing as t
-from traceback import format_exc, format_exception
+from traceback import format_exception
 
 import orjson as json
 from jinja2 import Template
 
 from unfazed.conf import UnfazedSettings, settings
-from unfazed.core import Unfazed
+from unfazed.exception import (
+    InvalidToken,
+    LoginRequired,
+    MethodNotAllowed,
+    PermissionDenied,
+    TooManyAttempts,
+)
 from unfazed.http import HtmlResponse, HttpResponse
-from unfazed.middleware import BaseMiddleware
-from unfazed.type import ASGIApp, Receive, Scope, Send
+from unfazed.middleware.hooks import HookMiddleware
+from unfazed.type import ASGIApp, Scope
+
+if t.TYPE_CHECKING:
+    from unfazed.core import Unfazed  # pragma: no cover
 
 logger = logging.getLogger("unfazed.middleware")
 
@@ -66,45 +77,141 @@ TEMPLATE = """
 """
 
 
-def render_error_html(error: Exception, unfazed_settings: t.Dict[str, t.Any]) -> str:
+@functools.lru_cache(maxsize=1)
+def get_template() -> Template:
+    return Template(TEMPLATE)
+
+
+def render_error_html(
+    error: Exception, unfazed_settings: t.Dict[str, t.Any] | str
+) -> str:
     error_content_list = format_exception(type(error), error, error.__traceback__)
     error_content = "".join(error_content_list)
-    unfazed_settings_str = json.dumps(
-        unfazed_settings, option=json.OPT_INDENT_2
-    ).decode()
-
-    content = Template(TEMPLATE).render(
+    if isinstance(unfazed_settings, str):
+        unfazed_settings_str = unfazed_settings
+    else:
+        unfazed_settings_str = json.dumps(
+            unfazed_settings, option=json.OPT_INDENT_2
+        ).decode()
+
+    content = get_template().render(
         {"error_message": error_content, "unfazed_settings": unfazed_settings_str}
     )
 
     return content
 
 
-class CommonMiddleware(BaseMiddleware):
+class TracebackSampler:
+    """
+    Allow at most `limit` tracebacks per error site every `interval`
+    seconds, an error site being the exception type and the line that
+    raised it.
+    """
+
+    # error sites tracked per window, more are all sampled out
+    MAX_SITES = 1024
+
+    def __init__(self, limit: int, interval: float) -> None:
+        self.limit = limit
+        self.interval = interval
+        self.window_start = time.monotonic()
+        self.counts: t.Dict[t.Tuple[t.Any, ...], int] = {}
+        self.suppressed = 0
+
+    def allow(self, exc: Exception) -> bool:
+        now = time.monotonic()
+        if now - self.window_start >= self.interval:
+            if self.suppressed:
+                logger.error(
+                    f"{self.suppressed} error tracebacks suppressed "
+                    f"in the last {self.interval:g}s"
+                )
+            self.window_start = now
+            self.counts.clear()
+            self.suppressed = 0
+
+        tb = exc.__traceback__
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        site = (
+            type(exc),
+            tb.tb_frame.f_code.co_filename if tb else None,
+            tb.tb_lineno if tb else None,
+        )
+
+        count = self.counts.get(site, 0)
+        if count >= self.limit or (count == 0 and len(self.counts) >= self.MAX_SITES):
+            self.suppressed += 1
+            return False
+
+        self.counts[site] = count + 1
+        return True
+
+
+class CommonMiddleware(HookMiddleware):
+    """
+    Turn unhandled exceptions into error responses.
+
+    Exceptions listed in `expected_errors`, e.g. `PermissionDenied` or
+    `LoginRequired`, are answered with their HTTP status and message,
+    no traceback is formatted or logged. The `code` of other
+    `BaseUnfazedException`s is a business code, not an HTTP status,
+    they are handled like any other exception.
+
+    Other exceptions are answered with a 500, a debug page when `DEBUG`
+    is on. Their tracebacks are logged, at most `traceback_limit` per
+    error site every `traceback_interval` seconds, so an error storm
+    does not turn into a logging storm. Suppressed tracebacks are
+    counted and the exception is still logged in one line.
+    """
+
+    traceback_limit = 10
+    traceback_interval = 60.0
+
+    # exception type -> HTTP status, subclasses match too
+    expected_errors: t.Dict[t.Type[Exception], int] = {
+        PermissionDenied: 403,
+        LoginRequired: 401,
+        InvalidToken: 401,
+        MethodNotAllowed: 405,
+        TooManyAttempts: 429,
+    }
+
     def __init__(self, app: ASGIApp) -> None:
         unfazed_settings: UnfazedSettings = settings["UNFAZED_SETTINGS"]
         self.debug = unfazed_settings.DEBUG
 
         super().__init__(app)
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        try:
-            await self.app(scope, receive, send)
-        except Exception as e:
-            error_message = format_exc()
-            logger.error(error_message)
-            unfazed = t.cast(Unfazed, scope.get("app"))
-
-            response: HttpResponse
-            if self.debug:
-                content = render_error_html(e, unfazed.settings.model_dump())
-                response = HtmlResponse(content=content, status_code=500)
-            else:
-                response = HttpResponse(
-                    status_code=500, content="Internal Server Error"
-                )
-            await response(scope, receive, send)
+        self.sampler = TracebackSampler(self.traceback_limit, self.traceback_interval)
+        # rendered once, settings do not change at runtime
+        self.settings_json: str | None = None
+
+    def expected_response(self, exc: Exception) -> HttpResponse | None:
+        for exc_type, status_code in self.expected_errors.items():
+            if isinstance(exc, exc_type):
+                # built per request, outer hooks may add headers to it
+                message = getattr(exc, "message", None) or str(exc)
+                return HttpResponse(status_code=status_code, content=message)
+        return None
+
+    async def on_exception(self, scope: Scope, exc: Exception) -> HttpResponse:
+        response = self.expected_response(exc)
+        if response is not None:
+            return response
+
+        if self.sampler.allow(exc):
+            logger.error(f"{type(exc).__name__}: {exc}", exc_info=exc)
+        else:
+            logger.error(f"{type(exc).__name__}: {exc} (traceback sampled out)")
+
+        if self.debug:
+            if self.settings_json is None:
+                unfazed = t.cast("Unfazed", scope.get("app"))
+                self.settings_json = json.dumps(
+                    unfazed.settings.model_dump(), option=json.OPT_INDENT_2
+                ).decode()
+            content = render_error_html(exc, self.settings_json)
+            return HtmlResponse(content=content, status_code=500)
+
+        return HttpResponse(status_code=500, content="Internal Server Error")
@@ -0,0 +1,267 @@
+import typing as t
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from unfazed.concurrency import run_in_threadpool
+from unfazed.conf import UnfazedSettings, settings
+from unfazed.schema import Compression
+from unfazed.type import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    ZSTD_AVAILABLE = False
+
+# parsed Accept-Encoding headers, browsers send a handful of distinct values
+MAX_NEGOTIATED = 256
+
+
+class Compressor(t.Protocol):
+    def compress(self, data: bytes, final: bool) -> bytes: ...
+
+
+class GZipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits 16 + 15 writes a gzip header and trailer
+        self.obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self.obj.compress(data)
+        return out + self.obj.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self.obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self.obj.process(data)
+        return out + (self.obj.finish() if final else self.obj.flush())
+
+
+class ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        self.obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self.obj.compress(data)
+        mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return out + self.obj.flush(mode)
+
+
+def available_encodings() -> t.Set[str]:
+    ret = {"gzip"}
+    if BROTLI_AVAILABLE:
+        ret.add("br")
+    if ZSTD_AVAILABLE:
+        ret.add("zstd")
+    return ret
+
+
+def parse_accept_encoding(value: str) -> t.Dict[str, float]:
+    ret = {}
+    for item in value.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        ret[coding] = q
+    return ret
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with br, zstd or gzip, negotiated from
+    `Accept-Encoding`.
+
+    The client's q-values decide, ties go to the order of `ENCODINGS`.
+    Only media types in `COMPRESSIBLE_TYPES` are compressed, responses
+    that already carry a `Content-Encoding` and partial responses are
+    left alone. A strong `ETag` of a compressed response is weakened,
+    the compressed bytes differ from the ones it was made for.
+
+    Streaming bodies, e.g. `StreamingResponse` and `FileResponse`, are
+    compressed chunk by chunk and flushed after every chunk, so the
+    client receives data as it is produced. Bodies or chunks of at
+    least `THREADPOOL_MIN_SIZE` bytes are compressed in the threadpool.
+
+    ```python
+
+    UNFAZED_SETTINGS = {
+        "MIDDLEWARE": ["unfazed.middleware.internal.compression.CompressionMiddleware"],
+        "COMPRESSION": {"ENCODINGS": ["br", "gzip"], "MINIMUM_SIZE": 1024},
+    }
+
+    ```
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        unfazed_settings: UnfazedSettings = settings["UNFAZED_SETTINGS"]
+        compression = unfazed_settings.COMPRESSION
+
+        if not compression:
+            raise ValueError("COMPRESSION settings not found")
+
+        self.app = app
+        self.setting: Compression = compression
+
+        available = available_encodings()
+        self.encodings = [e for e in compression.encodings if e in available]
+        if not self.encodings:
+            raise ValueError(
+                f"None of the COMPRESSION encodings {compression.encodings} is available"
+            )
+
+        types = [media_type.lower() for media_type in compression.compressible_types]
+        self.exact_types = {m for m in types if not m.endswith("*")}
+        self.prefix_types = tuple(m[:-1] for m in types if m.endswith("*"))
+
+        self.negotiated: t.Dict[str, str | None] = {}
+
+    def choose(self, accept_encoding: str) -> str | None:
+        try:
+            return self.negotiated[accept_encoding]
+        except KeyError:
+            pass
+
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, wildcard)
+            if q > best_q:
+                best, best_q = encoding, q
+
+        if len(self.negotiated) >= MAX_NEGOTIATED:
+            self.negotiated.clear()
+        self.negotiated[accept_encoding] = best
+        return best
+
+    def is_compressible(self, content_type: str) -> bool:
+        media_type = content_type.partition(";")[0].strip().lower()
+        return media_type in self.exact_types or media_type.startswith(
+            self.prefix_types
+        )
+
+    def make_compressor(self, encoding: str) -> Compressor:
+        setting = self.setting
+        if encoding == "br":
+            return BrotliCompressor(setting.brotli_quality)
+        if encoding == "zstd":
+            return ZstdCompressor(setting.zstd_level)
+        return GZipCompressor(setting.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        extensions = scope.get("extensions")
+        if extensions and "http.response.pathsend" in extensions:
+            # stream files through us instead of a zero copy send
+            extensions = dict(extensions)
+            del extensions["http.response.pathsend"]
+            scope = {**scope, "extensions": extensions}
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.raw_send = send
+        self.start_message: Message | None = None
+        # None until the first body message decided it
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def compress(self, data: bytes, final: bool) -> bytes:
+        compressor = t.cast(Compressor, self.compressor)
+        threshold = self.middleware.setting.threadpool_min_size
+        if threshold is not None and len(data) >= threshold:
+            return await run_in_threadpool(compressor.compress, data, final)
+        return compressor.compress(data, final)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                # byte ranges refer to the identity body
+                or message["status"] == 206
+                or "content-range" in headers
+                or not self.middleware.is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.raw_send(message)
+            else:
+                self.start_message = message
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            await self.raw_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body and len(body) < self.middleware.setting.minimum_size:
+                self.passthrough = True
+                await self.raw_send(start)
+                await self.raw_send(message)
+                return
+
+            self.compressor = self.middleware.make_compressor(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            body = await self.compress(body, not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.raw_send(start)
+
+        else:
+            body = await self.compress(body, not more_body)
+
+        message["body"] = body
+        await self.raw_send(message)
@@ -0,0 +1,88 @@
+from starlette.datastructures import Headers
+
+from unfazed.http.conditional import etag_matches, make_etag, send_not_modified
+from unfazed.middleware import BaseMiddleware
+from unfazed.protocol import ASGIType
+from unfazed.type import Message, Receive, Scope, Send
+
+
+class ETagMiddleware(BaseMiddleware):
+    """
+    Add `ETag` to responses and answer conditional requests with `304`.
+
+    For `GET` and `HEAD`, a `200` response sent in one body, e.g.
+    `JsonResponse` or `HttpResponse`, gets an `ETag` hashed from the
+    body unless it already has one. If the request's `If-None-Match`
+    matches, an empty `304` is sent instead. Streaming responses are
+    only answered with `304` if they set an `ETag` themselves, e.g.
+    `FileResponse`.
+
+    The endpoint still runs, pass `etag=` to the response or return
+    `NotModifiedResponse` to skip rendering as well.
+
+    ```python
+
+    UNFAZED_SETTINGS = {
+        "MIDDLEWARE": ["unfazed.middleware.internal.etag.ETagMiddleware"],
+    }
+
+    ```
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        responder = ETagResponder(send, Headers(scope=scope).get("if-none-match"))
+        await self.app(scope, receive, responder.send)
+
+
+class ETagResponder:
+    def __init__(self, send: Send, if_none_match: str | None) -> None:
+        self.raw_send = send
+        self.if_none_match = if_none_match
+        self.start_message: Message | None = None
+        # the rest of the body of a response answered with 304
+        self.discard = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == ASGIType.HTTP_RESPONSE_START:
+            if message["status"] == 200:
+                # held until the body shows whether it can be hashed
+                self.start_message = message
+            else:
+                await self.raw_send(message)
+            return
+
+        if self.discard:
+            return
+
+        if self.start_message is None or message_type != ASGIType.HTTP_RESPONSE_BODY:
+            await self.raw_send(message)
+            return
+
+        start, self.start_message = self.start_message, None
+        more_body = message.get("more_body", False)
+
+        etag = Headers(raw=start["headers"]).get("etag")
+        if etag is None and not more_body:
+            etag = make_etag(message.get("body", b""))
+            start["headers"] = [
+                *start["headers"],
+                (b"etag", etag.encode("latin-1")),
+            ]
+
+        if (
+            etag is not None
+            and self.if_none_match is not None
+            and etag_matches(self.if_none_match, etag)
+        ):
+            await send_not_modified(self.raw_send, start["headers"])
+            self.discard = more_body
+            return
+
+        await self.raw_send(start)
+        await self.raw_send(message)
@@ -2,13 +2,14 @@ from .admin import AdminAuthProtocol
 from .asgi import ASGIType
 from .cache import CompressorBase, SerializerBase
 from .middleware import MiddleWare
-from .orm import DataBaseDriver, Model, QuerySet
+from .orm import DataBaseDriver, Model, QueryExporter, QuerySet
 
 __all__ = [
     "MiddleWare",
     "DataBaseDriver",
     "Model",
     "QuerySet",
+    "QueryExporter",
     "ASGIType",
     "SerializerBase",
     "CompressorBase",
@@ -20,3 +20,14 @@ class Model(t.Protocol):
 @t.runtime_checkable
 class QuerySet(t.Protocol):
     pass
+
+
+@t.runtime_checkable
+class QueryExporter(t.Protocol):
+    def on_query(self, alias: str, statement: str, duration: float) -> None: ...
+
+    def on_acquire(
+        self, alias: str, wait: float, in_use: int, max_size: int | None
+    ) -> None: ...
+
+    def on_request(self, queries: int, duplicates: t.Dict[str, int]) -> None: ...
@@ -59,6 +59,9 @@ def path(
     externalDocs: t.Dict | None = None,
     deprecated: bool = False,
     operation_id: str | None = None,
+    priority: str | None = None,
+    timeout: float | None = None,
+    executor: str | None = None,
 ) -> Route: ...
 
 
@@ -78,6 +81,9 @@ def path(
     externalDocs: t.Dict | None = None,
     deprecated: bool = False,
     operation_id: str | None = None,
+    priority: str | None = None,
+    timeout: float | None = None,
+    executor: str | None = None,
 ) -> t.List[Route]: ...
 
 
@@ -97,6 +103,9 @@ def path(
     externalDocs: t.Dict | None = None,
     deprecated: bool | None = None,
     operation_id: str | None = None,
+    priority: str | None = None,
+    timeout: float | None = None,
+    executor: str | None = None,
 ) -> Route | t.List[Route]:
     """
 
@@ -139,6 +148,9 @@ def path(
                 externalDocs=externalDocs,
                 deprecated=deprecated,
                 operation_id=operation_id,
+                priority=priority,
+                timeout=timeout,
+                executor=executor,
             )
 
         else:
@@ -154,6 +166,12 @@ def path(
             if middlewares:
                 route.load_middlewares(middlewares)
 
+            if priority and route.priority is None:
+                route.priority = priority
+
+            if timeout is not None and route.timeout is None:
+                route.update_timeout(timeout)
+
             if not route.app_label:
                 route.app_label = app_label
 
@@ -1,19 +1,70 @@
+import asyncio
 import inspect
+import logging
 import typing as t
 
 from pydantic import BaseModel, ConfigDict, Field, WithJsonSchema, create_model
 from starlette.concurrency import run_in_threadpool
 
+from unfazed.concurrency import deadline, run_in_executor, time_remaining
 from unfazed.exception import ParameterError, TypeHintRequired
 from unfazed.file import UploadFile
-from unfazed.http import HttpRequest
-from unfazed.type import Receive, Scope, Send
+from unfazed.http import HttpRequest, HttpResponse
+from unfazed.protocol import ASGIType
+from unfazed.type import Message, Receive, Scope, Send
 
 from . import params as p
 from . import utils as u
 
 SUPPOTED_REQUEST_TYPE = (str, int, float, t.List, BaseModel, UploadFile)
 
+logger = logging.getLogger("unfazed.route")
+
+
+class DisconnectWatcher:
+    """
+    Read `receive` on behalf of the request and cut the endpoint short
+    when the client disconnects.
+
+    Messages are handed on one at a time, so a body the endpoint does
+    not read holds the watcher back, a disconnect is noticed once the
+    body has been read.
+    """
+
+    def __init__(self, receive: Receive) -> None:
+        self.raw_receive = receive
+        self.queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+        self.disconnected = False
+        self.task: asyncio.Task | None = None
+
+    def start(self, timeout: asyncio.Timeout) -> None:
+        self.task = asyncio.create_task(self.watch(timeout))
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+
+    async def watch(self, timeout: asyncio.Timeout) -> None:
+        while True:
+            message = await self.raw_receive()
+            if message["type"] == ASGIType.HTTP_DISCONNECT:
+                self.disconnected = True
+                if not timeout.expired():
+                    # expire now, the endpoint is cancelled like on a timeout
+                    timeout.reschedule(0)
+                await self.queue.put(message)
+                return
+            await self.queue.put(message)
+
+    async def receive(self) -> Message:
+        return await self.queue.get()
+
+
+def retrieve_exception(future: asyncio.Future) -> None:
+    # the caller may be gone, do not warn about an unretrieved exception
+    if not future.cancelled():
+        future.exception()
+
 
 class EndpointHandler:
     """
@@ -40,11 +91,42 @@ class EndpointHandler:
     (path, query, headers, cookies, and request body) based on their annotations.
     """
 
-    def __init__(self, endpoint_definition: "EndPointDefinition") -> None:
+    def __init__(
+        self,
+        endpoint_definition: "EndPointDefinition",
+        timeout: float | None = None,
+        executor: str | None = None,
+    ) -> None:
         self.endpoint = endpoint_definition.endpoint
         self.endpoint_definition = endpoint_definition
+        # seconds, None falls back to `REQUEST_TIMEOUT`
+        self.timeout = timeout
+        # named executor of sync endpoints, None for the shared threadpool
+        self.executor = executor
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timeout = self.timeout
+        cancel_on_disconnect = False
+        app_settings = getattr(scope.get("app"), "settings", None)
+        if app_settings is not None:
+            if timeout is None:
+                timeout = app_settings.REQUEST_TIMEOUT
+            cancel_on_disconnect = app_settings.CANCEL_ON_DISCONNECT
+
+        if timeout is None and not cancel_on_disconnect:
+            response = await self.run(scope, receive, send)
+        else:
+            response = await self.run_with_deadline(
+                scope, receive, send, timeout, cancel_on_disconnect
+            )
+            if response is None:
+                return
+
+        await response(scope, receive, send)
+
+    async def run(
+        self, scope: Scope, receive: Receive, send: Send, detach: bool = False
+    ) -> t.Any:
         request = self.endpoint_definition.request_class(scope, receive, send)
 
         kwargs, error_list = await self.solve_params(request)
@@ -56,11 +138,62 @@ class EndpointHandler:
             )
 
         if inspect.iscoroutinefunction(self.endpoint):
-            response = await self.endpoint(request, **kwargs)
-        else:
-            response = await run_in_threadpool(self.endpoint, request, **kwargs)
+            return await self.endpoint(request, **kwargs)
+        if self.executor is not None:
+            # a cancelled caller returns at once, the call keeps its worker
+            return await run_in_executor(
+                self.executor, self.endpoint, request, **kwargs
+            )
+        if detach:
+            # the request is answered on timeout, the call keeps its
+            # threadpool token until the thread returns
+            call = asyncio.ensure_future(
+                run_in_threadpool(self.endpoint, request, **kwargs)
+            )
+            call.add_done_callback(retrieve_exception)
+            return await asyncio.shield(call)
+        return await run_in_threadpool(self.endpoint, request, **kwargs)
 
-        await response(scope, receive, send)
+    async def run_with_deadline(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        timeout: float | None,
+        cancel_on_disconnect: bool,
+    ) -> t.Any:
+        """
+        Run the endpoint under a deadline, returns None if the client
+        disconnected before the response started.
+        """
+        watcher = DisconnectWatcher(receive) if cancel_on_disconnect else None
+
+        with deadline(timeout):
+            timer = asyncio.timeout(time_remaining())
+            try:
+                async with timer:
+                    if watcher is None:
+                        return await self.run(scope, receive, send, True)
+
+                    watcher.start(timer)
+                    try:
+                        return await self.run(scope, watcher.receive, send, True)
+                    finally:
+                        watcher.stop()
+
+            except TimeoutError:
+                if not timer.expired():
+                    raise
+                if watcher is not None and watcher.disconnected:
+                    logger.info(
+                        f"client disconnected, {self.endpoint_definition.endpoint_name} cancelled"
+                    )
+                    return None
+
+                logger.warning(
+                    f"{self.endpoint_definition.endpoint_name} timed out after {timeout}s"
+                )
+                return HttpResponse("Gateway Timeout", status_code=504)
 
     async def solve_params(
         self, request: HttpRequest
@@ -4,6 +4,8 @@ import typing as t
 from starlette.routing import Match, Router, URLPath, compile_path, get_route_path
 from starlette.routing import Route as StartletteRoute
 
+from unfazed.concurrency import executors
+from unfazed.middleware.hooks import compile_middlewares
 from unfazed.protocol import MiddleWare as MiddleWareProtocol
 from unfazed.static import StaticFiles
 from unfazed.type import ASGIApp, CanBeImported, HttpMethod, Receive, Scope, Send
@@ -36,6 +38,9 @@ class Route(StartletteRoute):
         deprecated: bool | None = None,
         operation_id: str | None = None,
         response_models: t.List[p.ResponseSpec] | None = None,
+        priority: str | None = None,
+        timeout: float | None = None,
+        executor: str | None = None,
     ) -> None:
         if not path.startswith("/"):
             raise ValueError(f"route `{endpoint.__name__}` paths must start with '/'")
@@ -52,6 +57,10 @@ class Route(StartletteRoute):
         self.externalDocs = externalDocs
         self.deprecated = deprecated or False
         self.operation_id = operation_id
+        # admission priority class, see `AdmissionMiddleware`
+        self.priority = priority
+        self.timeout = timeout
+        self.executor = executor
 
         if methods is None:
             methods_set = {"GET", "HEAD"}
@@ -82,14 +91,61 @@ class Route(StartletteRoute):
         if operation_id:
             self.endpoint_definition.operation_id = operation_id
 
-        self.app = EndpointHandler(self.endpoint_definition)
+        self.endpoint_handler = EndpointHandler(
+            self.endpoint_definition, timeout=timeout, executor=executor
+        )
+        self.app = self.endpoint_handler
+
+        # set by `unfazed.cache.cache_response`
+        response_cache = getattr(endpoint, "response_cache", None)
+        if response_cache is not None:
+            self.app = response_cache.wrap(self.app)
+
+        # set by `unfazed.cache.rate_limit`, checked before the cache
+        limiter = getattr(endpoint, "rate_limit", None)
+        if limiter is not None:
+            self.app = limiter.wrap(self.app)
 
         self.load_middlewares(middlewares or [])
 
+        # executors declared later are checked by `Unfazed.setup_routes`
+        if executor is not None and executor in executors:
+            self.check_executor()
+
+    def check_executor(self) -> None:
+        """
+        Raise ValueError if the route executor is not a declared thread
+        executor, endpoints can not be sent to another process.
+        """
+        # static files and mounts have no executor
+        name = getattr(self, "executor", None)
+        if name is None or (name == "default" and name not in executors):
+            return
+        if name not in executors:
+            raise ValueError(
+                f"route `{self.name}` executor {name} is not declared in EXECUTORS"
+            )
+        if executors[name].setting.KIND != "thread":
+            raise ValueError(
+                f"route `{self.name}` executor {name} must be a thread executor"
+            )
+
+    def check_priority(self, shares: t.Dict[str, float]) -> None:
+        """
+        Raise ValueError if the route priority is not one of the
+        admission classes in `shares`.
+        """
+        priority = getattr(self, "priority", None)
+        if priority is not None and priority not in shares:
+            raise ValueError(
+                f"route `{self.name}` priority {priority} not in PRIORITY_SHARES"
+            )
+
     def load_middlewares(self, middlewares: t.List[CanBeImported]) -> None:
-        for cls_string in reversed(middlewares):
-            cls: t.Type[MiddleWareProtocol] = import_string(cls_string)
-            self.app = cls(app=self.app)
+        classes: t.List[t.Type[MiddleWareProtocol]] = [
+            import_string(cls_string) for cls_string in middlewares
+        ]
+        self.app = compile_middlewares(self.app, classes)
 
     def update_path(self, new_path: str) -> None:
         self.path = new_path
@@ -111,6 +167,10 @@ class Route(StartletteRoute):
         if self.operation_id:
             self.endpoint_definition.operation_id = self.operation_id
 
+    def update_timeout(self, timeout: float | None) -> None:
+        self.timeout = timeout
+        self.endpoint_handler.timeout = timeout
+
     def update_label(self, app_label: str) -> None:
         self.app_label = app_label
         if not self.tags:
@@ -154,6 +214,13 @@ class Static(Route):
         self.app_label = app_label
 
         self.include_in_schema = False
+        self.priority = None
+        self.timeout = None
+
+    @t.override
+    def update_timeout(self, timeout: float | None) -> None:
+        # files are streamed, there is no endpoint to time out
+        return None
 
     @t.override
     def url_path_for(self, name: str, /, **path_params: t.Any) -> URLPath:
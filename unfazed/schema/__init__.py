@@ -1,16 +1,20 @@
 from .admin import AdminRoute, Condition
 from .cache import Cache, LocOptions, RedisOptions
 from .command import Command
+from .concurrency import Executor
 from .logging import LogConfig
-from .middleware import Cors, GZip, TrustedHost
+from .middleware import Admission, Compression, Cors, GZip, TrustedHost
 from .openapi import OpenAPI
-from .orm import AppModels, Database
+from .orm import AppModels, Database, Instrumentation, Replica
 from .serializer import Relation, Result
+from .tasks import Tasks
 
 __all__ = [
     "Command",
     "Database",
     "AppModels",
+    "Replica",
+    "Instrumentation",
     "Cache",
     "LogConfig",
     "Result",
@@ -23,4 +27,8 @@ __all__ = [
     "Cors",
     "TrustedHost",
     "GZip",
+    "Compression",
+    "Admission",
+    "Executor",
+    "Tasks",
 ]
@@ -0,0 +1,23 @@
+import typing as t
+
+from pydantic import BaseModel, model_validator
+
+
+class Executor(BaseModel):
+    KIND: t.Literal["thread", "process"] = "thread"
+    MAX_WORKERS: int = 4
+    # threads only, defaults to `unfazed-<name>`
+    THREAD_NAME_PREFIX: str | None = None
+    # processes only
+    START_METHOD: t.Literal["fork", "spawn", "forkserver"] | None = None
+    MAX_TASKS_PER_CHILD: int | None = None
+
+    @model_validator(mode="after")
+    def check_process_options(self) -> t.Self:
+        if self.MAX_WORKERS < 1:
+            raise ValueError("MAX_WORKERS must be at least 1")
+        if self.MAX_TASKS_PER_CHILD is not None and self.START_METHOD == "fork":
+            raise ValueError(
+                "MAX_TASKS_PER_CHILD is not supported with START_METHOD fork"
+            )
+        return self
@@ -48,3 +48,96 @@ class GZip(BaseModel):
     compress_level: int = Field(
         default=9, description="Compression level", alias="COMPRESS_LEVEL"
     )
+
+
+class Compression(BaseModel):
+    """
+    refer https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Accept-Encoding
+    """
+
+    encodings: t.List[t.Literal["br", "zstd", "gzip"]] = Field(
+        default=["br", "zstd", "gzip"],
+        description="Encodings in order of preference, br and zstd are skipped if their package is not installed",
+        alias="ENCODINGS",
+    )
+    minimum_size: int = Field(
+        default=500, description="Minimum size for compression", alias="MINIMUM_SIZE"
+    )
+    compressible_types: t.List[str] = Field(
+        default=[
+            "text/html",
+            "text/plain",
+            "text/css",
+            "text/csv",
+            "text/javascript",
+            "text/xml",
+            "application/json",
+            "application/javascript",
+            "application/xml",
+            "application/x-ndjson",
+            "image/svg+xml",
+        ],
+        description="Media types to compress, a trailing * matches a prefix, e.g. text/*",
+        alias="COMPRESSIBLE_TYPES",
+    )
+    gzip_level: int = Field(default=6, description="GZip level", alias="GZIP_LEVEL")
+    brotli_quality: int = Field(
+        default=4, description="Brotli quality", alias="BROTLI_QUALITY"
+    )
+    zstd_level: int = Field(default=3, description="Zstd level", alias="ZSTD_LEVEL")
+    threadpool_min_size: int | None = Field(
+        default=262144,
+        description="Bodies or chunks of at least this size are compressed in the threadpool, None disables it",
+        alias="THREADPOOL_MIN_SIZE",
+    )
+
+
+class Admission(BaseModel):
+    max_concurrency: int = Field(
+        default=100,
+        description="Requests handled at once, the upper bound of the adaptive limit",
+        alias="MAX_CONCURRENCY",
+    )
+    priority_shares: t.Dict[str, float] = Field(
+        default={"critical": 1.0, "normal": 0.9, "low": 0.5},
+        description="Share of the concurrency limit each priority class may fill",
+        alias="PRIORITY_SHARES",
+    )
+    default_priority: str = Field(
+        default="normal",
+        description="Priority of routes that set none",
+        alias="DEFAULT_PRIORITY",
+    )
+    max_loop_lag: float | None = Field(
+        default=0.5,
+        description="Event loop lag in seconds above which only critical requests are admitted, None disables it",
+        alias="MAX_LOOP_LAG",
+    )
+    lag_interval: float = Field(
+        default=0.1,
+        description="Interval in seconds of the event loop lag probe",
+        alias="LAG_INTERVAL",
+    )
+    retry_after: int = Field(
+        default=1, description="Retry-After of 503 responses", alias="RETRY_AFTER"
+    )
+    adaptive: bool = Field(
+        default=False,
+        description="Adjust the concurrency limit with AIMD from request latency",
+        alias="ADAPTIVE",
+    )
+    min_concurrency: int = Field(
+        default=10,
+        description="Lower bound of the adaptive limit",
+        alias="MIN_CONCURRENCY",
+    )
+    target_latency: float = Field(
+        default=0.5,
+        description="Latency in seconds above which the adaptive limit backs off",
+        alias="TARGET_LATENCY",
+    )
+    backoff: float = Field(
+        default=0.9,
+        description="Factor the adaptive limit is multiplied by on backoff",
+        alias="BACKOFF",
+    )
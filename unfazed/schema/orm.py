@@ -52,10 +52,36 @@ class AppModels(BaseModel):
     default_connection: str = Field(default="default", alias="DEFAULT_CONNECTION")
 
 
+class Replica(BaseModel):
+    primary: str = Field(default="default", alias="PRIMARY")
+    # connection name -> weight, weight 0 disables the replica
+    replicas: t.Dict[str, int] = Field(..., alias="REPLICAS")
+    # seconds after a write during which reads in the same context stay on primary
+    sticky_seconds: float = Field(default=2, alias="STICKY_SECONDS")
+    eject_seconds: float = Field(default=30, alias="EJECT_SECONDS")
+    health_check_interval: float = Field(default=5, alias="HEALTH_CHECK_INTERVAL")
+    health_check_timeout: float = Field(default=1, alias="HEALTH_CHECK_TIMEOUT")
+
+
+class Instrumentation(BaseModel):
+    # dotted path of a class implementing unfazed.protocol.QueryExporter
+    exporter: str | None = Field(default=None, alias="EXPORTER")
+    # queries slower than this many seconds are logged, None disables the log
+    slow_query_threshold: float | None = Field(
+        default=None, alias="SLOW_QUERY_THRESHOLD"
+    )
+    # a statement repeated this many times in one request is reported as N+1
+    n_plus_one_threshold: int = Field(default=10, alias="N_PLUS_ONE_THRESHOLD")
+
+
 class Database(BaseModel):
     connections: t.Dict[str, Connection] = Field(..., alias="CONNECTIONS")
     driver: str = Field(default="unfazed.db.tortoise.Driver", alias="DRIVER")
     apps: t.Dict[str, AppModels] | None = Field(default=None, alias="APPS")
     routers: t.List[str] | None = Field(default=None, alias="ROUTERS")
+    replica: Replica | None = Field(default=None, alias="REPLICA")
+    instrumentation: Instrumentation | None = Field(
+        default=None, alias="INSTRUMENTATION"
+    )
     use_tz: bool | None = Field(default=None, alias="USE_TZ")
     timezone: str | None = Field(default=None, alias="TIMEZONE")
@@ -0,0 +1,26 @@
+import typing as t
+
+from pydantic import BaseModel, model_validator
+
+from unfazed.type import CanBeImported
+
+
+class Tasks(BaseModel):
+    BROKER: CanBeImported = "unfazed.tasks.broker.MemoryBroker"
+    OPTIONS: t.Dict[str, t.Any] | None = None
+    # queues consumed by the worker, earlier queues first
+    QUEUES: t.List[str] = ["default"]
+    CONCURRENCY: int = 10
+    POLL_INTERVAL: float = 1.0
+    # seconds running tasks may take to finish on shutdown
+    DRAIN_TIMEOUT: float = 30
+    # run tasks inline instead of enqueueing them, for tests
+    EAGER: bool = False
+
+    @model_validator(mode="after")
+    def check_worker(self) -> t.Self:
+        if self.CONCURRENCY < 1:
+            raise ValueError("CONCURRENCY must be at least 1")
+        if not self.QUEUES:
+            raise ValueError("QUEUES must not be empty")
+        return self
@@ -1,4 +1,5 @@
 from .base import Serializer
+from .loader import RelationLoader, load_related
 from .utils import create_common_field
 
-__all__ = ["Serializer", "create_common_field"]
+__all__ = ["Serializer", "create_common_field", "RelationLoader", "load_related"]
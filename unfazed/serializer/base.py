@@ -2,6 +2,7 @@ import typing as t
 
 import pydantic
 from pydantic import BaseModel
+from tortoise.exceptions import DoesNotExist
 from tortoise.fields.relational import (
     BackwardFKRelation,
     BackwardOneToOneRelation,
@@ -14,6 +15,7 @@ from tortoise.queryset import QuerySet
 
 from unfazed.schema import Relation, Result
 
+from .loader import load_related
 from .utils import create_model_from_tortoise, prepare_meta_config
 
 
@@ -152,6 +154,11 @@ class Serializer(BaseModel, metaclass=MetaClass):
 
     StudentSerializer.destroy_from_ctx(StudentDelete(id=1))
 
+    # bulk create / update students, one INSERT / UPDATE per `batch_size` rows
+
+    StudentSerializer.bulk_create_from_ctx([StudentCreate(name="student2", age=18)])
+    StudentSerializer.bulk_update_from_ctx([StudentUpdate(id=1, name="student1", age=20)])
+
     # retrieve a student
     class StudentRetrieve(BaseModel):
         id: int
@@ -178,6 +185,8 @@ class Serializer(BaseModel, metaclass=MetaClass):
         include: t.List[str] = []
         exclude: t.List[str] = []
         enable_relations: bool = False
+        # default batch size for bulk_create_from_ctx / bulk_update_from_ctx
+        batch_size: int | None = None
 
     @t.final
     @classmethod
@@ -234,6 +243,112 @@ class Serializer(BaseModel, metaclass=MetaClass):
         serializer = cls.from_instance(ins)
         return await serializer.retrieve(ins, **kwargs)
 
+    @t.final
+    @classmethod
+    async def bulk_create_from_ctx(
+        cls, ctx_list: t.Sequence[BaseModel], **kwargs: t.Any
+    ) -> t.List[Model]:
+        """
+        Insert all ctx in `ctx_list`, returning instances with their pk set.
+
+        `Model.bulk_create` cannot read back database generated pks, so
+        rows that rely on one are saved one by one. Rows with their pk
+        given are inserted with `Model.bulk_create` in batches of
+        `batch_size` (kwargs or Meta.batch_size). Pre/post save signals
+        are triggered for every row either way.
+        """
+        using_db = kwargs.pop("using_db", None)
+        batch_size = kwargs.pop("batch_size", None) or cls.Meta.batch_size
+        model: t.Type[Model] = cls.Meta.model
+
+        instances = [model(**cls._from_ctx(ctx).valid_data) for ctx in ctx_list]
+
+        meta = model._meta
+        generated = meta.db_pk_column in meta.generated_db_fields
+        bulk = [ins for ins in instances if not generated or ins._custom_generated_pk]
+        if bulk:
+            for ins in bulk:
+                await ins._pre_save(using_db)
+            await model.bulk_create(bulk, batch_size=batch_size, using_db=using_db)
+            for ins in bulk:
+                await ins._post_save(using_db, created=True)
+
+        for ins in instances:
+            if generated and not ins._custom_generated_pk:
+                await ins.save(using_db=using_db)
+
+        return instances
+
+    @t.final
+    @classmethod
+    async def bulk_update_from_ctx(
+        cls, ctx_list: t.Sequence[BaseModel], **kwargs: t.Any
+    ) -> t.List[Model]:
+        """
+        Update all ctx in `ctx_list` with `Model.bulk_update`.
+
+        Existing rows are loaded with a single `id__in` query, then written
+        back in batches of `batch_size` (kwargs or Meta.batch_size).
+        Pre/post save signals are triggered for every row.
+        Raise DoesNotExist if any id is missing.
+        """
+        using_db = kwargs.pop("using_db", None)
+        batch_size = kwargs.pop("batch_size", None) or cls.Meta.batch_size
+        model: t.Type[Model] = cls.Meta.model
+
+        if not ctx_list:
+            return []
+
+        ids = []
+        for ctx in ctx_list:
+            if getattr(ctx, "id", None) is None:
+                raise ValueError("id not found")
+            ids.append(ctx.id)  # type: ignore[attr-defined]
+
+        existed = await model.in_bulk(ids, field_name="id", using_db=using_db)
+        if any(i not in existed for i in ids):
+            raise DoesNotExist(model)
+
+        update_fields: t.List[str] = []
+        instances: t.List[Model] = []
+        for ctx in ctx_list:
+            instance = existed[ctx.id]  # type: ignore[attr-defined]
+            if isinstance(ctx, cls):
+                serializer = ctx
+            else:
+                # same as update_from_ctx, ctx may only carry a part of fields
+                serializer = cls.from_instance(instance)
+                for field in ctx.model_fields:
+                    if hasattr(serializer, field):
+                        setattr(serializer, field, getattr(ctx, field))
+            serializer.assign(instance)
+            instances.append(instance)
+            for name in serializer.get_write_fields() + cls.get_auto_now_fields():
+                if name not in update_fields:
+                    update_fields.append(name)
+
+        if update_fields:
+            # the same row may appear more than once, last one wins
+            unique = list({id(ins): ins for ins in instances}.values())
+            for ins in unique:
+                await ins._pre_save(using_db, update_fields)
+            await model.bulk_update(
+                unique,
+                fields=update_fields,
+                batch_size=batch_size,
+                using_db=using_db,
+            )
+            for ins in unique:
+                await ins._post_save(using_db, False, update_fields)
+
+        return instances
+
+    @classmethod
+    def _from_ctx(cls, ctx: BaseModel) -> t.Self:
+        if isinstance(ctx, cls):
+            return ctx
+        return cls(**ctx.model_dump(exclude_none=True))
+
     @property
     def valid_data(self) -> t.Dict[str, t.Any]:
         write_fields = self.get_write_fields()
@@ -263,6 +378,15 @@ class Serializer(BaseModel, metaclass=MetaClass):
 
         return ret
 
+    @classmethod
+    def get_auto_now_fields(cls) -> t.List[str]:
+        fields_map: t.Dict[str, Field] = cls.Meta.model._meta.fields_map
+        return [
+            name
+            for name in cls.Meta.model._meta.db_fields
+            if name in cls.Meta.include and getattr(fields_map[name], "auto_now", False)
+        ]
+
     @classmethod
     def get_fetch_fields(cls) -> t.List[str]:
         return [
@@ -281,13 +405,20 @@ class Serializer(BaseModel, metaclass=MetaClass):
     async def update(self, instance: Model, **kwargs: t.Any) -> Model:
         using_db = kwargs.pop("using_db", None)
 
+        self.assign(instance)
+
+        await instance.save(using_db=using_db)
+        return instance
+
+    @t.final
+    def assign(self, instance: Model) -> Model:
+        valid_data = self.valid_data
         for k, v in self.model_dump(exclude_none=True).items():
-            if k not in self.valid_data:
+            if k not in valid_data:
                 continue
             if v is not None:
                 setattr(instance, k, v)
 
-        await instance.save(using_db=using_db)
         return instance
 
     @t.final
@@ -297,7 +428,8 @@ class Serializer(BaseModel, metaclass=MetaClass):
         fetch_fields = cls.get_fetch_fields()
 
         if fetch_relations and fetch_fields:
-            await instance.fetch_related(*fetch_fields)
+            # concurrent retrieves share one query per relation
+            await load_related(instance, *fetch_fields)
 
         return cls.from_instance(instance)
 
@@ -308,10 +440,11 @@ class Serializer(BaseModel, metaclass=MetaClass):
         await instance.delete(using_db=using_db)
 
     @classmethod
-    async def get_object(cls, ctx: BaseModel) -> Model:
+    async def get_object(cls, ctx: BaseModel, **kwargs: t.Any) -> Model:
+        using_db = kwargs.pop("using_db", None)
         model: t.Type[Model] = cls.Meta.model
         if hasattr(ctx, "id"):
-            return await model.get(id=ctx.id)
+            return await model.get(id=ctx.id, using_db=using_db)
         else:
             raise ValueError("id not found")
 
@@ -0,0 +1,171 @@
+import asyncio
+import contextvars
+import typing as t
+from weakref import WeakKeyDictionary
+
+from tortoise.backends.base.client import BaseDBAsyncClient, TransactionalDBClient
+from tortoise.models import Model
+
+BatchKey = t.Tuple[t.Type[Model], str, BaseDBAsyncClient | str]
+
+
+class _Batch:
+    __slots__ = ("callers", "db")
+
+    def __init__(self, db: BaseDBAsyncClient) -> None:
+        # instances and future of every load call that joined the batch
+        self.callers: t.List[t.Tuple[t.Sequence[Model], asyncio.Future]] = []
+        self.db = db
+
+
+class RelationLoader:
+    """
+    Batch relation lookups issued within the same event loop tick.
+
+    Every `load` call only registers its instances, the actual fetch is
+    deferred with `loop.call_soon`. Once the coroutines that were ready in
+    the current tick have all registered, each `(model, relation)` pair is
+    resolved with a single `Model.fetch_for_list` call, which means one
+    `IN` query per relation instead of one query per instance. The fetch
+    runs in an empty context, so context variables of the first caller,
+    e.g. its query count or deadline, do not leak into the shared batch.
+
+    Nothing is cached across ticks, every load hits the database. Lookups
+    are only batched with lookups on the same connection, as chosen by the
+    database router, so a request pinned to the primary never reads from
+    a replica. Lookups made inside a transaction are only batched with
+    lookups of the same transaction, so they still see uncommitted rows.
+    If a batched query fails, each caller retries with its own instances,
+    so one bad caller does not fail the others.
+
+    Usage:
+
+    ```python
+
+    # 1 query for all groups instead of len(users)
+    await asyncio.gather(*[load_related(user, "groups") for user in users])
+
+    # or load a list directly
+    await load_related(users, "groups", "roles")
+
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._pending: t.Dict[BatchKey, _Batch] = {}
+        self._scheduled = False
+        self._running: t.Set[asyncio.Task] = set()
+
+    async def load(
+        self,
+        instances: Model | t.Sequence[Model],
+        *fields: str,
+        using_db: BaseDBAsyncClient | None = None,
+    ) -> None:
+        if isinstance(instances, Model):
+            instances = [instances]
+        if not instances or not fields:
+            return
+
+        model = type(instances[0])
+        db = using_db or model._choose_db()
+        # lookups made inside a transaction are only batched with that
+        # transaction, others with lookups routed to the same connection
+        key_db: BaseDBAsyncClient | str = (
+            db if isinstance(db, TransactionalDBClient) else db.connection_name
+        )
+
+        loop = asyncio.get_running_loop()
+        futures: t.List[asyncio.Future] = []
+        for field in fields:
+            key: BatchKey = (model, field, key_db)
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(db)
+            future = loop.create_future()
+            batch.callers.append((instances, future))
+            futures.append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            # the batch serves every waiter, so it must not run in the
+            # context of whichever caller happened to schedule it
+            loop.call_soon(self._dispatch, context=contextvars.Context())
+
+        await asyncio.gather(*futures)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        for key, batch in pending.items():
+            task = asyncio.ensure_future(self._fetch(key, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fetch(self, key: BatchKey, batch: _Batch) -> None:
+        model, field, _ = key
+        # the same instance may be registered by several callers
+        instances = list(
+            {id(ins): ins for caller, _ in batch.callers for ins in caller}.values()
+        )
+        try:
+            await model.fetch_for_list(instances, field, using_db=batch.db)
+        except Exception as e:
+            if len(batch.callers) == 1:
+                _, future = batch.callers[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            # isolate the failure, every caller fetches its own instances
+            await asyncio.gather(
+                *[
+                    self._fetch_one(model, field, batch.db, caller, future)
+                    for caller, future in batch.callers
+                ]
+            )
+        else:
+            for _, future in batch.callers:
+                # a caller may have been cancelled meanwhile
+                if not future.done():
+                    future.set_result(None)
+
+    @staticmethod
+    async def _fetch_one(
+        model: t.Type[Model],
+        field: str,
+        db: BaseDBAsyncClient,
+        instances: t.Sequence[Model],
+        future: asyncio.Future,
+    ) -> None:
+        if future.done():
+            return
+        try:
+            await model.fetch_for_list(list(instances), field, using_db=db)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(None)
+
+
+_loaders: "WeakKeyDictionary[asyncio.AbstractEventLoop, RelationLoader]" = (
+    WeakKeyDictionary()
+)
+
+
+def get_loader() -> RelationLoader:
+    loop = asyncio.get_running_loop()
+    loader = _loaders.get(loop)
+    if loader is None:
+        loader = _loaders[loop] = RelationLoader()
+    return loader
+
+
+async def load_related(
+    instances: Model | t.Sequence[Model],
+    *fields: str,
+    using_db: BaseDBAsyncClient | None = None,
+) -> None:
+    """Fetch relations of one or many instances through the batching loader."""
+    await get_loader().load(instances, *fields, using_db=using_db)
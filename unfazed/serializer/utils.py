@@ -268,6 +268,7 @@ def prepare_meta_config(cls_name: str, meta: t.Any) -> None:
         warnings.warn(warning_text, UserWarning, stacklevel=2)
 
     meta.enable_relations = enable_relations
+    meta.batch_size = getattr(meta, "batch_size", None)
 
     if include and exclude:
         raise ValueError(
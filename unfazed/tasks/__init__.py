@@ -0,0 +1,14 @@
+from .base import Task, TaskHandler, task, tasks
+from .broker import BaseBroker, MemoryBroker, RedisBroker
+from .worker import Worker
+
+__all__ = [
+    "task",
+    "tasks",
+    "Task",
+    "TaskHandler",
+    "Worker",
+    "BaseBroker",
+    "MemoryBroker",
+    "RedisBroker",
+]
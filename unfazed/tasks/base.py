@@ -0,0 +1,213 @@
+import asyncio
+import inspect
+import random
+import time
+import typing as t
+import uuid
+from functools import update_wrapper
+
+import orjson
+
+from unfazed.concurrency import deadline, run_in_executor, run_in_threadpool
+from unfazed.schema import Tasks
+from unfazed.utils import Storage, import_string
+
+from .broker import BaseBroker
+
+
+class Task:
+    """
+    A function that can run in the background worker, see `task`.
+
+    Calling the task calls the function as usual. `delay` and `apply`
+    enqueue it instead, its arguments must be JSON serializable.
+    """
+
+    def __init__(
+        self,
+        func: t.Callable,
+        *,
+        name: str | None = None,
+        queue: str = "default",
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        retry_backoff_max: float = 600.0,
+        retry_on: t.Tuple[t.Type[BaseException], ...] = (Exception,),
+        timeout: float | None = None,
+        executor: str | None = None,
+    ) -> None:
+        self.func = func
+        self.name = name or f"{func.__module__}.{func.__qualname__}"
+        self.queue = queue
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retry_on = retry_on
+        self.timeout = timeout
+        self.executor = executor
+        update_wrapper(self, func)
+
+    def __call__(self, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        return self.func(*args, **kwargs)
+
+    async def run(self, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        """
+        Run the function within the task timeout, sync functions run in
+        the task executor or the shared threadpool.
+        """
+        with deadline(self.timeout):
+            async with asyncio.timeout(self.timeout):
+                if inspect.iscoroutinefunction(self.func):
+                    return await self.func(*args, **kwargs)
+                if self.executor is not None:
+                    return await run_in_executor(
+                        self.executor, self.func, *args, **kwargs
+                    )
+                return await run_in_threadpool(self.func, *args, **kwargs)
+
+    async def delay(self, *args: t.Any, **kwargs: t.Any) -> str:
+        """
+        Enqueue the task with the given arguments, returns the message id.
+        """
+        return await self.apply(args, kwargs)
+
+    async def apply(
+        self,
+        args: t.Sequence[t.Any] | None = None,
+        kwargs: t.Dict[str, t.Any] | None = None,
+        *,
+        countdown: float = 0,
+        queue: str | None = None,
+    ) -> str:
+        """
+        Enqueue the task, returns the message id.
+
+        Args:
+            args: Positional arguments of the function.
+            kwargs: Keyword arguments of the function.
+            countdown: Seconds to wait before the task may run.
+            queue: Queue to use instead of the task's queue.
+        """
+        message = {
+            "id": uuid.uuid4().hex,
+            "task": self.name,
+            "args": list(args or ()),
+            "kwargs": kwargs or {},
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        payload = orjson.dumps(message).decode()
+
+        setting = tasks.setting
+        if setting is None or tasks.broker is None:
+            raise RuntimeError("Task Error: TASKS is not configured")
+        if setting.EAGER:
+            # the arguments take the same JSON round trip as with a broker
+            message = orjson.loads(payload)
+            await self.run(*message["args"], **message["kwargs"])
+        else:
+            await tasks.broker.push(queue or self.queue, payload, countdown)
+        return t.cast(str, message["id"])
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Seconds before retry number `attempts`, doubling from
+        `retry_backoff` up to `retry_backoff_max`, with jitter so that
+        tasks failing together do not retry together.
+        """
+        delay = min(self.retry_backoff_max, self.retry_backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1)
+
+
+class TaskHandler(Storage[Task]):
+    """
+    The registered tasks by name and the broker from `TASKS`, a singleton
+    accessible via `tasks`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setting: Tasks | None = None
+        self.broker: BaseBroker | None = None
+
+    def setup(self, setting: Tasks) -> None:
+        self.setting = setting
+        self.broker = import_string(setting.BROKER)(setting.OPTIONS)
+
+
+tasks: TaskHandler = TaskHandler()
+
+
+@t.overload
+def task(func: t.Callable, /) -> Task: ...
+
+
+@t.overload
+def task(
+    *,
+    name: str | None = None,
+    queue: str = "default",
+    max_retries: int = 3,
+    retry_backoff: float = 1.0,
+    retry_backoff_max: float = 600.0,
+    retry_on: t.Tuple[t.Type[BaseException], ...] = (Exception,),
+    timeout: float | None = None,
+    executor: str | None = None,
+) -> t.Callable[[t.Callable], Task]: ...
+
+
+def task(
+    func: t.Callable | None = None,
+    /,
+    **options: t.Any,
+) -> Task | t.Callable[[t.Callable], Task]:
+    """
+    Turn a function into a task the background worker runs.
+
+    ```python
+
+    from unfazed.tasks import task
+
+
+    @task(max_retries=5, timeout=30)
+    async def send_welcome_email(user_id: int) -> None:
+        ...
+
+
+    async def signup(request: HttpRequest) -> JsonResponse:
+        user = await create_user(request)
+        await send_welcome_email.delay(user.id)
+        return JsonResponse({"id": user.id})
+
+    ```
+
+    Args:
+        name: Name the worker finds the task by, defaults to the dotted
+              path of the function.
+        queue: Queue the task is sent to. Defaults to "default".
+        max_retries: Retries after the first attempt fails. Defaults to 3.
+        retry_backoff: Seconds before the first retry, doubled for each
+                       further retry. Defaults to 1.
+        retry_backoff_max: Longest wait between retries. Defaults to 600.
+        retry_on: Exceptions that are retried, others fail the task at once.
+        timeout: Seconds an attempt may take. Defaults to None.
+        executor: Named executor from settings.EXECUTORS that runs sync
+                  functions. Defaults to None, the shared threadpool.
+    """
+
+    def decorator(func: t.Callable) -> Task:
+        instance = Task(func, **options)
+        if instance.name in tasks:
+            # the same function may be registered again when its module is reloaded
+            registered = tasks[instance.name].func
+            if (registered.__module__, registered.__qualname__) != (
+                func.__module__,
+                func.__qualname__,
+            ):
+                raise ValueError(f"Task Error: task {instance.name} already registered")
+        tasks[instance.name] = instance
+        return instance
+
+    if func is not None:
+        return decorator(func)
+    return decorator
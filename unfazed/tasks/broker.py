@@ -0,0 +1,262 @@
+import asyncio
+import heapq
+import itertools
+import time
+import typing as t
+from collections import defaultdict, deque
+
+from redis.asyncio import Redis
+
+from unfazed.cache import caches
+
+# the scripts read the clock of the redis server, so the clocks of the
+# app servers do not need to agree.
+# KEYS: ready list, delayed zset. ARGV: message, delay.
+PUSH_SCRIPT = """
+local delay = tonumber(ARGV[2])
+if delay > 0 then
+    local now = redis.call('TIME')
+    local ts = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    redis.call('ZADD', KEYS[2], ts + delay, ARGV[1])
+else
+    redis.call('LPUSH', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# KEYS: ready list, delayed zset, in flight zset. ARGV: visibility timeout.
+# Moves due delayed messages and messages whose worker went away back to
+# the ready list, then takes the oldest ready message.
+POP_SCRIPT = """
+local now = redis.call('TIME')
+local ts = tonumber(now[1]) + tonumber(now[2]) / 1000000
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+    local due = redis.call('ZRANGEBYSCORE', key, '-inf', ts, 'LIMIT', 0, 100)
+    for _, message in ipairs(due) do
+        redis.call('ZREM', key, message)
+        redis.call('RPUSH', KEYS[1], message)
+    end
+end
+local message = redis.call('RPOP', KEYS[1])
+if message then
+    redis.call('ZADD', KEYS[3], ts + tonumber(ARGV[1]), message)
+end
+return message
+"""
+
+# KEYS: ready list, delayed zset, in flight zset.
+# ARGV: message, new message, delay.
+RETRY_SCRIPT = """
+redis.call('ZREM', KEYS[3], ARGV[1])
+local delay = tonumber(ARGV[3])
+if delay > 0 then
+    local now = redis.call('TIME')
+    local ts = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    redis.call('ZADD', KEYS[2], ts + delay, ARGV[2])
+else
+    redis.call('RPUSH', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+
+class BaseBroker:
+    """
+    Keeps task messages until a worker takes them.
+
+    Messages are JSON strings. A popped message is in flight until the
+    worker acks it, retries it with a new message or buries it in the
+    dead letters of its queue.
+    """
+
+    def __init__(self, options: t.Dict[str, t.Any] | None = None) -> None:
+        self.options = options or {}
+
+    async def push(self, queue: str, message: str, delay: float = 0) -> None:
+        raise NotImplementedError
+
+    async def pop(self, queue: str) -> str | None:
+        raise NotImplementedError
+
+    async def ack(self, queue: str, message: str) -> None:
+        raise NotImplementedError
+
+    async def retry(
+        self, queue: str, message: str, new_message: str, delay: float = 0
+    ) -> None:
+        raise NotImplementedError
+
+    async def bury(self, queue: str, message: str, new_message: str) -> None:
+        raise NotImplementedError
+
+    async def wait(self, timeout: float) -> None:
+        """
+        Wait up to `timeout` seconds for new messages, brokers that
+        can tell when one arrives return earlier.
+        """
+        await asyncio.sleep(timeout)
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryBroker(BaseBroker):
+    """
+    Queues in the memory of the process, for development and tests.
+
+    Messages are lost when the process exits, and only workers of the
+    same process see them.
+
+    Options:
+        MAX_DEAD: dead letters kept per queue, defaults to 1000.
+    """
+
+    def __init__(self, options: t.Dict[str, t.Any] | None = None) -> None:
+        super().__init__(options)
+        max_dead = self.options.get("MAX_DEAD", 1000)
+
+        self.ready: t.DefaultDict[str, t.Deque[str]] = defaultdict(deque)
+        # (due, sequence, message) heaps
+        self.delayed: t.DefaultDict[str, t.List[t.Tuple[float, int, str]]] = (
+            defaultdict(list)
+        )
+        self.dead: t.DefaultDict[str, t.Deque[str]] = defaultdict(
+            lambda: deque(maxlen=max_dead)
+        )
+        self.counter = itertools.count()
+
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.event: asyncio.Event | None = None
+
+    def get_event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self.event is None or self.loop is not loop:
+            self.loop = loop
+            self.event = asyncio.Event()
+        return self.event
+
+    async def push(self, queue: str, message: str, delay: float = 0) -> None:
+        if delay > 0:
+            heapq.heappush(
+                self.delayed[queue],
+                (time.monotonic() + delay, next(self.counter), message),
+            )
+        else:
+            self.ready[queue].append(message)
+        self.get_event().set()
+
+    async def pop(self, queue: str) -> str | None:
+        delayed = self.delayed[queue]
+        now = time.monotonic()
+        while delayed and delayed[0][0] <= now:
+            self.ready[queue].append(heapq.heappop(delayed)[2])
+
+        ready = self.ready[queue]
+        return ready.popleft() if ready else None
+
+    async def ack(self, queue: str, message: str) -> None:
+        return None
+
+    async def retry(
+        self, queue: str, message: str, new_message: str, delay: float = 0
+    ) -> None:
+        await self.push(queue, new_message, delay)
+
+    async def bury(self, queue: str, message: str, new_message: str) -> None:
+        self.dead[queue].append(new_message)
+
+    async def wait(self, timeout: float) -> None:
+        due = [delayed[0][0] for delayed in self.delayed.values() if delayed]
+        if due:
+            timeout = min(timeout, max(0.0, min(due) - time.monotonic()))
+
+        event = self.get_event()
+        event.clear()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except TimeoutError:
+            pass
+
+
+class RedisBroker(BaseBroker):
+    """
+    Queues in redis, shared by every process using the cache alias and
+    kept across restarts.
+
+    Each queue has a list of ready messages, a sorted set of delayed
+    messages and a sorted set of messages in flight. A message that is
+    not acked within `VISIBILITY_TIMEOUT` seconds is delivered again, so
+    a worker that dies loses no task. Tasks should therefore be
+    idempotent and finish well within the timeout.
+
+    Options:
+        CACHE: alias of a redis cache backend, defaults to "default".
+        VISIBILITY_TIMEOUT: seconds a worker has to finish a task,
+            defaults to 300.
+        MAX_DEAD: dead letters kept per queue, defaults to 1000.
+    """
+
+    def __init__(self, options: t.Dict[str, t.Any] | None = None) -> None:
+        super().__init__(options)
+        self.using: str = self.options.get("CACHE", "default")
+        self.visibility_timeout: float = self.options.get("VISIBILITY_TIMEOUT", 300)
+        self.max_dead: int = self.options.get("MAX_DEAD", 1000)
+
+        self._backend: t.Any = None
+        self.scripts: t.Dict[str, t.Any] = {}
+
+    @property
+    def backend(self) -> t.Any:
+        if self.using not in caches:
+            raise ValueError(f"Task Error: cache alias {self.using} not in caches")
+
+        backend = caches[self.using]
+        if backend is not self._backend:
+            client = getattr(backend, "client", None)
+            if not isinstance(client, Redis):
+                raise ValueError(
+                    f"Task Error: cache alias {self.using} is not a redis backend"
+                )
+            self.scripts = {
+                "push": client.register_script(PUSH_SCRIPT),
+                "pop": client.register_script(POP_SCRIPT),
+                "retry": client.register_script(RETRY_SCRIPT),
+            }
+            self._backend = backend
+        return backend
+
+    def make_keys(self, queue: str) -> t.List[str]:
+        # braces keep the keys of one queue in one cluster slot
+        name = "{" + self.backend.make_key(f"unfazed_tasks:{queue}") + "}"
+        return [f"{name}:{part}" for part in ("ready", "delayed", "inflight", "dead")]
+
+    async def push(self, queue: str, message: str, delay: float = 0) -> None:
+        keys = self.make_keys(queue)
+        await self.scripts["push"](keys=keys[:2], args=[message, delay])
+
+    async def pop(self, queue: str) -> str | None:
+        keys = self.make_keys(queue)
+        message = await self.scripts["pop"](
+            keys=keys[:3], args=[self.visibility_timeout]
+        )
+        if isinstance(message, bytes):
+            return message.decode()
+        return message
+
+    async def ack(self, queue: str, message: str) -> None:
+        inflight = self.make_keys(queue)[2]
+        await self.backend.client.zrem(inflight, message)
+
+    async def retry(
+        self, queue: str, message: str, new_message: str, delay: float = 0
+    ) -> None:
+        keys = self.make_keys(queue)
+        await self.scripts["retry"](keys=keys[:3], args=[message, new_message, delay])
+
+    async def bury(self, queue: str, message: str, new_message: str) -> None:
+        _, _, inflight, dead = self.make_keys(queue)
+        async with self.backend.client.pipeline(transaction=True) as pipe:
+            pipe.zrem(inflight, message)
+            pipe.lpush(dead, new_message)
+            pipe.ltrim(dead, 0, self.max_dead - 1)
+            await pipe.execute()
@@ -0,0 +1,48 @@
+import importlib.util
+import typing as t
+
+from unfazed.lifespan import BaseLifeSpan
+
+from .base import tasks
+from .worker import Worker
+
+if t.TYPE_CHECKING:
+    from unfazed.app import BaseAppConfig  # pragma: no cover
+
+
+class TaskWorker(BaseLifeSpan):
+    """
+    Run a task worker in the application process.
+
+    On startup, the `tasks` module of every installed app is imported so
+    their tasks are registered, and a `Worker` consumes the queues from
+    `TASKS`. On shutdown, running tasks get `TASKS.DRAIN_TIMEOUT` seconds
+    to finish.
+    """
+
+    worker: Worker | None = None
+
+    async def on_startup(self) -> None:
+        setting = self.unfazed.settings.TASKS
+        if setting is None or tasks.broker is None:
+            raise ValueError("Task Error: TaskWorker requires TASKS in settings")
+
+        app: "BaseAppConfig"
+        for _, app in self.unfazed.app_center:
+            if importlib.util.find_spec(f"{app.name}.tasks"):
+                app.wakeup("tasks")
+
+        self.worker = Worker(
+            tasks.broker,
+            setting.QUEUES,
+            setting.CONCURRENCY,
+            setting.POLL_INTERVAL,
+        )
+        self.worker.start()
+
+    async def on_shutdown(self) -> None:
+        setting = self.unfazed.settings.TASKS
+        if self.worker is None or setting is None:
+            return
+        await self.worker.stop(setting.DRAIN_TIMEOUT)
+        self.worker = None
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import typing as t
+
+import orjson
+
+from .base import TaskHandler, tasks
+from .broker import BaseBroker
+
+logger = logging.getLogger("unfazed.tasks")
+
+# keys of the messages built by `Task.apply`
+MESSAGE_KEYS = {"id", "task", "args", "kwargs", "attempts"}
+
+
+class Worker:
+    """
+    Runs enqueued tasks in the current event loop.
+
+    `concurrency` consumers each take one message at a time from the
+    queues, earlier queues first, so at most `concurrency` tasks run at
+    once and no message waits in the process. A failed task is retried
+    with backoff until its `max_retries` run out, then it is buried in
+    the dead letters of its queue.
+
+    `stop` drains the worker: idle consumers stop at once, running tasks
+    get `timeout` seconds to finish. Tasks still running after that are
+    cancelled and put back into their queue.
+    """
+
+    def __init__(
+        self,
+        broker: BaseBroker,
+        queues: t.Sequence[str] = ("default",),
+        concurrency: int = 10,
+        poll_interval: float = 1.0,
+        registry: TaskHandler = tasks,
+    ) -> None:
+        self.broker = broker
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.registry = registry
+
+        self.consumers: t.List[asyncio.Task] = []
+        # consumers waiting for messages, safe to cancel
+        self.idle: t.Set[asyncio.Task] = set()
+        self.stopping = False
+
+        self.running = 0
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self.stopping = False
+        self.consumers = [
+            asyncio.create_task(self.consume(), name=f"unfazed-task-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self, timeout: float | None = None) -> None:
+        self.stopping = True
+        for consumer in self.idle:
+            consumer.cancel()
+
+        if not self.consumers:
+            return
+        _, pending = await asyncio.wait(self.consumers, timeout=timeout)
+        for consumer in pending:
+            consumer.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        self.consumers = []
+
+    async def fetch(self) -> t.Tuple[str, str] | None:
+        for queue in self.queues:
+            message = await self.broker.pop(queue)
+            if message is not None:
+                return queue, message
+        return None
+
+    async def consume(self) -> None:
+        current = asyncio.current_task()
+        assert current is not None
+
+        while not self.stopping:
+            try:
+                fetched = await self.fetch()
+                if fetched is None:
+                    self.idle.add(current)
+                    try:
+                        await self.broker.wait(self.poll_interval)
+                    finally:
+                        self.idle.discard(current)
+                    continue
+                await self.process(*fetched)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # the broker is unavailable, try again later
+                logger.exception("Task worker failed to fetch or settle a message")
+                self.idle.add(current)
+                try:
+                    await asyncio.sleep(self.poll_interval)
+                finally:
+                    self.idle.discard(current)
+
+    async def process(self, queue: str, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            message = None
+        if not isinstance(message, dict) or not MESSAGE_KEYS <= message.keys():
+            # bury it as it came, it would be redelivered forever otherwise
+            logger.error(f"Task message in queue {queue} is malformed: {payload!r}")
+            await self.broker.bury(queue, payload, payload)
+            self.failed += 1
+            return
+
+        name = message["task"]
+
+        if name not in self.registry:
+            logger.error(f"Task {name} is not registered, message {message['id']}")
+            message["error"] = "not registered"
+            await self.broker.bury(queue, payload, orjson.dumps(message).decode())
+            self.failed += 1
+            return
+
+        task = self.registry[name]
+        self.running += 1
+        try:
+            await task.run(*message["args"], **message["kwargs"])
+        except asyncio.CancelledError:
+            # drained before it finished, run it again later
+            await self.broker.retry(queue, payload, payload)
+            raise
+        except Exception as e:
+            attempts = message["attempts"] + 1
+            message["attempts"] = attempts
+            if isinstance(e, task.retry_on) and attempts <= task.max_retries:
+                delay = task.backoff(attempts)
+                logger.warning(
+                    f"Task {name} failed with {e!r}, "
+                    f"retry {attempts}/{task.max_retries} in {delay:.1f}s"
+                )
+                await self.broker.retry(
+                    queue, payload, orjson.dumps(message).decode(), delay
+                )
+                self.retried += 1
+            else:
+                logger.exception(f"Task {name} failed after {attempts} attempts")
+                message["error"] = repr(e)
+                await self.broker.bury(queue, payload, orjson.dumps(message).decode())
+                self.failed += 1
+        else:
+            await self.broker.ack(queue, payload)
+            self.processed += 1
+        finally:
+            self.running -= 1
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
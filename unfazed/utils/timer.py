@@ -14,16 +14,35 @@ class Timer:
         ```python
         with Timer("setup_unfazed"): # if silent is True, the timer will not print the time taken
             self.setup_logging()
+
+        # collect the elapsed seconds into a dict keyed by name
+        report = {}
+        with Timer("import", silent=True, record=report):
+            import_app()
         ```
     """
 
-    def __init__(self, name: str, *, silent: bool = False) -> None:
+    def __init__(
+        self,
+        name: str,
+        *,
+        silent: bool = False,
+        record: t.Dict[str, float] | None = None,
+    ) -> None:
         self.start_time = time.time()
+        self.end_time: float | None = None
         self.name = name
         self.silent = silent
+        self.record = record
+
+    @property
+    def elapsed(self) -> float:
+        end_time = self.end_time if self.end_time is not None else time.time()
+        return end_time - self.start_time
 
-    def __enter__(self) -> None:
+    def __enter__(self) -> t.Self:
         self.start_time = time.time()
+        return self
 
     def __exit__(
         self,
@@ -32,7 +51,7 @@ class Timer:
         traceback: TracebackType,
     ) -> None:
         self.end_time = time.time()
+        if self.record is not None:
+            self.record[self.name] = self.elapsed
         if not self.silent:
-            logger.debug(
-                f"{self.name} Time taken: {self.end_time - self.start_time} seconds"
-            )
+            logger.debug(f"{self.name} Time taken: {self.elapsed} seconds")